@@ -0,0 +1,239 @@
+"""
+DocumentSidebar.py - Filterable List of the Open Tabs
+
+Main Functions:
+- DocumentListModel: QAbstractListModel of the tabs grouped by title (one color per title), with a header row
+  per group, filtered by name, title or path
+- DocumentDelegate: Paints a header row in the color of its title, and a tab row with a color stripe,
+  in bold for the current tab
+- DocumentSidebar: Dock widget with a filter entry and a virtualized list of the tabs; clicking a row switches
+  to its tab, Enter in the filter to the first match, the context menu closes tabs
+"""
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, QRect, QSize, QTimer, Qt, QSettings
+from PyQt5.QtGui import QFont, QPen, QColor
+from PyQt5.QtWidgets import (
+    QDockWidget, QWidget, QVBoxLayout, QLineEdit, QListView, QStyledItemDelegate, QStyle, QMenu,
+    QAbstractItemView
+)
+
+from common.Colorizer import Colorizer
+from common.TabBar import TabBar
+
+
+class DocumentListModel(QAbstractListModel):
+    """
+    Rows are rebuilt when tabs are added, closed or renamed, once per pass of the event loop
+    (opening hundreds of files rebuilds it once). Switching tabs or a color change (a flashing
+    tab) only looks its row up in rowOf, so they cost the same whatever the number of tabs.
+    """
+
+    ViewerRole = Qt.UserRole + 1  # the LogViewer of a tab row, None for a group header
+    ColorRole = Qt.UserRole + 2  # background color (hex) of the row's title
+
+    def __init__(self, tabs: 'LogViewTab'):
+        super().__init__()
+        self.tabs = tabs
+        self.rows: list['LogViewer | str'] = []  # a LogViewer per tab, the title (str) heading each group
+        self.rowOf: dict['LogViewer', int] = {}
+        self.filterText: str = ""
+        self.rebuildTimer = QTimer(self)
+        self.rebuildTimer.setSingleShot(True)
+        self.rebuildTimer.setInterval(0)
+        self.rebuildTimer.timeout.connect(self.rebuild)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        item = self.rows[index.row()]
+        header = isinstance(item, str)
+        if role == Qt.DisplayRole:
+            return item if header else item.name
+        if role == Qt.ToolTipRole:
+            return None if header else item.logFile
+        if role == self.ViewerRole:
+            return None if header else item
+        if role == self.ColorRole:
+            return Colorizer(item).hex() if header else item.get_background()
+        return None
+
+    def flags(self, index):
+        if index.isValid() and isinstance(self.rows[index.row()], str):
+            return Qt.ItemIsEnabled  # group headers can't be selected
+        return super().flags(index)
+
+    def set_filter(self, text: str):
+        self.filterText = text.strip().lower()
+        self.rebuild()
+
+    def schedule_rebuild(self):
+        self.rebuildTimer.start()
+
+    def matches(self, viewer: 'LogViewer') -> bool:
+        text = self.filterText
+        return not text or text in viewer.name.lower() or text in viewer.title.lower() or text in viewer.logFile.lower()
+
+    def rebuild(self):
+        self.rebuildTimer.stop()
+        groups: dict[str, list['LogViewer']] = {}  # title: tabs, in the order of their first tab
+        for index in range(self.tabs.count()):
+            viewer = self.tabs.widget(index)
+            if self.matches(viewer):
+                groups.setdefault(viewer.title, []).append(viewer)
+        self.beginResetModel()
+        self.rows = []
+        for title, viewers in groups.items():
+            self.rows.append(title)
+            self.rows.extend(viewers)
+        self.rowOf = {item: row for row, item in enumerate(self.rows) if not isinstance(item, str)}
+        self.endResetModel()
+
+    def index_of(self, viewer: 'LogViewer') -> QModelIndex:
+        row = self.rowOf.get(viewer)
+        return self.index(row) if row is not None else QModelIndex()
+
+    def viewer_changed(self, viewer: 'LogViewer'):
+        index = self.index_of(viewer)
+        if index.isValid():
+            self.dataChanged.emit(index, index)
+
+
+class DocumentDelegate(QStyledItemDelegate):
+    stripeWidth: int = 6
+    rowPadding: int = 4
+    textPen = QPen(QColor(Qt.black), 1)
+
+    def __init__(self, tabs: 'LogViewTab', parent=None):
+        super().__init__(parent)
+        self.tabs = tabs
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), option.fontMetrics.height() + self.rowPadding)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        rect = option.rect
+        brush = TabBar.brush(index.data(DocumentListModel.ColorRole))
+        viewer = index.data(DocumentListModel.ViewerRole)
+        font = QFont(option.font)
+        if viewer is None:
+            painter.fillRect(rect, brush)
+            font.setBold(True)
+        else:
+            if option.state & QStyle.State_Selected:
+                painter.fillRect(rect, option.palette.highlight())
+            painter.fillRect(QRect(rect.left(), rect.top(), self.stripeWidth, rect.height()), brush)
+            font.setBold(viewer is self.tabs.currentWidget())
+            rect = rect.adjusted(self.stripeWidth * 2, 0, 0, 0)
+        painter.setFont(font)
+        painter.setPen(self.textPen if viewer is None or not option.state & QStyle.State_Selected
+                       else QPen(option.palette.highlightedText(), 1))
+        text = option.fontMetrics.elidedText(index.data(Qt.DisplayRole), Qt.ElideMiddle, rect.width() - self.rowPadding)
+        painter.drawText(rect.adjusted(self.rowPadding, 0, 0, 0), Qt.AlignVCenter | Qt.AlignLeft, text)
+        painter.restore()
+
+
+class DocumentSidebar(QDockWidget):
+    """
+    The tab strip is of little use with more than a few dozen tabs, the sidebar lists them all.
+    Its QListView has uniform row heights, so it lays out and paints only the visible rows.
+    It is shown by default once autoShowTabs tabs are open, unless it was hidden before
+    (View → Document Sidebar, remembered in the settings).
+    """
+
+    autoShowTabs: int = 30
+
+    def __init__(self, tabs: 'LogViewTab', parent=None):
+        super().__init__("Tabs", parent)
+        self.setObjectName("DocumentSidebar")
+        self.tabs = tabs
+        self.model = DocumentListModel(tabs)
+        self.filterEntry = QLineEdit()
+        self.listView = QListView()
+        self.init_ui()
+        tabs.tabsChanged.connect(self.tabs_changed)
+        tabs.tabChanged.connect(self.model.viewer_changed)
+        tabs.currentChanged.connect(self.current_changed)
+        self.visibilityChanged.connect(self.visibility_changed)
+        self.setVisible(QSettings("Avice", "TabLog").value("document_sidebar", False, type=bool))
+
+    def init_ui(self):
+        widget = QWidget()
+        widget.setLayout(QVBoxLayout())
+        widget.layout().setContentsMargins(2, 2, 2, 2)
+        self.filterEntry.setPlaceholderText("Filter tabs...")
+        self.filterEntry.setClearButtonEnabled(True)
+        self.filterEntry.textChanged.connect(self.model.set_filter)
+        self.filterEntry.returnPressed.connect(self.open_first)
+        widget.layout().addWidget(self.filterEntry)
+        self.listView.setModel(self.model)
+        self.listView.setItemDelegate(DocumentDelegate(self.tabs, self.listView))
+        self.listView.setUniformItemSizes(True)
+        self.listView.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.listView.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.listView.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.listView.customContextMenuRequested.connect(self.show_context_menu)
+        self.listView.clicked.connect(self.open_index)
+        self.listView.activated.connect(self.open_index)
+        widget.layout().addWidget(self.listView)
+        self.setWidget(widget)
+        toggle = self.toggleViewAction()
+        toggle.setText("Document Sidebar")
+        toggle.setShortcut("Ctrl+Shift+B")
+        toggle.triggered.connect(self.toggled)
+
+    def toggled(self, checked: bool):
+        """Shown or hidden from the View menu, remembered for the next start."""
+        QSettings("Avice", "TabLog").setValue("document_sidebar", checked)
+        if checked:
+            self.filterEntry.setFocus()
+
+    def tabs_changed(self):
+        if self.isVisible():
+            self.model.schedule_rebuild()
+        elif (self.tabs.count() >= self.autoShowTabs
+              and not QSettings("Avice", "TabLog").contains("document_sidebar")):
+            self.show()
+
+    def visibility_changed(self, visible: bool):
+        if visible:
+            self.model.rebuild()  # not kept up to date while hidden
+            self.current_changed()
+
+    def current_changed(self, index: int = -1):
+        if not self.isVisible():
+            return
+        if self.model.rebuildTimer.isActive():
+            self.model.rebuild()  # the new tab may not be listed yet
+        current = self.model.index_of(self.tabs.currentWidget())
+        self.listView.setCurrentIndex(current)
+        if current.isValid():
+            self.listView.scrollTo(current)
+        self.listView.viewport().update()  # the previous current row is no longer bold
+
+    def open_index(self, index: QModelIndex):
+        viewer = index.data(DocumentListModel.ViewerRole)
+        if viewer is not None:
+            self.tabs.setCurrentWidget(viewer)
+            viewer.setFocus()
+
+    def open_first(self):
+        for row, item in enumerate(self.model.rows):
+            if not isinstance(item, str):
+                self.open_index(self.model.index(row))
+                return
+
+    def show_context_menu(self, position):
+        viewer = self.listView.indexAt(position).data(DocumentListModel.ViewerRole)
+        if viewer is None:
+            return
+        menu = QMenu(self)
+        menu.addAction("Close Tab", lambda: self.tabs.close_tab(self.tabs.indexOf(viewer)))
+        same_title = [self.tabs.widget(t) for t in range(self.tabs.count()) if self.tabs.widget(t).title == viewer.title]
+        if len(same_title) > 1:
+            menu.addAction(F"Close {len(same_title)} Tabs of '{viewer.title}'",
+                           lambda: [self.tabs.close_tab(self.tabs.indexOf(other)) for other in same_title])
+        menu.exec_(self.listView.viewport().mapToGlobal(position))
@@ -0,0 +1,103 @@
+"""
+DocumentStore.py - Log Files Shared by the Tabs Showing Them
+
+Main Functions:
+- LogDocument: The lines and levels of one file (a LogTableModel with its search and link indexes) and what was loaded
+- DocumentStore: Process-wide registry of the open documents by file identity (st_dev, st_ino), reference counted
+- acquire() / release(): A tab takes the document of its file, shared with the tabs showing it; the last release frees it
+- file_stat(): The identity and size of a file, stat once per tab and load (LogViewer.stat_file())
+- find(): The loaded document of a file, if a tab holds one
+- rekey(): Registers a document under the identity of the file it was loaded from again (replaced, e.g. rotated)
+"""
+
+import os
+
+from LogTableModel import LogTableModel
+
+
+class LogDocument:
+    """
+    Tabs showing the same file (under another title, opened by a link, or to compare two
+    regions) share one LogDocument, so the file is read, classified and held once. Whichever
+    tab loads, reloads, evicts or restores the document does it for all of them: its
+    LogTableModel is shared, and every LogViewer follows the reset and appended rows of the
+    model to update its own filter, level counts and view. Only the view state and filter
+    results are per tab.
+    """
+
+    def __init__(self, key: tuple[int, int] | None):
+        self.key = key  # (st_dev, st_ino), None if the file can't be shared (not found)
+        self.model = LogTableModel()  # outlives the tab that acquired the document first
+        self.viewers: list['LogViewer'] = []  # the references
+        self.isLoaded: bool = False
+        # plain text logs remember what was loaded, so a reload can read only the appended lines
+        self.loadedSize: int = 0
+        self.loadedTail: bytes = b""
+        self.loadedInode: tuple[int, int] | None = None
+        # while evicted: the LogLevel value of every line (None if the file must be loaded again)
+        self.isEvicted: bool = False
+        self.evictedLevels: bytes | None = None
+
+    def set_loaded(self, loaded: tuple[int, bytes, tuple[int, int]] | None):
+        """LogFileReader.loaded_state() of the plain text just read, None for other files (never appended)."""
+        self.loadedSize, self.loadedTail, self.loadedInode = loaded if loaded else (0, b"", None)
+
+    def memory_bytes(self) -> int:
+        return self.model.memory_bytes() + len(self.evictedLevels or b"")
+
+
+class DocumentStore:
+    _instance: 'DocumentStore | None' = None
+
+    def __init__(self):
+        self.documents: dict[tuple[int, int], LogDocument] = {}
+
+    @classmethod
+    def instance(cls) -> 'DocumentStore':
+        if cls._instance is None:
+            cls._instance = DocumentStore()
+        return cls._instance
+
+    @staticmethod
+    def file_stat(path: str) -> tuple[tuple[int, int] | None, int]:
+        """The key (st_dev, st_ino) and size of the file, (None, 0) if it can't be read."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None, 0
+        return (stat.st_dev, stat.st_ino), stat.st_size
+
+    def find(self, key: tuple[int, int] | None) -> LogDocument | None:
+        document = self.documents.get(key) if key else None
+        return document if document is not None and document.isLoaded else None
+
+    def acquire(self, key: tuple[int, int] | None, viewer: 'LogViewer') -> LogDocument:
+        document = self.documents.get(key) if key else None
+        if document is None:
+            document = LogDocument(key)
+            if key:
+                self.documents[key] = document
+        document.viewers.append(viewer)
+        return document
+
+    def release(self, viewer: 'LogViewer'):
+        """The viewer no longer uses its document, the lines are dropped with the last reference."""
+        document = viewer.document
+        document.viewers.remove(viewer)
+        if document.viewers:
+            return
+        if self.documents.get(document.key) is document:
+            del self.documents[document.key]
+        document.model.linkIndex.stop()
+        document.model.update_data([])
+        document.evictedLevels = None
+
+    def rekey(self, document: LogDocument, key: tuple[int, int] | None):
+        """Called on a full load, the path may lead to another file than when the document was acquired."""
+        if key == document.key:
+            return
+        if self.documents.get(document.key) is document:
+            del self.documents[document.key]
+        document.key = key
+        if key and key not in self.documents:
+            self.documents[key] = document
@@ -3,25 +3,50 @@ FilterTableModel.py - Filtered Log Table Model
 
 Main Functions:
 - FilterTableModel: QAbstractTableModel that displays filtered log data from LogTableModel
-- set_filter(): Applies log level and text filters, highlighting matched text
+- set_filter(): Applies log level and text filters through the model's bulk search index
 - data(): Returns formatted data with HTML highlighting for search terms
+- highlight_spans(): Finds the (start, end) spans of the search text in a raw line
 - row_to_origin(): Maps filtered row indices back to original log data
+- append_rows(): Tests only the rows appended to the log and appends the matching ones
+- level_counts(): Counting pass over the matched rows, per log level
+- maxWidth: Display width of the widest matched row, from the widths LogTableModel keeps per row
+- queryCache: LRU of recent results, re-issuing a recent filter restores it without a scan
+- memory_bytes(): Size of the matched rows and cached results, for the MemoryBudget
+
+Only the matching row numbers are stored (a compact array). The level and text of a
+row are looked up in LogTableModel when the view asks for it, so the rows of a huge
+result are materialized window by window as they are scrolled into view.
 """
 
-from PyQt5.QtCore import QVariant, QAbstractTableModel, Qt
+import html
+import re
+from array import array
+
+from PyQt5.QtCore import QVariant, QAbstractTableModel, Qt, QModelIndex
 
 from LogLevel import LogLevel
 from LogLevelColor import LogLevelColor
+from LogTableModel import LogTableModel
+from QueryCache import QueryCache
 
 
 class FilterTableModel(QAbstractTableModel):
+    markupPattern = re.compile(r'<[^>]*>|&#?\w+;')  # tags and entities of HTML lines
+    highlightStyle = "background-color:#FF9632;font-weight:bold"
+
     # noinspection PyUnresolvedReferences
     def __init__(self, parent: 'LogViewer', log_model: 'LogTableModel'):
         self.parent = parent
         self.logModel: 'LogTableModel' = log_model
-        self.logData: list[tuple[int, LogLevel, str]] = []
+        self.rows: array = array('l')  # origin rows of the matching lines
         super().__init__()
         self.filterText: str = ""
+        self.levels: list[LogLevel] = list(LogLevel)
+        self.generation: int = 0  # bumped whenever existing rows change, appends keep it
+        self.maxWidth: int = 0  # display width of the widest matched row, in characters
+        self.queryCache = QueryCache()
+        self.dataCalls: int = 0  # data() calls, read per frame by the FrameProfiler
+        self.logModel.modelReset.connect(self.log_model_reset)
 
     def headerData(self, section, orientation, role=Qt.DisplayRole):
         if role != Qt.DisplayRole:
@@ -29,50 +54,92 @@ class FilterTableModel(QAbstractTableModel):
         if orientation == Qt.Horizontal:
             return "Text"
         if orientation == Qt.Vertical:
-            return self.logData[section][0] + 1
+            return self.rows[section] + 1
         return QVariant()
 
     def set_filter(self, levels: list[LogLevel], filter_text: str):
         self.beginResetModel()
-        if not levels:
-            levels = list(LogLevel)
+        self.levels = levels if levels else list(LogLevel)
         self.filterText = filter_text.lower()
-        self.logData = []
-        if self.filterText or len(levels) not in [0, len(LogLevel)]:
-            self.logData = [
-                (row, classification, line) for row, (classification, line) in enumerate(self.logModel.logData)
-                if self.filterText in line.lower() and classification in levels
-            ]
+        self.generation += 1
+        self.rows = array('l')
+        if self.is_active():
+            self.rows = self.cached_rows(self.levels)
+        self.maxWidth = self.max_width(self.rows)
         self.endResetModel()
 
+    def memory_bytes(self) -> int:
+        # the current rows are the array of their cache entry, counted once unless the entry was evicted
+        rows_bytes = 0 if self.queryCache.holds(self.rows) else self.rows.itemsize * len(self.rows)
+        return rows_bytes + self.queryCache.size
+
+    def log_model_reset(self):
+        self.generation += 1
+        self.queryCache.clear()
+
+    def is_active(self) -> bool:
+        return bool(self.filterText) or len(self.levels) != len(LogLevel)
+
+    def append_rows(self, start_row: int) -> array:
+        """Filters the log rows from start_row on (just appended) and appends the matches."""
+        if not self.is_active():
+            return array('l')
+        new_rows = self.match_rows(self.levels, start_row)
+        if new_rows:
+            first = len(self.rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_rows) - 1)
+            self.rows.extend(new_rows)
+            self.maxWidth = max(self.maxWidth, self.max_width(new_rows))
+            self.endInsertRows()
+        key = (self.filterText, frozenset(self.levels), self.logModel.generation)
+        self.queryCache.put(key, self.rows, self.logModel.rowCount())
+        return new_rows
+
+    def cached_rows(self, levels: list[LogLevel]) -> array:
+        """Matching rows of the current filter, from the query cache when possible."""
+        key = (self.filterText, frozenset(levels), self.logModel.generation)
+        rows, scanned = self.queryCache.get(key) or (array('l'), 0)
+        row_count = self.logModel.rowCount()
+        if scanned < row_count:
+            # new query, or rows were appended since it was cached: scan only the rows not seen yet
+            rows.extend(self.match_rows(levels, scanned))
+            self.queryCache.put(key, rows, row_count)
+        return rows
+
+    def match_rows(self, levels: list[LogLevel], start_row: int = 0) -> array:
+        index = self.logModel.search_index()
+        if not self.filterText:
+            return index.level_rows(levels, start_row=start_row)
+        return index.level_rows(levels, index.find_rows(self.filterText, start_row))
+
+    def max_width(self, rows: array) -> int:
+        return max(map(self.logModel.widths.__getitem__, rows), default=0)
+
     def rowCount(self, parent=None):
-        return len(self.logData)
+        return len(self.rows)
 
     def columnCount(self, parent=None):
         return 1  # Assuming one column: Log Line
 
     def data(self, index, role=Qt.DisplayRole):
+        self.dataCalls += 1
         if not index.isValid():
             return QVariant()
-        row, level, log_line = self.logData[index.row()]
-        log_line = log_line.replace('<', '&lt;').replace('>', '&gt;')
+        origin = self.rows[index.row()]
+        level, log_line = self.logModel.logData[origin]
         if role == Qt.UserRole:
             return level
-        if self.filterText:
-            log_line_lower = log_line.lower()
-            result = ""
-            line_parts = log_line_lower.split(self.filterText)
-            if len(line_parts) >= 1:
-                start, end, filter_len = 0, -1, len(self.filterText)
-                for part in line_parts:
-                    end = start + len(part)
-                    result += log_line[start:end]
-                    result += '<span style="background-color:#FF9632;font-weight:bold">'
-                    start, end = end, end + filter_len
-                    result += log_line[start:end]
-                    result += '</span>'
-                    start = end
-                log_line = result
+        if role == LogTableModel.RawTextRole:
+            return log_line
+        if role == LogTableModel.LinkSpansRole:
+            return self.logModel.linkIndex.row_spans(origin, log_line)
+        if role == LogTableModel.WidthRole:
+            return self.logModel.widths[origin]
+        if role == LogTableModel.HighlightRole:
+            return self.highlight_spans(log_line)
+        if role == Qt.ToolTipRole and len(log_line) > LogTableModel.tooltipChars:
+            log_line = log_line[:LogTableModel.tooltipChars] + " ..."
+        log_line = self.highlight_html(log_line, self.highlight_spans(log_line))
         if role == Qt.DisplayRole:
             return log_line
         if role == Qt.ToolTipRole:
@@ -80,5 +147,44 @@ class FilterTableModel(QAbstractTableModel):
             return F'<div style="color:{fg};">{log_line}</div>'
         return QVariant()
 
+    @property
+    def htmlLines(self) -> bool:
+        return self.logModel.htmlLines
+
+    def highlight_spans(self, line: str) -> list[tuple[int, int]]:
+        """Spans of the search text in the raw line, never inside the markup of HTML lines."""
+        if not self.filterText:
+            return []
+        line = line.lower()
+        if self.htmlLines:
+            line = self.markupPattern.sub(lambda match: '\0' * len(match.group()), line)
+        spans, find, length = [], line.find, len(self.filterText)
+        pos = find(self.filterText)
+        while pos != -1:
+            spans.append((pos, pos + length))
+            pos = find(self.filterText, pos + length)
+        return spans
+
+    def highlight_html(self, line: str, spans: list[tuple[int, int]]) -> str:
+        """Escapes the raw line and wraps the spans, so escaping never splits a match."""
+        def escape(text: str) -> str:
+            return text if self.htmlLines else html.escape(text, quote=False)
+
+        parts, end = [], 0
+        for start, end_span in spans:
+            parts.append(escape(line[end:start]))
+            parts.append(F'<span style="{self.highlightStyle}">{escape(line[start:end_span])}</span>')
+            end = end_span
+        parts.append(escape(line[end:]))
+        return "".join(parts)
+
     def row_to_origin(self, row: int):
-        return self.logData[row][0]
+        return self.rows[row]
+
+    def level_counts(self, rows: array = None) -> dict[LogLevel, int]:
+        rows = self.rows if rows is None else rows
+        if not rows:
+            return {level: 0 for level in LogLevel}
+        row_levels = self.logModel.search_index().levels
+        matched_levels = bytes(map(row_levels.__getitem__, rows))
+        return {level: matched_levels.count(level.value) for level in LogLevel}
@@ -0,0 +1,83 @@
+"""
+FolderSearch.py - Grep-Style Search Over Directories of Logs
+
+Main Functions:
+- FolderSearch: Qt-free helpers used by the folder search dialog and its worker processes
+- iter_files(): Walks a directory tree and yields the log files to be searched
+- search_file(): Case-insensitive search of a single (optionally gzipped) file, returns bounded hits
+"""
+
+import gzip
+import os
+import re
+import zlib
+
+
+class FolderSearch:
+    """
+    FolderSearch holds the picklable functions executed in the process pool.
+    Nothing in here may import Qt, so worker processes start quickly.
+    """
+
+    maxHitsPerFile: int = 200  # hits kept per file, the count keeps going
+    maxLineLength: int = 400  # hit text is truncated to this many characters
+    sniffSize: int = 8192  # bytes read to detect binary files
+    # line breaks of str.splitlines() besides \n (UTF-8 encoded), LogViewer numbers its rows by them
+    otherBreaks = re.compile(rb'[\r\x0b\x0c\x1c-\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]')
+
+    @staticmethod
+    def iter_files(root: str, include_gz: bool = False):
+        """
+        Yields the files below root in a stable order.
+        Hidden directories are skipped, gzipped files are only yielded when include_gz is set.
+        """
+        for directory, sub_dirs, files in os.walk(root, followlinks=False):
+            sub_dirs[:] = sorted(d for d in sub_dirs if not d.startswith('.'))
+            for file_name in sorted(files):
+                if file_name.endswith(".gz") and not include_gz:
+                    continue
+                path = os.path.join(directory, file_name)
+                if os.path.isfile(path):
+                    yield path
+
+    @staticmethod
+    def search_file(path: str, text: str, max_hits: int = maxHitsPerFile,
+                    max_line: int = maxLineLength) -> tuple[str, int, list[tuple[int, str]], str]:
+        """
+        Searches text (case-insensitive) in the file. Lines are numbered as the rows of LogViewer,
+        which splits on every str.splitlines() break (e.g. \r of progress output), not only on \n.
+
+        Returns:
+            (path, number of matching lines, first max_hits (line number, line text) hits, error message)
+        """
+        text = text.lower()
+        count, hits = 0, []
+        try:
+            opener = gzip.open if path.endswith(".gz") else open
+            with opener(path, 'rb') as fd:
+                if b'\0' in fd.read(FolderSearch.sniffSize):
+                    return path, 0, [], ""  # binary file
+                fd.seek(0)
+                needle = text.encode('utf-8')
+                row = 0
+                for raw_line in fd:
+                    if FolderSearch.otherBreaks.search(raw_line):
+                        # rare, several rows (or a \r\n ending): decoded and split as the viewer does
+                        lines = raw_line.decode('utf-8', errors='replace').splitlines()
+                        rows = enumerate(lines, start=row + 1)
+                        row += len(lines)
+                    else:
+                        row += 1
+                        # cheap bytes test first, decoding only the candidate lines
+                        if needle.isascii() and needle not in raw_line.lower():
+                            continue
+                        rows = [(row, raw_line.decode('utf-8', errors='replace').rstrip('\n'))]
+                    for line_no, line in rows:
+                        if text not in line.lower():
+                            continue
+                        count += 1
+                        if len(hits) < max_hits:
+                            hits.append((line_no, line[:max_line]))
+        except (OSError, EOFError, zlib.error) as e:  # including corrupt .gz files
+            return path, count, hits, str(e)
+        return path, count, hits, ""
@@ -0,0 +1,205 @@
+"""
+FolderSearchDialog.py - Search In Folder Dialog
+
+Main Functions:
+- FolderSearchDialog: Non-modal dialog that greps a directory of logs without opening tabs
+- start_search(): Walks the folder in a thread and feeds the files found to a bounded process pool
+- poll(): Streams finished results into the hit tree with per-file counts
+- set_open_callback(): Registers the callback that opens a hit's file at its line
+"""
+
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, QCheckBox, QLabel,
+    QTreeWidget, QTreeWidgetItem, QFileDialog
+)
+
+from FolderSearch import FolderSearch
+
+
+class FolderSearchDialog(QDialog):
+    maxDisplayedHits: int = 20000  # hits shown in total, later files only show their counts
+    pollInterval: int = 50  # ms
+    walkAhead: int = 1000  # files found by the walk ahead of the workers
+
+    def __init__(self, parent=None, folder: str = ""):
+        super().__init__(parent)
+        self.setWindowTitle("Search in Folder")
+        self.resize(900, 600)
+        self.openCallback = None
+        self.pool: ProcessPoolExecutor | None = None
+        self.workers: int = min(8, os.cpu_count() or 1)
+        self.pending: set = set()
+        self.found: queue.Queue | None = None  # files found by the walk thread, None once all are submitted
+        self.walkStop = threading.Event()
+        self.searchText: str = ""
+        self.filesSearched, self.filesMatched, self.totalHits, self.displayedHits = 0, 0, 0, 0
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.pollInterval)
+        self.timer.timeout.connect(self.poll)
+
+        self.folderEntry = QLineEdit(folder)
+        self.browseButton = QPushButton("...")
+        self.searchEntry = QLineEdit()
+        self.gzCheck = QCheckBox("Search .gz files")
+        self.searchButton = QPushButton("Search")
+        self.stopButton = QPushButton("Stop")
+        self.statusLabel = QLabel()
+        self.hitTree = QTreeWidget()
+        self.init_ui()
+
+    def init_ui(self):
+        self.setLayout(QVBoxLayout())
+        folder_layout = QHBoxLayout()
+        folder_layout.addWidget(QLabel("Folder:"))
+        self.folderEntry.setPlaceholderText("Directory to search...")
+        folder_layout.addWidget(self.folderEntry)
+        self.browseButton.setToolTip("Browse for a folder")
+        self.browseButton.clicked.connect(self.browse)
+        folder_layout.addWidget(self.browseButton)
+        self.layout().addLayout(folder_layout)
+
+        search_layout = QHBoxLayout()
+        self.searchEntry.setPlaceholderText("Search...")
+        self.searchEntry.returnPressed.connect(self.start_search)
+        search_layout.addWidget(self.searchEntry)
+        search_layout.addWidget(self.gzCheck)
+        self.searchButton.clicked.connect(self.start_search)
+        search_layout.addWidget(self.searchButton)
+        self.stopButton.setEnabled(False)
+        self.stopButton.clicked.connect(self.stop_search)
+        search_layout.addWidget(self.stopButton)
+        self.layout().addLayout(search_layout)
+
+        self.hitTree.setHeaderLabels(["Hit", "Count"])
+        self.hitTree.setUniformRowHeights(True)
+        self.hitTree.header().setStretchLastSection(False)
+        self.hitTree.setColumnWidth(0, 760)
+        self.hitTree.itemClicked.connect(self.open_item)
+        self.layout().addWidget(self.hitTree)
+        self.layout().addWidget(self.statusLabel)
+        self.searchEntry.setFocus()
+
+    def set_open_callback(self, callback):
+        """callback(file, row) opens the file in a tab positioned at the 0-based row."""
+        self.openCallback = callback
+
+    def browse(self):
+        folder = QFileDialog.getExistingDirectory(self, "Search in folder", self.folderEntry.text())
+        if folder:
+            self.folderEntry.setText(folder)
+
+    def start_search(self):
+        self.stop_search()
+        folder, self.searchText = self.folderEntry.text().strip(), self.searchEntry.text()
+        if not folder or not self.searchText:
+            return
+        if not os.path.isdir(folder):
+            self.statusLabel.setText(F"Not a directory: '{folder}'")
+            return
+        self.hitTree.clear()
+        self.filesSearched, self.filesMatched, self.totalHits, self.displayedHits = 0, 0, 0, 0
+        # listing a large NFS tree takes long, the walk runs in a thread and the search starts with its first files
+        self.found, self.walkStop = queue.Queue(self.walkAhead), threading.Event()
+        threading.Thread(target=self.walk, args=(folder, self.gzCheck.isChecked(), self.found, self.walkStop),
+                         name="folder-walk", daemon=True).start()
+        # spawn keeps the workers free of the Qt state of this process
+        self.pool = ProcessPoolExecutor(max_workers=self.workers,
+                                        mp_context=multiprocessing.get_context("spawn"))
+        self.searchButton.setEnabled(False)
+        self.stopButton.setEnabled(True)
+        self.submit()
+        self.timer.start()
+
+    @staticmethod
+    def walk(folder: str, include_gz: bool, found: queue.Queue, stop: threading.Event):
+        """Runs in a thread, puts the files to search and then None in found, until stopped."""
+        for path in itertools.chain(FolderSearch.iter_files(folder, include_gz), [None]):
+            # found is bounded, the walk advances only as files are submitted
+            while not stop.is_set():
+                try:
+                    found.put(path, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+            if stop.is_set():
+                return
+
+    def submit(self):
+        # keep a bounded number of files in flight
+        while self.found is not None and len(self.pending) < self.workers * 4:
+            try:
+                file = self.found.get_nowait()
+            except queue.Empty:
+                break
+            if file is None:
+                self.found = None
+                break
+            self.pending.add(self.pool.submit(FolderSearch.search_file, file, self.searchText))
+
+    def poll(self):
+        for future in [f for f in self.pending if f.done()]:
+            self.pending.discard(future)
+            if not future.cancelled() and not future.exception():
+                self.add_result(*future.result())
+            self.filesSearched += 1
+        try:
+            self.submit()
+        except BrokenProcessPool as e:
+            self.stop_search()
+            self.statusLabel.setText(F"Search failed: {e}")
+            return
+        self.update_status()
+        if not self.pending and self.found is None:
+            self.stop_search()
+
+    def add_result(self, file: str, count: int, hits: list[tuple[int, str]], error: str):
+        if error:
+            QTreeWidgetItem(self.hitTree, [F"{file}: {error}", ""]).setDisabled(True)
+        if not count:
+            return
+        self.filesMatched += 1
+        self.totalHits += count
+        file_item = QTreeWidgetItem(self.hitTree, [file, str(count)])
+        file_item.setData(0, Qt.UserRole, (file, 0))
+        file_item.setTextAlignment(1, Qt.AlignRight)
+        shown = hits[:max(0, self.maxDisplayedHits - self.displayedHits)]
+        for line_no, text in shown:
+            hit_item = QTreeWidgetItem(file_item, [F"{file}:{line_no}:{text}", ""])
+            hit_item.setData(0, Qt.UserRole, (file, line_no - 1))
+        self.displayedHits += len(shown)
+        if count > len(shown):
+            QTreeWidgetItem(file_item, [F"... {count - len(shown)} more hits", ""]).setDisabled(True)
+
+    def update_status(self):
+        state = "Searching" if self.timer.isActive() else "Done"
+        self.statusLabel.setText(
+            F"{state}: {self.totalHits} hits in {self.filesMatched} of {self.filesSearched} files")
+
+    def stop_search(self):
+        self.timer.stop()
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+        self.walkStop.set()
+        self.pending, self.found = set(), None
+        self.searchButton.setEnabled(True)
+        self.stopButton.setEnabled(False)
+        self.update_status()
+
+    def open_item(self, item: QTreeWidgetItem, column: int = 0):
+        target = item.data(0, Qt.UserRole)
+        if target and self.openCallback:
+            self.openCallback(*target)
+
+    def closeEvent(self, event):
+        self.stop_search()
+        super().closeEvent(event)
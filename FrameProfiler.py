@@ -0,0 +1,92 @@
+"""
+FrameProfiler.py - Per-Frame Paint Instrumentation
+
+Main Functions:
+- FrameProfiler: Records one sample per frame painted by the attached LogViews
+- begin() / end(): Called by LogView.paintEvent around painting, they diff the counters of model and delegate
+- summary(): One-line readout of the last frame and of the recent frames, shown by the diagnostics bar
+- export(): Writes the samples to a CSV or JSON trace (chosen by the file extension) for offline analysis
+"""
+
+import csv
+import json
+import time
+from collections import deque
+
+
+class FrameProfiler:
+    """
+    FrameProfiler splits the time of a frame into what the application does: rebuilding row
+    documents on render cache misses (HTML building, parsing and layout), and within that the
+    link wrapping (wrap_log_file, including link status lookups). The rest of the paint time
+    is plain text drawing and Qt itself. The counters are kept by the models (dataCalls) and
+    delegates (renderCache hits/misses, buildTime, wrapTime), the profiler only reads them.
+    """
+
+    fields = ("time", "view", "paint_ms", "rows", "data_calls", "cache_hits", "cache_misses",
+              "build_ms", "wrap_ms", "wrap_calls", "first_row")
+    recentFrames: int = 60  # frames summarized by summary()
+
+    def __init__(self, max_samples: int = 100000):
+        self.samples: deque[dict] = deque(maxlen=max_samples)
+        self.started: float = time.perf_counter()
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def clear(self):
+        self.samples.clear()
+        self.started = time.perf_counter()
+
+    @staticmethod
+    def counters(view) -> tuple:
+        delegate = view.itemDelegate()
+        cache = delegate.renderCache
+        return (view.model().dataCalls, cache.hits, cache.misses, delegate.buildTime, delegate.wrapTime,
+                delegate.wrapCalls)
+
+    def begin(self, view) -> tuple:
+        return time.perf_counter(), self.counters(view)
+
+    def end(self, view, token: tuple, rows: int, first_row: int):
+        start, before = token
+        now = time.perf_counter()
+        data_calls, hits, misses, build, wrap, wrap_calls = (
+            after - previous for after, previous in zip(self.counters(view), before))
+        self.samples.append({
+            "time": round(start - self.started, 6),
+            "view": view.objectName(),
+            "paint_ms": round((now - start) * 1000, 3),
+            "rows": rows,
+            "data_calls": data_calls,
+            "cache_hits": hits,
+            "cache_misses": misses,
+            "build_ms": round(build * 1000, 3),
+            "wrap_ms": round(wrap * 1000, 3),
+            "wrap_calls": wrap_calls,
+            "first_row": first_row,
+        })
+
+    def summary(self) -> str:
+        if not self.samples:
+            return "No frames painted yet"
+        last = self.samples[-1]
+        recent = list(self.samples)[-self.recentFrames:]
+        hits = sum(sample["cache_hits"] for sample in recent)
+        lookups = hits + sum(sample["cache_misses"] for sample in recent)
+        paint = sorted(sample["paint_ms"] for sample in recent)
+        return (F"{last['view']}: {last['paint_ms']:.1f} ms, {last['rows']} rows, "
+                F"{last['data_calls']} data(), build {last['build_ms']:.1f} ms, wrap {last['wrap_ms']:.1f} ms"
+                F"  |  last {len(recent)} frames: median {paint[len(paint) // 2]:.1f} ms, max {paint[-1]:.1f} ms, "
+                F"cache hits {100 * hits / lookups if lookups else 100:.0f}%"
+                F"  |  {len(self.samples)} samples")
+
+    def export(self, path: str):
+        samples = list(self.samples)
+        with open(path, "w", newline="") as file:
+            if path.lower().endswith(".json"):
+                json.dump({"fields": self.fields, "samples": samples}, file, indent=1)
+            else:
+                writer = csv.DictWriter(file, fieldnames=self.fields)
+                writer.writeheader()
+                writer.writerows(samples)
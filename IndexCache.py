@@ -0,0 +1,108 @@
+"""
+IndexCache.py - Persistent Cache of Line Classifications
+
+Main Functions:
+- IndexCache: The level of every line of large plain text logs, kept in ~/.cache/tablog across restarts
+- load(): Returns the cached levels and loaded state of a file if it is unchanged (or only appended to)
+- store(): Saves the levels of a classified file, removing the least recently used entries beyond maxBytes
+"""
+
+import hashlib
+import json
+import os
+
+from LogLevelKeywords import LogLevelKeywords
+
+
+class IndexCache:
+    """
+    IndexCache keeps what classification computes, one LogLevel value per line, so reopening a
+    log (e.g. restoring a session) only reads its lines and pairs them with the cached levels,
+    as LogViewer.restore() does for evicted tabs. Only plain text files are cached, their lines
+    are read back from the file. An entry is used while the file keeps its inode and the bytes
+    it had: the same size and modification time, or a larger size with the same tail at the
+    cached size (lines appended since are classified as on reload). Entries also record the
+    classification keywords, changing them invalidates the cache. Qt-free, used by workers.
+    """
+
+    minFileBytes: int = 256 * 1024  # smaller files are classified faster than an entry is read
+    maxBytes: int = 512 * 1024 * 1024  # total size of the entries
+    folder: str = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "tablog")
+    suffix: str = ".levels"
+
+    @classmethod
+    def entry(cls, path: str) -> str:
+        key = hashlib.sha1(os.path.realpath(path).encode(errors="surrogateescape")).hexdigest()
+        return os.path.join(cls.folder, key + cls.suffix)
+
+    @staticmethod
+    def signature(keywords: LogLevelKeywords) -> str:
+        return hashlib.sha1(repr([(level.name, keywords[level]) for level in keywords]).encode()).hexdigest()
+
+    @classmethod
+    def load(cls, path: str, keywords: LogLevelKeywords) -> tuple[bytes, tuple[int, bytes, tuple[int, int]]] | None:
+        """
+        Returns:
+            (LogLevel value per cached line, LogFileReader.loaded_state() of the cached part of the file),
+            None if the file is not cached or changed
+        """
+        entry = cls.entry(path)
+        try:
+            with open(entry, "rb") as fd:
+                header = json.loads(fd.readline())
+                levels = fd.read()
+            stat = os.stat(path)
+            size, tail = header["size"], bytes.fromhex(header["tail"])
+            if (header["path"] != os.path.realpath(path) or header["signature"] != cls.signature(keywords)
+                    or header["inode"] != [stat.st_dev, stat.st_ino] or len(levels) != header["lines"]
+                    or stat.st_size < size or (stat.st_size == size and stat.st_mtime_ns != header["mtime"])):
+                return None
+            with open(path, "rb") as fd:
+                fd.seek(size - len(tail))
+                if fd.read(len(tail)) != tail:
+                    return None
+            os.utime(entry)  # recently used, pruned last
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return levels, (size, tail, (stat.st_dev, stat.st_ino))
+
+    @classmethod
+    def store(cls, path: str, levels: bytes, loaded: tuple | None, keywords: LogLevelKeywords):
+        """Caches the levels of the part of the file described by loaded (LogFileReader.loaded_state())."""
+        if loaded is None or loaded[0] < cls.minFileBytes:
+            return
+        size, tail, inode = loaded
+        try:
+            stat = os.stat(path)
+            if (stat.st_dev, stat.st_ino) != inode or stat.st_size != size:
+                return  # changed while loading, its modification time is not the one of the cached bytes
+            header = {"path": os.path.realpath(path), "size": size, "mtime": stat.st_mtime_ns, "inode": list(inode),
+                      "tail": tail.hex(), "lines": len(levels), "signature": cls.signature(keywords)}
+            os.makedirs(cls.folder, exist_ok=True)
+            entry = cls.entry(path)
+            temporary = F"{entry}.{os.getpid()}"
+            with open(temporary, "wb") as fd:
+                fd.write(json.dumps(header).encode() + b"\n")
+                fd.write(levels)
+            os.replace(temporary, entry)
+            cls.prune()
+        except OSError as e:
+            print(F"-WARNING- can't cache the classification of '{path}': {e}")
+
+    @classmethod
+    def prune(cls):
+        entries = []
+        with os.scandir(cls.folder) as scan:
+            for item in scan:
+                if item.name.endswith(cls.suffix):
+                    stat = item.stat()
+                    entries.append((stat.st_mtime, stat.st_size, item.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= cls.maxBytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
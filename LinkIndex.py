@@ -0,0 +1,100 @@
+"""
+LinkIndex.py - Load-Time Link Span Index
+
+Main Functions:
+- LinkIndex: Sparse per-row index of the links (URLs and NFS file paths) found in a log
+- reset() / extend(): Start indexing the rows of a (re)loaded or grown log in the background
+- row_spans(): Returns the (start, end, kind) spans of a row, used for painting and hit-testing
+- referenced_files(): Lists the file paths referenced in the log with their number of occurrences
+- memory_bytes(): Estimated size of the stored spans
+"""
+
+import re
+from collections import Counter
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+
+class LinkIndex(QObject):
+    """
+    LinkIndex runs the link regular expressions once per line, in small chunks on a zero
+    timer after load, so the UI stays responsive. Only rows containing links are stored.
+    Rows not indexed yet are scanned on demand when painted.
+    """
+
+    Url, Path = range(2)
+
+    urlPattern = re.compile(r'https?://[^\s<>"]+')
+    # NFS file paths (including .prc and .prc.status)
+    # Note: .prc.status must come before .prc for proper matching
+    pathPattern = re.compile(r'/home/[\w/._:-]+\.(?:prc\.status|log|tcl|yaml|cfg|txt|py|prc)')
+    chunkRows: int = 20000
+    rowBytes: int = 120  # estimated bytes of a row's dict entry and spans tuple
+    spanBytes: int = 100  # estimated bytes of one (start, end, kind) tuple
+
+    finished = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.spans: dict[int, tuple[tuple[int, int, int], ...]] = {}
+        self.indexedRows: int = 0  # rows [0, indexedRows) are indexed
+        self.logData: list = []
+        self.timer = QTimer(self)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self.index_chunk)
+
+    @classmethod
+    def line_spans(cls, line: str) -> tuple[tuple[int, int, int], ...]:
+        has_url, has_path = '://' in line, '/home/' in line
+        if not has_url and not has_path:
+            return ()
+        spans = [(m.start(), m.end(), cls.Url) for m in cls.urlPattern.finditer(line)] if has_url else []
+        if has_path:
+            urls = spans[:]
+            spans.extend((m.start(), m.end(), cls.Path) for m in cls.pathPattern.finditer(line)
+                         if not any(m.start() < end and m.end() > start for start, end, _ in urls))
+            spans.sort()
+        return tuple(spans)
+
+    def reset(self, log_data: list):
+        self.spans.clear()
+        self.indexedRows = 0
+        self.logData = log_data
+        self.timer.start()
+
+    def extend(self):
+        """Rows were appended to the indexed log data."""
+        if self.indexedRows < len(self.logData):
+            self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def is_finished(self) -> bool:
+        return self.indexedRows >= len(self.logData)
+
+    def index_chunk(self):
+        end = min(len(self.logData), self.indexedRows + self.chunkRows)
+        line_spans, spans = self.line_spans, self.spans
+        for row in range(self.indexedRows, end):
+            if found := line_spans(self.logData[row][1]):
+                spans[row] = found
+        self.indexedRows = end
+        if self.is_finished():
+            self.timer.stop()
+            self.finished.emit()
+
+    def row_spans(self, row: int, line: str = None) -> tuple[tuple[int, int, int], ...]:
+        if row < self.indexedRows:
+            return self.spans.get(row, ())
+        return self.line_spans(self.logData[row][1] if line is None else line)
+
+    def memory_bytes(self) -> int:
+        return self.spanBytes * sum(map(len, self.spans.values())) + self.rowBytes * len(self.spans)
+
+    def referenced_files(self) -> list[tuple[str, int]]:
+        """File paths referenced in the indexed rows, most referenced first."""
+        files = Counter(
+            self.logData[row][1][start:end]
+            for row, row_spans in self.spans.items() for start, end, kind in row_spans if kind == self.Path)
+        return files.most_common()
@@ -0,0 +1,153 @@
+"""
+LinkPrefetcher.py - Background Loading of the Files Referenced by a Log
+
+Main Functions:
+- LinkPrefetcher: Process-wide prefetcher of the most referenced files of the shown log
+- instance(): Returns the shared prefetcher
+- prefetch(): Queues the files of LinkIndex.referenced_files(), read and classified by a small process pool
+- take(): Hands the prefetched LogFileReader.classify_file() result of a file over to the tab opening it
+- set_enabled(): View → Prefetch Linked Files, remembered in the settings
+"""
+
+import os
+from collections import OrderedDict
+
+from PyQt5.QtCore import QCoreApplication, QObject, QSettings, QTimer
+
+from LogFileReader import LogFileReader
+from MemoryBudget import MemoryBudget
+
+
+class LinkPrefetcher(QObject):
+    """
+    Following a file link used to read and classify the target in the GUI, often a large log
+    on NFS. Once the links of the shown log are indexed, the prefetcher has its topFiles most
+    referenced files read and classified by worker processes (classification is CPU bound
+    Python, threads would hold up the GUI), as the bulk open does: this warms the page cache
+    and the IndexCache, and keeps the levels until a link to the file is followed, which then
+    only reads the lines back (LogViewer.load_classified()).
+
+    At most `workers` files are read at once, files over maxFileBytes are skipped (checked by
+    the worker, so a hanging mount never blocks the GUI). Prefetched results are held in least
+    recently prefetched order, at most maxResults of them, and all are dropped as soon as the
+    MemoryBudget is exceeded. Nothing is prefetched while over the budget.
+    """
+
+    topFiles: int = 5  # most referenced files prefetched per log
+    maxFileBytes: int = 64 * 1024 * 1024  # larger files are read when their link is followed
+    maxResults: int = 20  # prefetched files kept, the oldest are dropped first
+    workers: int = min(2, os.cpu_count() or 1)
+    pollInterval: int = 100  # ms
+    resultRowBytes: int = 60  # estimated bytes per line of a result beyond its text (levels of plain text are 1 byte)
+
+    _instance: 'LinkPrefetcher | None' = None
+
+    def __init__(self):
+        super().__init__()
+        self.enabled: bool = QSettings("Avice", "TabLog").value("link_prefetch", True, type=bool)
+        self.pool: 'ProcessPoolExecutor | None' = None  # started with the first prefetch, stopped when idle
+        self.queue: list[str] = []  # paths waiting for a worker
+        self.pending: dict['Future', str] = {}
+        self.results: OrderedDict[str, tuple[tuple, tuple]] = OrderedDict()  # path: (file signature, result)
+        self.skipped: set[str] = set()  # not files, too large or unreadable
+        self.budget = MemoryBudget.instance()
+        self.budget.usageChanged.connect(self.check_budget)
+        self.pollTimer = QTimer(self)
+        self.pollTimer.setInterval(self.pollInterval)
+        self.pollTimer.timeout.connect(self.poll)
+        if QCoreApplication.instance():
+            QCoreApplication.instance().aboutToQuit.connect(self.stop)  # don't leave workers reading on exit
+
+    @classmethod
+    def instance(cls) -> 'LinkPrefetcher':
+        if cls._instance is None:
+            cls._instance = LinkPrefetcher()
+        return cls._instance
+
+    def set_enabled(self, enabled: bool):
+        self.enabled = enabled
+        QSettings("Avice", "TabLog").setValue("link_prefetch", enabled)
+        if not enabled:
+            self.stop()
+            self.results.clear()
+
+    def prefetch(self, paths: list[str]):
+        """Queues the paths (most referenced first) that are not prefetched, in progress or skipped already."""
+        if not self.enabled or not self.budget.has_room(0):
+            return
+        in_progress = set(self.queue) | set(self.pending.values())
+        for path in paths:
+            if path in self.results:
+                self.results.move_to_end(path)
+            elif path not in in_progress and path not in self.skipped:
+                self.queue.append(path)
+        self.submit()
+
+    def submit(self):
+        try:
+            while self.queue and len(self.pending) < self.workers:
+                if self.pool is None:
+                    import multiprocessing
+                    from concurrent.futures import ProcessPoolExecutor
+                    self.pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                    mp_context=multiprocessing.get_context("spawn"))
+                path = self.queue.pop(0)
+                self.pending[self.pool.submit(LogFileReader.prefetch_file, path, self.maxFileBytes)] = path
+        except (OSError, RuntimeError) as e:  # including BrokenProcessPool
+            print(F"-WARNING- prefetching linked files failed, disabled until restarted: {e}")
+            self.enabled = False
+            self.stop()
+            return
+        if self.pending:
+            self.pollTimer.start()
+
+    def poll(self):
+        for future in [future for future in self.pending if future.done()]:
+            path = self.pending.pop(future)
+            try:
+                prefetched = future.result()
+            except Exception:
+                prefetched = None
+            if prefetched is None:
+                self.skipped.add(path)
+                continue
+            self.results[path] = prefetched
+            while len(self.results) > self.maxResults:
+                self.results.popitem(last=False)
+        self.check_budget()
+        self.submit()
+        if not self.pending:
+            self.stop()
+
+    def stop(self):
+        self.pollTimer.stop()
+        self.queue.clear()
+        for future in self.pending:
+            future.cancel()
+        self.pending = {}
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+    def take(self, path: str) -> tuple | None:
+        """The prefetched classify_file() result of the file, None if not prefetched or changed since."""
+        prefetched = self.results.pop(path, None)
+        if prefetched is None:
+            return None
+        signature, result = prefetched
+        try:
+            if LogFileReader.file_signature(os.stat(path)) != signature:
+                return None
+        except OSError:
+            return None
+        return result
+
+    def memory_bytes(self) -> int:
+        return sum(len(result[0]) + (sum(map(len, result[1])) + self.resultRowBytes * len(result[1]) if result[1] else 0)
+                   for _, result in self.results.values())
+
+    def check_budget(self):
+        """Memory pressure: the tabs come first, prefetched files are read again when their link is followed."""
+        if self.results and self.budget.total() + self.memory_bytes() > self.budget.maxBytes:
+            self.results.clear()
+            self.queue.clear()
@@ -0,0 +1,100 @@
+"""
+LinkStatusCache.py - Asynchronous Path Existence Checks for File Links
+
+Main Functions:
+- LinkStatusCache: Process-wide cache of file/directory/missing status per path, with a TTL
+- instance(): Returns the shared cache
+- status(): Non-blocking lookup, unknown or expired paths are queued for a background stat
+- statusChanged: Signal emitted (in the GUI thread) with the path whose status was resolved
+"""
+
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class LinkStatusCache(QObject):
+    """
+    LinkStatusCache keeps os.stat calls on (possibly hanging) NFS paths out of the GUI thread.
+    Paths are stat'ed by daemon worker threads, so a stuck automounter can't block the UI or
+    the exit of the application. At most maxPerFilesystem stats run at once per filesystem
+    (the first two path components, i.e. the automount point), the rest wait in a queue.
+    """
+
+    Unknown, File, Directory, Missing = range(4)
+
+    statusChanged = pyqtSignal(str)
+
+    _instance: 'LinkStatusCache | None' = None
+
+    def __init__(self, ttl: float = 60.0, workers: int = 8, max_per_filesystem: int = 2, max_paths: int = 100000):
+        super().__init__()
+        self.ttl: float = ttl
+        self.maxPerFilesystem: int = max_per_filesystem
+        self.maxPaths: int = max_paths
+        # path: (status, time of the stat), least recently stat'ed first
+        self._statuses: OrderedDict[str, tuple[int, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._requested: set[str] = set()  # queued or in flight
+        self._inFlight: dict[str, int] = {}  # filesystem: number of running stats
+        self._waiting: dict[str, deque[str]] = {}  # filesystem: paths waiting for a free slot
+        self._work: queue.Queue[str] = queue.Queue()
+        for _ in range(workers):
+            threading.Thread(target=self._worker, name="link-status", daemon=True).start()
+
+    @classmethod
+    def instance(cls) -> 'LinkStatusCache':
+        if cls._instance is None:
+            cls._instance = LinkStatusCache()
+        return cls._instance
+
+    @staticmethod
+    def filesystem(path: str) -> str:
+        return "/".join(path.split("/", 3)[:3])
+
+    def status(self, path: str) -> int:
+        """Returns the last known status, (re)checking the path in the background if unknown or expired."""
+        entry = self._statuses.get(path)
+        if entry is None or time.monotonic() - entry[1] >= self.ttl:
+            self.request(path)
+        return entry[0] if entry else self.Unknown
+
+    def request(self, path: str):
+        with self._lock:
+            if path in self._requested:
+                return
+            self._requested.add(path)
+            filesystem = self.filesystem(path)
+            if self._inFlight.get(filesystem, 0) < self.maxPerFilesystem:
+                self._inFlight[filesystem] = self._inFlight.get(filesystem, 0) + 1
+                self._work.put(path)
+            else:
+                self._waiting.setdefault(filesystem, deque()).append(path)
+
+    def _worker(self):
+        while True:
+            path = self._work.get()
+            if os.path.isfile(path):
+                status = self.File
+            elif os.path.isdir(path):
+                status = self.Directory
+            else:
+                status = self.Missing
+            with self._lock:
+                previous = self._statuses.get(path)
+                self._statuses[path] = (status, time.monotonic())
+                self._statuses.move_to_end(path)
+                while len(self._statuses) > self.maxPaths:
+                    self._statuses.popitem(last=False)  # the oldest status, the others stay resolved
+                self._requested.discard(path)
+                filesystem = self.filesystem(path)
+                if waiting := self._waiting.get(filesystem):
+                    self._work.put(waiting.popleft())
+                else:
+                    self._inFlight[filesystem] -= 1
+            if previous is None or previous[0] != status:
+                self.statusChanged.emit(path)
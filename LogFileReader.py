@@ -0,0 +1,131 @@
+"""
+LogFileReader.py - Reading and Classifying Log Files, in the GUI or in Worker Processes
+
+Main Functions:
+- LogFileReader: Qt-free helpers shared by LogViewer.load_file() and the bulk open process pool
+- read_lines(): Sniffs the file type (plain, ANSI colored, gzipped) and returns its lines
+- classify_file(): Worker entry point, reads and classifies a file and returns the level of every line
+- prefetch_file(): Worker entry point of the LinkPrefetcher, classify_file() of a linked file within a size limit
+- pair_levels(): Pairs lines with levels returned by a worker, giving the rows of LogTableModel
+"""
+
+import os
+import traceback
+
+from IndexCache import IndexCache
+from LogLevel import LogLevel
+from LogLevelKeywords import LogLevelKeywords
+
+
+class LogFileReader:
+    """
+    LogFileReader holds the picklable functions executed in the bulk open process pool.
+    Nothing in here may import Qt, so worker processes start quickly.
+
+    A worker returns levels as bytes (one LogLevel value per line). The lines of a plain text
+    file are not sent back: the GUI reads the same bytes again (from the page cache), which is
+    much cheaper than pickling millions of strings. Lines of converted files (ANSI, gzip) are sent.
+    """
+
+    tailSize: int = 256  # bytes kept from the end of a plain text file to recognize it on reload
+
+    _keywords: LogLevelKeywords | None = None
+
+    @classmethod
+    def keywords(cls) -> LogLevelKeywords:
+        if cls._keywords is None:
+            cls._keywords = LogLevelKeywords()
+        return cls._keywords
+
+    @staticmethod
+    def file_type(path: str) -> str:
+        """Content-based type from the 'file' command, not the extension."""
+        file_type = "ASCII text"
+        with os.popen(F"/usr/bin/file -bL {path}") as fd:
+            lines = fd.read().splitlines(keepends=False)
+            if lines:
+                file_type = lines[0].strip()
+        return file_type
+
+    @classmethod
+    def loaded_state(cls, data: bytes, stat: os.stat_result) -> tuple[int, bytes, tuple[int, int]] | None:
+        """(size, tail, (st_dev, st_ino)) of loaded plain text, appends are only possible after a complete last line."""
+        if data and not data.endswith(b"\n"):
+            return None
+        return len(data), data[-cls.tailSize:], (stat.st_dev, stat.st_ino)
+
+    @classmethod
+    def read_lines(cls, path: str) -> tuple[list[str], bool, tuple | None, list[str]]:
+        """
+        Returns:
+            (lines, lines are HTML (converted ANSI colors), loaded_state() of plain text or None,
+             error lines shown instead of the file, empty if it was read)
+        """
+        if not path or not os.path.exists(path):
+            return [], False, None, [F"File not found: '{path}'"]
+        file_type = cls.file_type(path)
+        if "ASCII text" in file_type:
+            if "with escape sequences" in file_type:
+                from ansi2html import Ansi2HTMLConverter as a2h  # slow to import, few logs are colored
+                html_content = a2h(inline=True).convert(open(path).read(), full=False)
+                return html_content.splitlines(keepends=False), True, None, []
+            with open(path, 'rb') as fd:
+                data = fd.read()
+                loaded = cls.loaded_state(data, os.fstat(fd.fileno()))
+            return data.decode(errors='replace').splitlines(keepends=False), False, loaded, []
+        if "gzip compressed data" in file_type:
+            with os.popen(F"/usr/bin/zcat -vq {path}") as fd:
+                return fd.read().splitlines(keepends=False), False, None, []
+        return [], False, None, [F"Unsupported file type: '{file_type}'"]
+
+    @classmethod
+    def classify_file(cls, path: str) -> tuple[bytes, list[str] | None, bool, tuple | None, list[str]]:
+        """
+        Reads and classifies the file in a worker process, or takes the levels from the IndexCache.
+
+        Returns:
+            (LogLevel value per line, the lines unless loaded_state is set (plain text is read again
+             by the GUI), lines are HTML, loaded_state() or None, error lines)
+        """
+        try:
+            cached = IndexCache.load(path, cls.keywords())
+            if cached:
+                return cached[0], None, False, cached[1], []
+            lines, html_lines, loaded, errors = cls.read_lines(path)
+            if errors:
+                return b"", None, False, None, errors
+            levels = bytes(level.value for level, _ in cls.keywords().classify_lines(lines))
+            IndexCache.store(path, levels, loaded, cls.keywords())
+            return levels, None if loaded else lines, html_lines, loaded, []
+        except Exception as e:
+            return b"", None, False, None, [F"Error loading file: '{path}':",
+                                            F"-ERROR- loading file: '{path}': {e}\n{traceback.format_exc()}"]
+
+    @staticmethod
+    def file_signature(stat: os.stat_result) -> tuple[int, int, int, int]:
+        """Identifies the content of a file, a prefetched result is used only while it is unchanged."""
+        return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    @classmethod
+    def prefetch_file(cls, path: str, max_bytes: int) -> tuple[tuple, tuple] | None:
+        """
+        Reads (into the page cache) and classifies a file referenced by a link, in a worker process,
+        so the path is stat'ed there rather than in the GUI (it may be on a slow NFS mount).
+
+        Returns:
+            (file_signature() before reading, classify_file() result), None if the path is not a file,
+            is larger than max_bytes or can't be read
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if not os.path.isfile(path) or stat.st_size > max_bytes:
+            return None
+        result = cls.classify_file(path)
+        return (cls.file_signature(stat), result) if not result[4] else None
+
+    @staticmethod
+    def pair_levels(levels: bytes, lines: list[str]) -> list[tuple[LogLevel, str]]:
+        level_of = {level.value: level for level in LogLevel}
+        return list(zip(map(level_of.__getitem__, levels), lines))
@@ -3,96 +3,244 @@ LogLineDelegate.py - Custom Log Line Renderer
 
 Main Functions:
 - LogLineDelegate: QStyledItemDelegate for rendering log lines with custom styling
-- paint(): Renders log lines with level-based colors and clickable file links
-- wrap_log_file(): Converts file paths in log lines to clickable HTML links
+- paint(): Renders log lines with level-based colors and clickable file links,
+  ordinary rows (no links, ANSI markup or highlights) are drawn directly as plain text
+- visible_slice(): Character range of a long row inside the viewport, only that slice is laid out and drawn
+- text_rect(): Where a row or slice is drawn, wrapped rows at exactly LogView.chars_per_line() characters
+- render_document(): Returns the laid-out document of a row from the render cache, building it on a miss
+- wrap_log_file(): Converts the link spans indexed at load time (LinkIndex) to clickable HTML
+  links, using the shared LinkStatusCache so no path is stat'ed in the GUI thread
+- link_status_changed(): Repaints only the rows showing a path whose status got resolved or changed
+- anchor_at(): Hit-tests links on the cached row document used for painting
 - editorEvent(): Handles mouse clicks on file links to load referenced files
 """
 
+import html
 import os
-import re
+import time
 
-from PyQt5.QtCore import Qt, QEvent
-from PyQt5.QtGui import QTextDocument, QColor, QCursor
-from PyQt5.QtWidgets import QStyledItemDelegate, QTableView, QStyle, QToolTip
+from PyQt5.QtCore import Qt, QEvent, QRectF, QPointF
+from PyQt5.QtGui import QTextDocument, QColor, QCursor, QTextOption, QFontMetricsF
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle, QToolTip
 
+from LinkIndex import LinkIndex
+from LinkStatusCache import LinkStatusCache
 from LogLevelColor import LogLevelColor
+from LogTableModel import LogTableModel
+from LogView import LogView
+from RowRenderCache import RowRenderCache
 
 
 class LogLineDelegate(QStyledItemDelegate):
-    def __init__(self, parent: QTableView, filter: bool = False):
-        self.parent: QTableView = parent
+    longLine: int = 4096  # characters, longer rows only lay out and draw the slice in view
+    sliceStep: int = 1024  # slice bounds are rounded to multiples, so a slice is reused while scrolling
+
+    def __init__(self, parent: LogView, filter: bool = False):
+        self.parent: LogView = parent
         self.is_filter: bool = filter
         self.docText: QTextDocument = QTextDocument()
         self.docText.setDocumentMargin(0)
         self.docText.setDefaultFont(parent.font())
-        self.nfs_pattern = r'(/home/[\w/._-]+\.log)'
         self.linkCallback = None
+        self.renderCache = RowRenderCache()
+        self.linkStatus = LinkStatusCache.instance()
+        self.renderedPaths: list[str] = []  # file paths met by the last wrap_log_file call, whatever their status
+        self.buildTime: float = 0.0  # seconds spent building row documents on render cache misses
+        self.wrapTime: float = 0.0  # seconds of that spent in wrap_log_file
+        self.wrapCalls: int = 0
+        self.textOption = QTextOption(self.docText.defaultTextOption())  # same tabs as the rich text path
+        self.textOption.setWrapMode(QTextOption.NoWrap)
+        self.wrapOption = QTextOption(self.textOption)  # wrap at any character, wrapped heights are counted in characters
+        self.wrapOption.setWrapMode(QTextOption.WrapAnywhere)
         super().__init__(parent)
+        self.linkStatus.statusChanged.connect(self.link_status_changed)
+
+    def wrap_log_file(self, text: str, spans, html_lines: bool = False) -> str:
+        """Converts the link spans of the raw line to HTML links, escaping the text around them.
+
+        Paths not stat'ed yet are shown plain until the background check resolves them. Every path
+        is recorded in renderedPaths, its status may change later (re-checked after the TTL).
+        """
+        def escape(part: str) -> str:
+            return part if html_lines else html.escape(part, quote=False)
 
-    def wrap_log_file(self, text: str) -> str:
-        # no wrappping for filter
+        started = time.perf_counter()
+        parts, end = [], 0
+        for start, span_end, kind in spans:
+            link = text[start:span_end]
+            parts.append(escape(text[end:start]))
+            end = span_end
+            if kind == LinkIndex.Url:
+                parts.append(f'<a href="URL:{link}" style="color:#0066CC">{escape(link)}</a>')
+                continue
+            status = self.linkStatus.status(link)
+            self.renderedPaths.append(link)
+            if status == LinkStatusCache.File:
+                parts.append(f'<a href="FILE:{link}">{link}</a>')
+            elif status == LinkStatusCache.Missing:
+                parts.append(f'<u style="color:#BF5B16">{link}</u>')
+            else:
+                parts.append(link)
+        parts.append(escape(text[end:]))
+        self.wrapCalls += 1
+        self.wrapTime += time.perf_counter() - started
+        return "".join(parts)
+
+    def row_html(self, index, line_slice: tuple[int, int] = None) -> str:
+        if line_slice is not None:
+            start, end = line_slice
+            line = index.data(LogTableModel.RawTextRole)[start:end].replace('\t', ' ')
+            spans = [(span_start - start, span_end - start, *kind) for span_start, span_end, *kind
+                     in self.row_spans(index) if start <= span_start and span_end <= end]
+            if self.is_filter:
+                return index.model().highlight_html(line, spans)
+            return self.wrap_log_file(line, spans)
+        # no link wrapping for filter, its display text carries the search highlights
         if self.is_filter:
-            return text
-        
-        # Pattern 1: HTTP/HTTPS URLs
-        http_pattern = r'(https?://[^\s<>"]+)'
-        
-        # Pattern 2: NFS file paths (including .prc and .prc.status)
-        # Note: .prc.status must come before .prc for proper matching
-        nfs_pattern = r'((\/home\/)[\w\/._:-]+\.(prc\.status|log|tcl|yaml|cfg|txt|py|prc))'
-
-        # Store HTTP/HTTPS URLs with placeholders to protect them from file pattern matching
-        url_placeholder_map = {}
-        placeholder_counter = [0]  # Use list to allow modification in nested function
-        
-        def wrap_http_link_with_placeholder(re_match: re.Match) -> str:
-            url = re_match.group(1)
-            placeholder = f'__HTTP_PLACEHOLDER_{placeholder_counter[0]}__'
-            placeholder_counter[0] += 1
-            url_placeholder_map[placeholder] = f'<a href="URL:{url}" style="color:#0066CC">{url}</a>'
-            return placeholder
-
-        # Function to wrap the matched NFS file path with <a> tag
-        def wrap_with_a_tag(re_match: re.Match) -> str:
-            nfs_path = re_match.group(1)
-            if os.path.exists(nfs_path):
-                if os.path.isfile(nfs_path):
-                    return f'<a href="FILE:{nfs_path}">{nfs_path}</a>'
-                elif os.path.isdir(nfs_path):
-                    return nfs_path
-            return f'<u style="color:#BF5B16">{nfs_path}</u>'
-
-        # Step 1: Replace HTTP/HTTPS URLs with placeholders
-        wrapped_line = re.sub(http_pattern, wrap_http_link_with_placeholder, text)
-        
-        # Step 2: Replace file paths (won't match inside placeholders)
-        wrapped_line = re.sub(nfs_pattern, wrap_with_a_tag, wrapped_line)
-        
-        # Step 3: Restore HTTP/HTTPS URLs from placeholders
-        for placeholder, url_html in url_placeholder_map.items():
-            wrapped_line = wrapped_line.replace(placeholder, url_html)
-        
-        return wrapped_line
+            return index.data(Qt.DisplayRole)
+        return self.wrap_log_file(index.data(LogTableModel.RawTextRole), index.data(LogTableModel.LinkSpansRole),
+                                  index.model().htmlLines)
+
+    def row_spans(self, index):
+        return index.data(LogTableModel.HighlightRole if self.is_filter else LogTableModel.LinkSpansRole)
+
+    def visible_slice(self, index, rect) -> tuple[int, int] | None:
+        """Character range of a long row inside the viewport, None for rows laid out whole.
+
+        The font is monospaced (tabs of a slice are drawn as one space), so the range follows
+        from the character width, or when wrapping from the visible wrapped lines of the row.
+        Without wrapping the bounds are widened to whole link or highlight spans.
+        """
+        if index.model().htmlLines:
+            return None  # markup can't be cut at character positions
+        length = len(index.data(LogTableModel.RawTextRole))
+        if length <= self.longLine:
+            return None
+        view, viewport = self.parent, self.parent.viewport().rect()
+        if view.is_wrapping():
+            chars, line_height = view.chars_per_line(), view.line_height()
+            step = max(1, self.sliceStep // chars)  # lines
+            first_line = max(0, (viewport.top() - rect.top()) // line_height)
+            last_line = (viewport.bottom() - rect.top()) // line_height + 1
+            first_line -= first_line % step
+            start = min(length, first_line * chars)
+            return start, max(start, min(length, (last_line + step - last_line % step) * chars))
+        char_width = QFontMetricsF(self.docText.defaultFont()).horizontalAdvance(' ')
+        start = min(length, max(0, int((viewport.left() - rect.left()) / char_width)))
+        end = int((viewport.right() - rect.left()) / char_width) + 1
+        start -= start % self.sliceStep
+        end = max(start, min(length, end + self.sliceStep - end % self.sliceStep))
+        for span_start, span_end, *_ in self.row_spans(index):
+            if span_start < start < span_end:
+                start = span_start
+            if span_start < end < span_end:
+                end = span_end
+        return start, end
+
+    def text_rect(self, rect, line_slice: tuple[int, int] | None) -> QRectF:
+        """Where the row (or its slice) is drawn, when wrapping exactly chars_per_line() characters wide."""
+        char_width = QFontMetricsF(self.docText.defaultFont()).horizontalAdvance(' ')
+        view = self.parent
+        if view.is_wrapping():
+            chars = view.chars_per_line()
+            width = chars * char_width + char_width / 2
+            if line_slice is None:
+                return QRectF(rect.left(), rect.top(), width, rect.height())
+            start, end = line_slice
+            lines = max(1, -(-(end - start) // chars))
+            return QRectF(rect.left(), rect.top() + start // chars * view.line_height(), width,
+                          lines * view.line_height())
+        if line_slice is None:
+            return QRectF(rect)
+        start, end = line_slice
+        return QRectF(rect.left() + start * char_width, rect.top(), (end - start) * char_width, rect.height())
+
+    def has_links(self, index) -> bool:
+        return not self.is_filter and bool(index.data(LogTableModel.LinkSpansRole))
 
     def paint(self, painter, option, index):
         if not index.isValid():
             return super().paint(painter, option, index)
         painter.save()
-        fg, bg = "black", "white"
-        text = index.model().data(index)
-        if level := index.data(Qt.UserRole):
-            fg, bg = LogLevelColor(level).colors()
+        fg, bg = self.row_colors(index)
+        if index.data(Qt.UserRole):
             painter.fillRect(option.rect, QColor(bg))
-        text = self.wrap_log_file(text)
-        text = F"<pre style='color:{fg};'>{text}</pre>"
-        self.docText.setTextWidth(option.rect.width())
-        self.docText.setHtml(text)
-        painter.translate(option.rect.topLeft())
-        self.docText.drawContents(painter)
+        line_slice = self.visible_slice(index, option.rect)
+        rect = self.text_rect(option.rect, line_slice)
+        if self.needs_rich_text(index):
+            doc = self.render_document(index, int(rect.width()), fg, line_slice)
+            painter.translate(rect.topLeft())
+            doc.drawContents(painter)
+        else:
+            text = index.data(LogTableModel.RawTextRole)
+            if line_slice is not None:
+                text = text[line_slice[0]:line_slice[1]].replace('\t', ' ')
+            painter.setFont(self.docText.defaultFont())
+            painter.setPen(QColor(fg))
+            painter.drawText(rect, text, self.wrapOption if self.parent.is_wrapping() else self.textOption)
         painter.restore()
         if option.state & QStyle.State_Selected:
             painter.fillRect(option.rect, QColor(0, 100, 255, 50))
 
+    @staticmethod
+    def row_colors(index) -> tuple[str, str]:
+        if level := index.data(Qt.UserRole):
+            return LogLevelColor(level).colors()
+        return "black", "white"
+
+    def needs_rich_text(self, index) -> bool:
+        """Only rows with links, ANSI markup or search highlights need the HTML document."""
+        if index.model().htmlLines:
+            return True
+        if self.is_filter:
+            return bool(index.data(LogTableModel.HighlightRole))
+        return self.has_links(index)
+
+    def render_document(self, index, width: int, fg: str, line_slice: tuple[int, int] = None) -> QTextDocument:
+        model = index.model()
+        font = self.docText.defaultFont()
+        wrap = self.parent.is_wrapping()
+        # link statuses are not in the key, a changed status discards the rows of its path (link_status_changed)
+        key = (model.generation, index.row(), width, font.key(), line_slice, wrap)
+        doc = self.renderCache.get(key)
+        if doc is None:
+            started = time.perf_counter()
+            self.renderedPaths = []
+            style = F"color:{fg};white-space:pre-wrap;" if wrap else F"color:{fg};"
+            html = F"<pre style='{style}'>{self.row_html(index, line_slice)}</pre>"
+            doc = QTextDocument()
+            doc.setDocumentMargin(0)
+            doc.setDefaultFont(font)
+            if wrap:
+                doc.setDefaultTextOption(self.wrapOption)
+            doc.setTextWidth(width)
+            doc.setHtml(html)
+            self.renderCache.put(key, doc, self.renderCache.cost(html), tuple(set(self.renderedPaths)))
+            self.buildTime += time.perf_counter() - started
+        return doc
+
+    def anchor_at(self, index, option, pos) -> str:
+        """Returns the link anchor under the view position pos, or an empty string.
+
+        Uses the same cached document as paint (same row, width and font), so hovering and
+        clicking only cost a cache lookup, a document is only built for a row not painted yet.
+        """
+        if not self.has_links(index):
+            return ""
+        line_slice = self.visible_slice(index, option.rect)
+        rect = self.text_rect(option.rect, line_slice)
+        doc = self.render_document(index, int(rect.width()), self.row_colors(index)[0], line_slice)
+        return doc.documentLayout().anchorAt(QPointF(pos) - rect.topLeft())
+
+    def link_status_changed(self, path: str):
+        rows = self.renderCache.discard_path(path)
+        if not rows:
+            return
+        model = self.parent.model()
+        for row in rows:
+            if row < model.rowCount():
+                self.parent.update(model.index(row, 0))
+
     def set_link_callback(self, callback):
         self.linkCallback = callback
 
@@ -100,13 +248,7 @@ class LogLineDelegate(QStyledItemDelegate):
         if event.type() == QEvent.MouseButtonDblClick:
             return super().editorEvent(event, model, option, index)
         if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
-            text = index.model().data(index)
-            self.docText.setHtml(self.wrap_log_file(text))
-            # CRITICAL: Set text width to match what was painted, otherwise anchor detection fails!
-            self.docText.setTextWidth(option.rect.width())
-            pos = event.pos() - option.rect.topLeft()
-
-            anchor = self.docText.documentLayout().anchorAt(pos)
+            anchor = self.anchor_at(index, option, event.pos())
             if anchor:  # If the click is on a link
                 # Check if it's a URL (starts with URL:) or file path (starts with FILE:)
                 if anchor.startswith("URL:"):
@@ -136,21 +278,13 @@ class LogLineDelegate(QStyledItemDelegate):
                             tooltip_msg = f"✓ Already viewing: {file_name}"
                             # Show tooltip at cursor position for 2 seconds
                             QToolTip.showText(global_pos, tooltip_msg, self.parent)
-                    else:
-                        # noinspection PyUnresolvedReferences
-                        index.model().parent.load_file(file_path)
                 return False
         return super().editorEvent(event, model, option, index)
 
     def helpEvent(self, event, view, option, index):
         if not index.isValid() or not index.model() or not index.model().data(index):
             return super().helpEvent(event, view, option, index)
-        text = index.model().data(index)
-        self.docText.setHtml(self.wrap_log_file(text))
-        # CRITICAL: Set text width to match what was painted, otherwise anchor detection fails!
-        self.docText.setTextWidth(option.rect.width())
-        pos = event.pos() - option.rect.topLeft()
-        anchor = self.docText.documentLayout().anchorAt(pos)
+        anchor = self.anchor_at(index, option, event.pos())
         if anchor:
             option.widget.setCursor(Qt.PointingHandCursor)
         else:
@@ -0,0 +1,94 @@
+"""
+LogSearchIndex.py - Bulk Search Over Contiguous Log Buffers
+
+Main Functions:
+- LogSearchIndex: Keeps a lower-cased contiguous copy of the log text plus a line-offset array
+- extend(): Appends classified lines as a new searchable chunk
+- find_rows(): Runs one native str.find loop per chunk and maps match offsets to rows by binary search
+- level_rows(): Returns the rows whose level is in a set, without touching the line text
+- memory_bytes(): Size of the buffers, offsets and levels, for the MemoryBudget
+"""
+
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+
+from LogLevel import LogLevel
+
+
+class LogSearchIndex:
+    """
+    LogSearchIndex answers "which rows contain this text" with grep-like throughput.
+    Each chunk is (first row, lower-cased lines joined by newlines, start offset of every line).
+    The offset array has one extra entry so offsets[i + 1] is the start of the line after i.
+    """
+
+    denseCheck: int = 1024  # hits after which the match density is checked
+    denseRatio: int = 8  # more than one hit per denseRatio lines counts as dense
+    blockRows: int = 65536  # rows split at once by the dense scan
+
+    def __init__(self, log_data: list[tuple[LogLevel, str]] = None):
+        self.chunks: list[tuple[int, str, array]] = []
+        self.levels = bytearray()  # LogLevel value per row
+        self.rowCount: int = 0
+        if log_data:
+            self.extend(log_data)
+
+    def extend(self, log_data: list[tuple[LogLevel, str]]):
+        if not log_data:
+            return
+        lines = [line for _, line in log_data]
+        buffer = "\n".join(lines).lower()
+        lengths = map(len, lines)
+        if len(buffer) != sum(map(len, lines)) + len(lines) - 1:
+            # a few characters change length when lower-cased, measure the lowered lines instead
+            lengths = (len(line.lower()) for line in lines)
+        offsets = array('q', accumulate((length + 1 for length in lengths), initial=0))
+        self.chunks.append((self.rowCount, buffer, offsets))
+        self.levels.extend(level.value for level, _ in log_data)
+        self.rowCount += len(log_data)
+
+    def memory_bytes(self) -> int:
+        return len(self.levels) + sum(len(buffer) + offsets.itemsize * len(offsets) for _, buffer, offsets in self.chunks)
+
+    def find_rows(self, text: str, start_row: int = 0) -> array:
+        """
+        Returns the rows (from start_row on) containing the lower-cased text, each row once.
+        Sparse matches use one str.find loop, once matches turn out to be dense the rest of the
+        chunk is tested line by line in blocks, which is cheaper than one find per hit.
+        """
+        rows = array('l')
+        for first_row, buffer, offsets in self.chunks:
+            line_count = len(offsets) - 1
+            if first_row + line_count <= start_row:
+                continue
+            find, append = buffer.find, rows.append
+            scan_start = max(0, start_row - first_row)
+            pos, hits = offsets[scan_start], 0
+            while (pos := find(text, pos)) != -1:
+                row = bisect_right(offsets, pos) - 1
+                append(first_row + row)
+                pos = offsets[row + 1]  # skip the rest of the line, one hit per row
+                hits += 1
+                if hits == self.denseCheck and row - scan_start < hits * self.denseRatio:
+                    rows.extend(self._scan_lines(text, first_row, buffer, offsets, row + 1, line_count))
+                    break
+        return rows
+
+    def _scan_lines(self, text: str, first_row: int, buffer: str, offsets: array, start: int, end: int):
+        for block_start in range(start, end, self.blockRows):
+            block_end = min(end, block_start + self.blockRows)
+            lines = buffer[offsets[block_start]:offsets[block_end] - 1].split("\n")
+            yield from (first_row + block_start + i for i, line in enumerate(lines) if text in line)
+
+    def level_rows(self, levels: list[LogLevel], rows=None, start_row: int = 0) -> array:
+        """
+        Returns the rows whose level is one of levels, either out of rows or out of all rows from start_row.
+        """
+        wanted = {level.value for level in levels}
+        row_levels = self.levels
+        if rows is None:
+            return array('l', (row for row, value in enumerate(row_levels[start_row:], start_row) if value in wanted))
+        if len(wanted) == len(LogLevel):
+            return rows
+        return array('l', (row for row in rows if row_levels[row] in wanted))
@@ -4,22 +4,53 @@ LogTableModel.py - Log Data Table Model
 Main Functions:
 - LogTableModel: QAbstractTableModel that holds and displays log data with levels
 - update_data(): Updates the model with new log data (level, text) tuples
-- data(): Provides formatted data for display, including HTML escaping and tooltips
+- append_data(): Appends rows (e.g. lines written to the log since loading) without a reset
+- data(): Provides formatted data for display, including HTML escaping and tooltips,
+  the raw line text is available through RawTextRole for the delegate's plain-text path
 - raw_data(): Returns unformatted log line text for copying
+- search_index(): Lazily built LogSearchIndex used for bulk filtering
+- linkIndex: LinkIndex of the URLs and file paths per row, built in the background after load
+- widths / maxWidth: Display width of every row and of the widest one (in characters, tabs expanded),
+  kept up to date on load and append so the view sizes its column without measuring rows
+- memory_bytes(): Estimated memory of the lines and their indexes, for the MemoryBudget
 """
 
-from PyQt5.QtCore import QAbstractTableModel, Qt, QVariant
+import html
+import re
+from array import array
 
+from PyQt5.QtCore import QAbstractTableModel, Qt, QVariant, QModelIndex
+
+from LinkIndex import LinkIndex
 from LogLevel import LogLevel
 from LogLevelColor import LogLevelColor
+from LogSearchIndex import LogSearchIndex
 
 
 class LogTableModel(QAbstractTableModel):
+    RawTextRole = Qt.UserRole + 1  # the line as read, without HTML escaping
+    HighlightRole = Qt.UserRole + 2  # (start, end) spans of search matches in the raw line
+    LinkSpansRole = Qt.UserRole + 3  # (start, end, kind) spans of links in the raw line
+    WidthRole = Qt.UserRole + 4  # display width of the line in characters
+
+    tagPattern = re.compile(r'<[^>]*>')  # tags of HTML lines, not displayed
+    entityPattern = re.compile(r'&#?\w+;')  # entities of HTML lines, displayed as one character
+    tooltipChars: int = 2000  # longer lines are cut in the tooltip
+    rowBytes: int = 120  # estimated bytes per row besides its characters: str and tuple headers, list slot
+
     # noinspection PyUnresolvedReferences
-    def __init__(self, parent: 'LogViewer'):
+    def __init__(self, parent=None):
         self.parent = parent
         super().__init__()
         self.logData: list[tuple[LogLevel, str]] = []
+        self.htmlLines: bool = False  # lines are HTML already (ANSI colored logs converted by ansi2html)
+        self.searchIndex: LogSearchIndex | None = None
+        self.linkIndex = LinkIndex(self)
+        self.generation: int = 0  # bumped whenever existing rows change, appends keep it
+        self.widths = array('I')  # display width of every row, in characters
+        self.maxWidth: int = 0
+        self.dataCalls: int = 0  # data() calls, read per frame by the FrameProfiler
+        self.textChars: int = 0  # characters of all lines, for memory_bytes()
 
     def rowCount(self, parent=None):
         return len(self.logData)
@@ -28,12 +59,24 @@ class LogTableModel(QAbstractTableModel):
         return 1  # Assuming one column: Log Line
 
     def data(self, index, role=Qt.DisplayRole):
+        self.dataCalls += 1
         if not index.isValid():
             return QVariant()
         level, log_line = self.logData[index.row()]
-        log_line = log_line.replace('<', '&lt;').replace('>', '&gt;')
         if role == Qt.UserRole:
             return level
+        if role == self.RawTextRole:
+            return log_line
+        if role == self.HighlightRole:
+            return []
+        if role == self.LinkSpansRole:
+            return self.linkIndex.row_spans(index.row(), log_line)
+        if role == self.WidthRole:
+            return self.widths[index.row()]
+        if role == Qt.ToolTipRole and len(log_line) > self.tooltipChars:
+            log_line = log_line[:self.tooltipChars] + " ..."
+        if not self.htmlLines:
+            log_line = html.escape(log_line, quote=False)
         if role == Qt.DisplayRole:
             return log_line
         if role == Qt.ToolTipRole:
@@ -41,9 +84,29 @@ class LogTableModel(QAbstractTableModel):
             return F'<div style="color:{fg};">{log_line}</div>'
         return QVariant()
 
+    def memory_bytes(self) -> int:
+        """Estimated memory of the lines (ASCII str objects in (level, line) tuples), widths and indexes."""
+        rows = len(self.logData)
+        size = rows * self.rowBytes + self.textChars + self.widths.itemsize * len(self.widths)
+        size += self.linkIndex.memory_bytes()
+        return size + (self.searchIndex.memory_bytes() if self.searchIndex is not None else 0)
+
     def raw_data(self, row: int) -> str:
         return self.logData[row][1]
 
+    def search_index(self) -> LogSearchIndex:
+        # built on the first search only, plain viewing never pays for it
+        if self.searchIndex is None:
+            self.searchIndex = LogSearchIndex(self.logData)
+        return self.searchIndex
+
+    @classmethod
+    def line_widths(cls, lines, html_lines: bool = False) -> array:
+        """Display widths of the lines in characters, with tabs expanded to the next multiple of 8."""
+        if html_lines:
+            lines = (cls.entityPattern.sub(' ', cls.tagPattern.sub('', line)) for line in lines)
+        return array('I', map(len, map(str.expandtabs, lines)))
+
     def headerData(self, section, orientation, role=Qt.DisplayRole):
         if role != Qt.DisplayRole:
             return QVariant()
@@ -53,7 +116,29 @@ class LogTableModel(QAbstractTableModel):
             return section + 1
         return QVariant()
 
-    def update_data(self, new_data: list[tuple[LogLevel, str]]):
+    def update_data(self, new_data: list[tuple[LogLevel, str]], html_lines: bool = False):
         self.beginResetModel()
         self.logData = new_data
+        self.htmlLines = html_lines
+        self.searchIndex = None
+        self.linkIndex.reset(self.logData)
+        self.widths = self.line_widths((line for _, line in new_data), html_lines)
+        self.maxWidth = max(self.widths, default=0)
+        self.textChars = sum(len(line) for _, line in new_data)
+        self.generation += 1
         self.endResetModel()
+
+    def append_data(self, new_data: list[tuple[LogLevel, str]]):
+        if not new_data:
+            return
+        start = len(self.logData)
+        self.beginInsertRows(QModelIndex(), start, start + len(new_data) - 1)
+        self.logData.extend(new_data)
+        if self.searchIndex is not None:
+            self.searchIndex.extend(new_data)
+        self.linkIndex.extend()
+        new_widths = self.line_widths((line for _, line in new_data), self.htmlLines)
+        self.widths.extend(new_widths)
+        self.maxWidth = max(self.maxWidth, max(new_widths))
+        self.textChars += sum(len(line) for _, line in new_data)
+        self.endInsertRows()
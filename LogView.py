@@ -0,0 +1,428 @@
+"""
+LogView.py - Virtualized Log Line View
+
+Main Functions:
+- LogView: Single column item view replacing QTableView for the log and filter panes
+- LineNumberGutter: Paints the line numbers (the model's vertical header data) of the visible rows
+- row_at() / row_top(): Arithmetic mapping between viewport positions and rows, nothing is kept per row
+- set_wrapping(): Optional line wrap, wrapped row heights are measured lazily near the viewport and
+  summed in a FenwickTree, so mapping a scroll position to a row stays O(log n)
+- setSelection(): Selects whole row ranges, so selecting millions of rows is a single selection range
+- QTableView-compatible API: selectRow(), scrollTo(), columnWidth()/setColumnWidth(), rowHeight()
+"""
+
+from PyQt5.QtCore import Qt, QRect, QModelIndex, QItemSelection, QItemSelectionModel, QEvent, QTimer
+from PyQt5.QtGui import QPainter, QRegion, QColor, QFontMetricsF
+from PyQt5.QtWidgets import QAbstractItemView, QWidget, QStyleOptionViewItem, QStyle
+
+from common.FenwickTree import FenwickTree
+from LogTableModel import LogTableModel
+
+
+class LineNumberGutter(QWidget):
+    def __init__(self, view: 'LogView'):
+        super().__init__(view)
+        self.view: 'LogView' = view
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        self.view.paint_gutter(painter, event.rect())
+
+    def mousePressEvent(self, event):
+        row = self.view.row_at(event.pos().y())
+        if 0 <= row < self.view.row_count():
+            self.view.selectRow(row)
+
+    def wheelEvent(self, event):
+        self.view.wheelEvent(event)
+
+
+class LogView(QAbstractItemView):
+    """
+    LogView shows one row per log line, like a QTableView with a single column, hidden
+    horizontal header and a line number vertical header. Unlike QTableView/QHeaderView it
+    keeps no per-row sections: the visible rows follow from the scroll position and the row
+    height, so tens of millions of rows cost nothing until painted.
+
+    Without wrapping all rows have the same height and the vertical scroll bar counts rows.
+    With wrapping (characters of the monospaced font wrap at the viewport width) the scroll
+    bar counts pixels. A row's height follows from its display width (LogTableModel.WidthRole),
+    it is measured when the row comes near the viewport; rows not measured yet count as one line.
+    """
+
+    gutterColor = QColor("#DDDDDD")
+    gutterPadding: int = 6  # pixels around the line numbers
+    maxColumnWidth: int = 1 << 30  # pixels, keeps scroll bar values far from int overflow
+    rewrapDelay: int = 50  # ms, while the width keeps changing (dragging the window edge) rows aren't re-measured
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.textWidth: int = 0  # width of the text column, rows are painted at least viewport wide
+        self.heights: FenwickTree | None = None  # row heights while wrapping
+        self.frameProfiler = None  # FrameProfiler recording the painted frames, if diagnostics are on
+        self.measured = bytearray()  # measureStamp for the rows whose wrapped height is measured
+        self.measureStamp: int = 1  # bumped to forget all measured heights at once
+        self.wrapWidth: int = 0  # viewport width the heights were measured for
+        self.rewrapTimer = QTimer(self)
+        self.rewrapTimer.setSingleShot(True)
+        self.rewrapTimer.setInterval(self.rewrapDelay)
+        self.rewrapTimer.timeout.connect(self.width_changed)
+        self.anchoring: bool = False  # scroll position being corrected after measuring rows above
+        self.gutter = LineNumberGutter(self)
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.horizontalScrollBar().setSingleStep(20)
+
+    # geometry
+
+    def row_count(self) -> int:
+        return self.model().rowCount() if self.model() else 0
+
+    def rowHeight(self, row: int = None) -> int:
+        """Height of one line, or of the given row (several lines when wrapped)."""
+        if row is not None and self.heights is not None:
+            return self.heights.value(row)
+        return max(12, self.fontMetrics().height() + 4)
+
+    def line_height(self) -> int:
+        """Height of every further line of a wrapped row."""
+        return self.fontMetrics().lineSpacing()
+
+    def chars_per_line(self) -> int:
+        return max(1, int(self.viewport().width() / QFontMetricsF(self.font()).horizontalAdvance(' ')))
+
+    def columnWidth(self, column: int = 0) -> int:
+        return self.textWidth
+
+    def setColumnWidth(self, column: int, width: int):
+        self.textWidth = min(width, self.maxColumnWidth)
+        self.updateGeometries()
+        self.viewport().update()
+
+    def is_wrapping(self) -> bool:
+        return self.heights is not None
+
+    def scroll_y(self) -> int:
+        """Content y at the top of the viewport."""
+        value = self.verticalScrollBar().value()
+        return value if self.heights is not None else value * self.rowHeight()
+
+    def set_scroll_y(self, y: int):
+        self.verticalScrollBar().setValue(y if self.heights is not None else -(-y // self.rowHeight()))
+
+    def row_y(self, row: int) -> int:
+        """Content y of the top of the row."""
+        return self.heights.prefix_sum(row) if self.heights is not None else row * self.rowHeight()
+
+    def content_row(self, y: int) -> int:
+        if self.heights is None:
+            return y // self.rowHeight()
+        return self.heights.find(y) if y >= 0 else -1
+
+    def visible_rows(self) -> int:
+        """Rows (fully) inside the viewport."""
+        if self.heights is not None:
+            return max(1, self.row_at(self.viewport().height()) - self.top_row())
+        return max(1, self.viewport().height() // self.rowHeight())
+
+    def top_row(self) -> int:
+        return self.content_row(self.scroll_y())
+
+    def row_at(self, y: int) -> int:
+        """Row at the viewport y coordinate (may be outside the model for positions outside the rows)."""
+        return self.content_row(self.scroll_y() + y)
+
+    def row_top(self, row: int) -> int:
+        return self.row_y(row) - self.scroll_y()
+
+    def updateGeometries(self):
+        digits = len(str(self.model().headerData(self.row_count() - 1, Qt.Vertical))) if self.row_count() else 1
+        gutter_width = self.fontMetrics().horizontalAdvance("9" * max(digits, 2)) + 2 * self.gutterPadding
+        self.setViewportMargins(gutter_width, 0, 0, 0)
+        rect = self.viewport().geometry()
+        self.gutter.setGeometry(rect.left() - gutter_width, rect.top(), gutter_width, rect.height())
+        self.update_scroll_ranges()
+        super().updateGeometries()
+
+    def update_scroll_ranges(self):
+        vertical, height = self.verticalScrollBar(), self.viewport().height()
+        if self.heights is not None:
+            vertical.setRange(0, max(0, self.heights.total() - height))
+            vertical.setPageStep(height)
+            vertical.setSingleStep(self.rowHeight())
+        else:
+            vertical.setRange(0, max(0, self.row_count() - self.visible_rows()))
+            vertical.setPageStep(self.visible_rows())
+            vertical.setSingleStep(1)
+        horizontal = self.horizontalScrollBar()
+        horizontal.setRange(0, 0 if self.heights is not None else max(0, self.textWidth - self.viewport().width()))
+        horizontal.setPageStep(self.viewport().width())
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.heights is not None and self.viewport().width() != self.wrapWidth:
+            self.rewrapTimer.start()
+        self.updateGeometries()
+
+    def width_changed(self):
+        if self.heights is not None and self.viewport().width() != self.wrapWidth:
+            self.invalidate_heights()
+            self.viewport().update()
+            self.gutter.update()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.FontChange:
+            self.invalidate_heights()
+            self.updateGeometries()
+
+    # line wrap
+
+    def set_wrapping(self, wrap: bool):
+        if wrap == self.is_wrapping():
+            return
+        row = self.top_row()
+        self.heights = FenwickTree(0, self.rowHeight()) if wrap else None
+        self.measured = bytearray()
+        self.invalidate_heights(row)
+        self.viewport().update()
+        self.gutter.update()
+
+    def invalidate_heights(self, top_row: int = None):
+        """
+        Forgets the measured heights (width, font or rows changed), keeping the top row in view.
+        Nothing is allocated per row: only the heights measured as wrapped are reset, and the
+        measured flags are forgotten by a new stamp (cleared once every 255 invalidations).
+        """
+        top_row = self.top_row() if top_row is None else top_row
+        self.rewrapTimer.stop()
+        if self.heights is not None:
+            self.heights.reset(self.rowHeight())
+            self.heights.resize(self.row_count())
+            self.resize_measured()
+            if self.measureStamp == 255:
+                self.measured[:] = bytes(len(self.measured))
+                self.measureStamp = 0
+            self.measureStamp += 1
+            self.wrapWidth = self.viewport().width()
+        self.update_scroll_ranges()
+        self.set_scroll_y(self.row_y(max(0, min(top_row, self.row_count() - 1))))
+
+    def resize_measured(self):
+        rows = self.row_count()
+        if len(self.measured) < rows:
+            self.measured.extend(bytes(rows - len(self.measured)))  # bytearray over-allocates, appends are amortized
+        else:
+            del self.measured[rows:]
+
+    def measure_rows(self, first: int, last: int) -> bool:
+        """Measures the wrapped height of the rows [first, last) not measured yet, True if any changed."""
+        model, measured, stamp = self.model(), self.measured, self.measureStamp
+        chars, base, line_height = self.chars_per_line(), self.rowHeight(), self.line_height()
+        changed = False
+        for row in range(max(0, first), min(last, len(measured))):
+            if measured[row] == stamp:
+                continue
+            measured[row] = stamp
+            lines = -(-model.index(row, 0).data(LogTableModel.WidthRole) // chars)
+            if lines > 1:
+                self.heights.set(row, base + (lines - 1) * line_height)
+                changed = True
+        return changed
+
+    def measure_visible(self):
+        """Measures the rows from the top of the viewport down, the top row stays in place."""
+        row, y, height, changed = self.top_row(), self.row_top(self.top_row()), self.viewport().height(), False
+        while 0 <= row < self.row_count() and y < height:
+            changed |= self.measure_rows(row, row + 1)
+            y += self.rowHeight(row)
+            row += 1
+        if changed:
+            self.update_scroll_ranges()
+
+    def measure_above(self):
+        """Measures a viewport of rows above the top one and corrects the scroll position for them."""
+        top = self.top_row()
+        offset = self.scroll_y() - self.row_y(top)
+        if self.measure_rows(top - self.viewport().height() // self.rowHeight() - 1, top):
+            self.update_scroll_ranges()
+            self.anchoring = True
+            try:
+                self.set_scroll_y(self.row_y(top) + offset)
+            finally:
+                self.anchoring = False
+
+    # QAbstractItemView interface
+
+    def visualRect(self, index: QModelIndex) -> QRect:
+        if not index.isValid():
+            return QRect()
+        return QRect(-self.horizontalOffset(), self.row_top(index.row()),
+                     max(self.textWidth, self.viewport().width()), self.rowHeight(index.row()))
+
+    def indexAt(self, pos) -> QModelIndex:
+        row = self.row_at(pos.y())
+        if pos.y() < 0 or not 0 <= row < self.row_count():
+            return QModelIndex()
+        return self.model().index(row, 0)
+
+    def scrollTo(self, index: QModelIndex, hint=QAbstractItemView.EnsureVisible):
+        if not index.isValid():
+            return
+        row = index.row()
+        if self.heights is not None:
+            self.measure_rows(row, row + 1)
+            self.update_scroll_ranges()
+        top, height, view_height, y = self.row_y(row), self.rowHeight(row), self.viewport().height(), self.scroll_y()
+        if hint == QAbstractItemView.PositionAtTop:
+            y = top
+        elif hint == QAbstractItemView.PositionAtBottom:
+            y = top + height - view_height
+        elif hint == QAbstractItemView.PositionAtCenter:
+            y = top - (view_height - height) // 2
+        elif top < y:
+            y = top
+        elif top + height > y + view_height:
+            y = top + height - view_height
+        self.set_scroll_y(max(0, y))
+
+    def moveCursor(self, action, modifiers) -> QModelIndex:
+        current = self.currentIndex()
+        row = current.row() if current.isValid() else self.top_row()
+        rows = {
+            QAbstractItemView.MoveUp: row - 1,
+            QAbstractItemView.MoveDown: row + 1,
+            QAbstractItemView.MovePageUp: row - self.visible_rows(),
+            QAbstractItemView.MovePageDown: row + self.visible_rows(),
+            QAbstractItemView.MoveHome: 0,
+            QAbstractItemView.MoveEnd: self.row_count() - 1,
+        }
+        if not self.row_count():
+            return QModelIndex()
+        return self.model().index(max(0, min(rows.get(action, row), self.row_count() - 1)), 0)
+
+    def horizontalOffset(self) -> int:
+        return self.horizontalScrollBar().value()
+
+    def verticalOffset(self) -> int:
+        return self.scroll_y()
+
+    def isIndexHidden(self, index) -> bool:
+        return False
+
+    def setSelection(self, rect, command):
+        if not self.row_count():
+            return
+        rect = rect.normalized()
+        first = max(0, min(self.row_at(rect.top()), self.row_count() - 1))
+        last = max(0, min(self.row_at(rect.bottom()), self.row_count() - 1))
+        self.selectionModel().select(
+            QItemSelection(self.model().index(first, 0), self.model().index(last, 0)), command)
+
+    def visualRegionForSelection(self, selection) -> QRegion:
+        region = QRegion()
+        first, last = self.top_row(), self.row_at(self.viewport().height())
+        width = max(self.textWidth, self.viewport().width())
+        for selected in selection:
+            top, bottom = max(selected.top(), first), min(selected.bottom(), last)
+            if top <= bottom:
+                y = self.row_top(top)
+                region = region.united(QRect(0, y, width, self.row_top(bottom) + self.rowHeight(bottom) - y))
+        return region
+
+    def keyboardSearch(self, search: str):
+        pass  # matching typed text row by row doesn't scale, the search box does it
+
+    # QTableView compatible helpers
+
+    def selectRow(self, row: int):
+        if 0 <= row < self.row_count():
+            self.selectionModel().setCurrentIndex(
+                self.model().index(row, 0), QItemSelectionModel.ClearAndSelect | QItemSelectionModel.Rows)
+
+    def selected_row_count(self) -> int:
+        return sum(selected.height() for selected in self.selectionModel().selection())
+
+    def selected_ranges(self) -> list[tuple[int, int]]:
+        """(top, bottom) rows of every selected range."""
+        return [(selected.top(), selected.bottom()) for selected in self.selectionModel().selection()]
+
+    def select_ranges(self, ranges: list[tuple[int, int]]):
+        selection, model = QItemSelection(), self.model()
+        for top, bottom in ranges:
+            if bottom < self.row_count():
+                selection.select(model.index(top, 0), model.index(bottom, 0))
+        self.selectionModel().select(selection, QItemSelectionModel.ClearAndSelect | QItemSelectionModel.Rows)
+
+    # notifications
+
+    def reset(self):
+        super().reset()
+        self.invalidate_heights()
+        self.updateGeometries()
+        self.gutter.update()
+
+    def rowsInserted(self, parent, start, end):
+        super().rowsInserted(parent, start, end)
+        if self.heights is not None:
+            self.heights.resize(self.row_count())  # amortized, appended rows don't copy the tree
+            self.resize_measured()
+        self.updateGeometries()
+        self.gutter.update()
+
+    def selectionChanged(self, selected, deselected):
+        super().selectionChanged(selected, deselected)
+        self.gutter.update()
+
+    def scrollContentsBy(self, dx: int, dy: int):
+        if self.heights is not None:
+            if not self.anchoring:
+                self.measure_above()
+            self.viewport().update()
+            self.gutter.update()
+            return
+        self.viewport().scroll(dx, dy * self.rowHeight())
+        if dy:
+            self.gutter.scroll(0, dy * self.rowHeight())
+
+    # painting
+
+    def paintEvent(self, event):
+        if not self.row_count():
+            return
+        profiler = self.frameProfiler
+        token = profiler.begin(self) if profiler is not None else None
+        if self.heights is not None:
+            self.measure_visible()
+        painter = QPainter(self.viewport())
+        option = QStyleOptionViewItem(self.viewOptions())
+        option.widget = self
+        selection = self.selectionModel()
+        delegate = self.itemDelegate()
+        rect = event.rect()
+        first, last = max(0, self.row_at(rect.top())), min(self.row_count() - 1, self.row_at(rect.bottom()))
+        for row in range(first, last + 1):
+            index = self.model().index(row, 0)
+            row_option = QStyleOptionViewItem(option)
+            row_option.rect = self.visualRect(index)
+            if selection.isRowSelected(row, QModelIndex()):
+                row_option.state |= QStyle.State_Selected
+            delegate.paint(painter, row_option, index)
+        if profiler is not None:
+            painter.end()
+            profiler.end(self, token, max(0, last - first + 1), first)
+
+    def paint_gutter(self, painter: QPainter, rect: QRect):
+        painter.fillRect(rect, self.gutterColor)
+        if not self.row_count():
+            return
+        model, selection = self.model(), self.selectionModel()
+        width, height = self.gutter.width() - self.gutterPadding, self.rowHeight()
+        font = self.font()
+        bold = self.font()
+        bold.setBold(True)
+        last = min(self.row_count() - 1, self.row_at(rect.bottom()))
+        for row in range(max(0, self.row_at(rect.top())), last + 1):
+            painter.setFont(bold if selection.isRowSelected(row, QModelIndex()) else font)
+            painter.drawText(QRect(0, self.row_top(row), width, height), Qt.AlignRight | Qt.AlignVCenter,
+                             str(model.headerData(row, Qt.Vertical)))
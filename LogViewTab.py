@@ -1,46 +1,131 @@
 #!/home/utils/Python/builds/3.11.9-20250715/bin/python3
+if __name__ == '__main__':
+    # started directly: run the TabLog.py entry point instead, the worker processes re-import the main
+    # script and must not import the GUI
+    import os
+    import sys
+    os.execv(sys.executable, [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "TabLog.py")]
+             + sys.argv[1:])
+
+import json
 import os
 import os.path
 from functools import partial
 
 from PyQt5 import QtWidgets, QtGui
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QSettings, QTimer, pyqtSignal
 from PyQt5.QtWidgets import QAction, QShortcut
 
+from DocumentSidebar import DocumentSidebar
+from DocumentStore import DocumentStore
+from LinkPrefetcher import LinkPrefetcher
+from LogFileReader import LogFileReader
+from LogView import LogView
 from LogViewer import LogViewer
+from MemoryBudget import MemoryBudget
+from SingleInstance import SingleInstance
+from common.StartupProfile import StartupProfile
 from common.TabBar import TabBar
 
+StartupProfile.mark("imports")
+
 """
 LogViewTab.py - Tabbed Log Viewer Application
 
 Main Functions:
 - LogViewTab: A QTabWidget subclass that manages multiple log viewer tabs
-- add_log(): Adds new log files as tabs, reusing existing tabs for the same file
+- add_log(): Adds new log files as tabs, reusing existing tabs for the same file; deferred tabs
+  are placeholders loaded when first shown
+- open_files(): Bulk open (command line, multi-select, drag and drop), tabs are placeholders at once and
+  the files are read and classified concurrently by a bounded process pool
+- schedule_loads(): Submits deferred tabs to the pool, the current tab first, then the nearest and smallest
+  ones as long as they fit the MemoryBudget; poll_loads() hands finished results to their tabs
+- restore_session() / save_session(): Reopens the tabs of the last session with their filters, scroll positions
+  and selections, and saves it periodically and on exit
+- update_memory_label(): Status indicator of the total memory of the open logs, per tab in its tooltip
+- close_tab(): Closes a tab and deletes its viewer, so the memory of its log is freed
 - rename_tab(): Renames log viewer tabs and updates their tooltips
-- Standalone application: When run directly, creates a GUI window with file menu
-  and keyboard shortcuts (Ctrl+O to open, Ctrl+W to close tabs, Ctrl+R/F5 to reload)
+- tabsChanged / tabChanged: Signals of added, closed or renamed tabs and of a tab's color (flash_tab()),
+  followed by the DocumentSidebar
+- main(): The application, started by TabLog.py (also when LogViewTab.py is run directly): creates a GUI
+  window with file menu and keyboard shortcuts (Ctrl+O to open, Ctrl+W to close tabs, Ctrl+R/F5 to reload)
 """
 
 
 class LogViewTab(QtWidgets.QTabWidget):
+    prefetchMaxBytes: int = 64 * 1024 * 1024  # larger deferred files are only loaded when their tab is shown
+    loadWorkers: int = min(4, os.cpu_count() or 1)  # files classified at once in the background
+    pollInterval: int = 50  # ms
+    sessionInterval: int = 60 * 1000  # ms, the session is also saved periodically, in case TabLog gets killed
+    flashInterval: int = 100  # ms between the color toggles of flash_tab()
+
+    tabsChanged = pyqtSignal()  # tabs added, closed or renamed
+    tabChanged = pyqtSignal(object)  # the LogViewer whose tab changed color
+
     def __init__(self, parent):
         self.parent = parent
         super(LogViewTab, self).__init__(parent)
         self.setTabBar(TabBar(self))
         self.setTabsClosable(True)
-        self.tabCloseRequested.connect(lambda index: self.removeTab(index))
+        self.tabCloseRequested.connect(self.close_tab)
         self.setContentsMargins(0, 0, 0, 0)
+        self.setAcceptDrops(True)
+        self.pool: 'ProcessPoolExecutor | None' = None  # concurrent.futures is imported with the first bulk open
+        self.poolFailed: bool = False  # the workers can't be started, tabs load in this process when shown
+        self.loading: dict['Future', LogViewer] = {}  # submitted loads
+        self.pollTimer = QTimer(self)
+        self.pollTimer.setInterval(self.pollInterval)
+        self.pollTimer.timeout.connect(self.poll_loads)
+        self.currentChanged.connect(lambda index: self.schedule_loads())
+        self.budget = MemoryBudget.instance()
+        self.store = DocumentStore.instance()
+        self.memoryLabel = QtWidgets.QLabel()
+        self.memoryLabel.setContentsMargins(6, 0, 6, 0)
+        self.setCornerWidget(self.memoryLabel, Qt.TopRightCorner)
+        self.budget.usageChanged.connect(self.update_memory_label)
+        self.currentChanged.connect(self.update_memory_label)
+        self.sessionTimer = QTimer(self)
+        self.sessionTimer.setInterval(self.sessionInterval)
+        self.sessionTimer.timeout.connect(self.save_session)
         self.init_shortcuts()
 
     def init_shortcuts(self):
         shortcut_ctrl_w = QtWidgets.QShortcut("Ctrl+W", self)
-        shortcut_ctrl_w.activated.connect(lambda: self.removeTab(self.currentIndex()))
+        shortcut_ctrl_w.activated.connect(lambda: self.close_tab(self.currentIndex()))
+
+    def tabInserted(self, index: int):
+        super().tabInserted(index)
+        self.tabsChanged.emit()
+
+    def tabRemoved(self, index: int):
+        super().tabRemoved(index)
+        self.tabsChanged.emit()
+
+    def close_tab(self, index: int):
+        """removeTab() alone keeps the viewer, its models and its application wide shortcuts alive."""
+        log_viewer = self.widget(index)
+        if log_viewer is None:
+            return
+        self.removeTab(index)
+        log_viewer.dispose()
+        log_viewer.deleteLater()
+
+    def title_tabs(self) -> dict[str, list[LogViewer]]:
+        """The tabs of each title, in tab order."""
+        titles = {}
+        for log_viewer in map(self.widget, range(self.count())):
+            titles.setdefault(log_viewer.title, []).append(log_viewer)
+        return titles
 
-    def add_log(self, title: str, name: str, file: str):
+    def add_log(self, title: str, name: str, file: str, deferred: bool = False,
+                titles: dict[str, list[LogViewer]] | None = None):
         """Add a log file to the tab view, or switch to it if already open.
         
         When opening via link click, generate unique title from file path
         to ensure each file gets a distinct color.
+        A deferred tab is not made current, its file is loaded in the background by the process pool,
+        once the caller runs schedule_loads(). Bulk callers pass the title_tabs() they keep up to date,
+        rather than having every tab scanned per file.
         
         Returns:
             bool: True if the tab already existed, False if newly created
@@ -61,17 +146,17 @@ class LogViewTab(QtWidgets.QTabWidget):
             if not title or title == os.path.basename(file):
                 title = unique_title
         
-        tabs = [(t, self.widget(t)) for t in range(self.count())
-                if self.widget(t).title == title]
-        insert_index = tabs[-1][0] + 1 if tabs else self.count()
-        tabs = [(t, w) for t, w in tabs if w.logFile == file]
+        same_title = (titles if titles is not None else self.title_tabs()).setdefault(title, [])
+        insert_index = self.indexOf(same_title[-1]) + 1 if same_title else self.count()
+        tabs = [w for w in same_title if w.logFile == file]
         if tabs:
             # Tab already exists
-            index, log_viewer = tabs[0]
+            log_viewer = tabs[0]
+            index = self.indexOf(log_viewer)
             was_existing = True
         else:
             # Create new tab
-            log_viewer = LogViewer(title, name, file, self)
+            log_viewer = LogViewer(title, name, file, self, deferred)
             log_viewer.set_link_callback(partial(self.add_log, title, name))
             
             # Get display name (elide if too long)
@@ -80,9 +165,12 @@ class LogViewTab(QtWidgets.QTabWidget):
                 display_name = display_name[:27] + "..."
             
             index = self.insertTab(insert_index, log_viewer, display_name)
+            same_title.append(log_viewer)
             # Set tooltip to show full path on hover
             self.setTabToolTip(index, F"<h4>{title}</h4><h5>{log_viewer.name}</h5><h5>{file}</h5>")
             was_existing = False
+            if deferred:
+                return was_existing
         
         # Switch to the tab (existing or new)
         self.setCurrentWidget(log_viewer)
@@ -93,25 +181,195 @@ class LogViewTab(QtWidgets.QTabWidget):
         
         return was_existing
 
+    def open_at_line(self, file: str, row: int):
+        """Open the file (or switch to its tab) and position it at the 0-based row."""
+        self.add_log(os.path.basename(file), "", file)
+        log_viewer = self.currentWidget()
+        log_viewer.loadPending = False  # needed now, a pending worker result is ignored
+        log_viewer.ensure_loaded()
+        log_viewer.goto_line(row)
+
+    def open_files(self, files: list[str]):
+        """
+        Opens many files at once, the last one is shown (and loaded) first. The tabs are inserted
+        with updates disabled and the loads scheduled once, when all of them are there.
+        """
+        titles = self.title_tabs()
+        self.setUpdatesEnabled(False)
+        try:
+            for file in files:
+                self.add_log(os.path.basename(file), "", file, deferred=True, titles=titles)
+        finally:
+            self.setUpdatesEnabled(True)
+        shown = [t for t in range(self.count()) if files and self.widget(t).logFile == files[-1]]
+        if shown:
+            self.setCurrentIndex(shown[-1])
+        self.schedule_loads()
+
+    def session(self) -> dict:
+        tabs = [{"file": log_viewer.logFile, "title": log_viewer.title, "name": log_viewer.name,
+                 **log_viewer.session_state()} for log_viewer in map(self.widget, range(self.count()))]
+        return {"tabs": tabs, "current": self.currentIndex()}
+
+    def save_session(self):
+        QSettings("Avice", "TabLog").setValue("session", json.dumps(self.session()))
+
+    def restore_session(self):
+        """
+        Reopens the tabs of the saved session as placeholders, each gets its filter, scroll positions and
+        selections back when loaded (the IndexCache spares classifying unchanged files). From then on
+        the session is saved periodically and when the application quits.
+        """
+        try:
+            session = json.loads(QSettings("Avice", "TabLog").value("session", "", type=str) or "{}")
+            tabs, current = list(session.get("tabs", [])), int(session.get("current", -1))
+        except (ValueError, TypeError, AttributeError) as e:
+            print(F"-WARNING- can't restore the saved session: {e}")
+            tabs, current = [], -1
+        titles = self.title_tabs()
+        for tab in tabs:
+            # a malformed entry only loses its own tab
+            try:
+                if not os.path.isfile(tab["file"]):
+                    continue
+                self.add_log(tab["title"], tab["name"], tab["file"], deferred=True, titles=titles)
+                log_viewer = next(log_viewer for log_viewer in titles[tab["title"]] if log_viewer.logFile == tab["file"])
+                if not log_viewer.isLoaded:
+                    log_viewer.sessionState = {key: tab[key] for key in ["levels", "search", "view"] if key in tab}
+            except (ValueError, KeyError, TypeError, AttributeError, StopIteration) as e:
+                print(F"-WARNING- can't restore a tab of the saved session: {tab!r:.200} ({e!r})")
+        if 0 <= current < self.count():
+            self.setCurrentIndex(current)
+        self.schedule_loads()
+        QtWidgets.QApplication.instance().aboutToQuit.connect(self.save_session)
+        self.sessionTimer.start()
+
+    def schedule_loads(self):
+        """Keeps loadWorkers deferred tabs loading, the current tab always gets a worker at once."""
+        current = self.currentWidget()
+        if self.poolFailed:
+            if current:
+                QTimer.singleShot(0, current.ensure_loaded)
+            return
+        try:
+            # a file already loaded by another tab is shared when shown, nothing to read
+            if current and not current.isLoaded and not current.loadPending and not self.store.find(current.fileKey):
+                self.submit_load(current)
+            pending_bytes = sum(log_viewer.fileSize for log_viewer in self.loading.values())
+            while len(self.loading) < self.loadWorkers:
+                log_viewer = self.next_prefetch(pending_bytes)
+                if log_viewer is None:
+                    break
+                pending_bytes += log_viewer.fileSize
+                self.submit_load(log_viewer)
+        except (OSError, RuntimeError) as e:  # including BrokenProcessPool
+            print(F"-ERROR- background loading failed, loading tabs when shown: {e}")
+            self.poolFailed = True
+            self.stop_loads()
+            if current:
+                QTimer.singleShot(0, current.ensure_loaded)
+
+    def next_prefetch(self, pending_bytes: int) -> LogViewer | None:
+        """The deferred tab nearest to the current one (smallest first) that fits the memory budget."""
+        current = max(0, self.currentIndex())
+        candidates = []
+        loading = {log_viewer.fileKey for log_viewer in self.loading.values()}
+        for index in range(self.count()):
+            log_viewer = self.widget(index)
+            if log_viewer.isLoaded or log_viewer.loadPending or self.store.find(log_viewer.fileKey):
+                continue
+            if log_viewer.fileKey in loading - {None}:
+                continue
+            size = log_viewer.fileSize  # 0 if not found, loads instantly as a "File not found" row
+            if size <= self.prefetchMaxBytes and self.budget.has_room(size + pending_bytes):
+                candidates.append((abs(index - current), size, index))
+        return self.widget(min(candidates)[2]) if candidates else None
+
+    def submit_load(self, log_viewer: LogViewer):
+        if self.pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # spawn keeps the workers free of the Qt state of this process, one spare worker for the current tab
+            self.pool = ProcessPoolExecutor(max_workers=self.loadWorkers + 1,
+                                            mp_context=multiprocessing.get_context("spawn"))
+        self.loading[self.pool.submit(LogFileReader.classify_file, log_viewer.logFile)] = log_viewer
+        log_viewer.loadPending = True
+        self.pollTimer.start()
+
+    def poll_loads(self):
+        """Hands one finished result to its tab per poll (the current tab's first), so the GUI stays responsive."""
+        done = [future for future, log_viewer in self.loading.items() if future.done()]
+        if done:
+            current = self.currentWidget()
+            future = next((f for f in done if self.loading[f] is current), done[0])
+            log_viewer = self.loading.pop(future)
+            log_viewer.loadPending = False
+            if not log_viewer.isDisposed:
+                try:
+                    result = future.result()
+                except Exception:  # the pool broke, load in this process instead
+                    result = None
+                log_viewer.ensure_loaded(result)
+        self.schedule_loads()
+        if not self.loading:
+            self.stop_loads()
+
+    def stop_loads(self):
+        self.pollTimer.stop()
+        for future, log_viewer in self.loading.items():
+            future.cancel()
+            log_viewer.loadPending = False
+        self.loading = {}
+        if self.pool:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+    def dragEnterEvent(self, event):
+        if event.mimeData().hasUrls():
+            event.acceptProposedAction()
+
+    def dropEvent(self, event):
+        files = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
+        files = [file for file in files if os.path.isfile(file)]
+        if files:
+            self.open_files(files)
+            event.acceptProposedAction()
+
+    def update_memory_label(self):
+        def note(viewer: LogViewer) -> str:
+            shared = len(viewer.document.viewers)
+            return " ".join(text for text in ["evicted" if viewer.evictedView is not None else "",
+                                              F"shared by {shared} tabs" if shared > 1 else ""] if text)
+
+        usage = self.budget.usage()
+        self.memoryLabel.setText(self.budget.summary())
+        rows = "".join(
+            F"<tr><td>{viewer.name}</td><td align=right>{size / 1024 ** 2:,.1f} MB</td><td>{note(viewer)}</td></tr>"
+            for viewer, size in usage if viewer.isLoaded)
+        self.memoryLabel.setToolTip(F"<b>Estimated memory per tab</b>, least recently shown tabs are evicted "
+                                    F"beyond the budget<table>{rows}</table>")
+
     def flash_tab(self, index: int):
         """Flash the tab at the given index to provide visual feedback.
         
         Briefly changes the tab background to orange to indicate it's already open.
-        Works with custom TabBar paintEvent by temporarily changing widget background.
+        Works with custom TabBar paintEvent by temporarily changing widget background,
+        only the flashing tab is repainted (and its row of the DocumentSidebar).
         """
-        from PyQt5.QtCore import QTimer
-        
         # Get the LogViewer widget at this tab
         log_viewer = self.widget(index)
-        if not log_viewer:
+        if not log_viewer or log_viewer.flashing:
             return
         
         # Store original background color
         original_bg = log_viewer.get_background()
         flash_count = [0]  # Use list to allow modification in nested function
         orange_bg = "#FF8C00"  # Orange color for flash
+        log_viewer.flashing = True
         
         def toggle_flash():
+            if log_viewer.isDisposed:
+                return  # closed meanwhile, its widget is deleted (a Python attribute is still safe to read)
             if flash_count[0] < 4:  # 4 toggles = 2 complete flashes
                 if flash_count[0] % 2 == 0:
                     # Flash ON - set orange background
@@ -121,15 +379,15 @@ class LogViewTab(QtWidgets.QTabWidget):
                     log_viewer.background = original_bg
                 flash_count[0] += 1
                 
-                # Force tab bar to repaint
-                self.tabBar().update()
-                
                 # Schedule next toggle
-                QTimer.singleShot(100, toggle_flash)  # Next toggle in 100ms
+                QTimer.singleShot(self.flashInterval, toggle_flash)
             else:
                 # Ensure we end with original color
                 log_viewer.background = original_bg
-                self.tabBar().update()
+                log_viewer.flashing = False
+            # Repaint the tab, wherever it is now (it may have moved meanwhile)
+            self.tabBar().update_tab(self.indexOf(log_viewer))
+            self.tabChanged.emit(log_viewer)
         
         # Start the flash animation
         toggle_flash()
@@ -144,9 +402,12 @@ class LogViewTab(QtWidgets.QTabWidget):
             self.setTabToolTip(
                 index, F"<h4>{new_title}</h4><h5>{log_viewer.name}</h5><h5>{log_viewer.logFile}</h5>")
             self.setTabText(index, log_viewer.name)  # Force color update on the tab bar
+        if viewers:
+            self.tabsChanged.emit()  # regrouped in the DocumentSidebar
 
 
-if __name__ == '__main__':
+def main() -> int:
+    """The TabLog application, started by TabLog.py."""
     import sys
     import argparse
     from PyQt5.QtGui import QIcon, QKeySequence
@@ -157,9 +418,20 @@ if __name__ == '__main__':
 
     parser = argparse.ArgumentParser(description='Tablog log viewer')
     parser.add_argument('log_files', nargs='*', type=str, help='Log files to open')
+    parser.add_argument('--new-window', action='store_true',
+                        help='Open a separate window instead of handing the files to the running TabLog')
+    parser.add_argument('--no-session', action='store_true',
+                        help="Don't reopen the tabs of the last session, nor save this one")
+    parser.add_argument('--startup-profile', action='store_true',
+                        help='Print the import and initialization times once the log is painted')
     args = parser.parse_args()
 
+    # the tablog launcher already tried, this covers TabLog.py started directly
+    if not args.new_window and SingleInstance.forward(args.log_files):
+        return 0
+
     app = QtWidgets.QApplication(sys.argv)
+    StartupProfile.mark("QApplication")
     main_window = QtWidgets.QMainWindow()
     # Use Avice logo as window icon
     avice_logo_path = os.path.join(os.path.dirname(__file__), 'icons', 'avice_logo_64.png')
@@ -168,22 +440,41 @@ if __name__ == '__main__':
     main_window.setGeometry(400, 200, 1200, 800)
     log_tabs = LogViewTab(None)
     main_window.setCentralWidget(log_tabs)
+    document_sidebar = DocumentSidebar(log_tabs, main_window)
+    main_window.addDockWidget(Qt.LeftDockWidgetArea, document_sidebar)
     menu = main_window.menuBar().addMenu("File")
     open_action = QAction('Open', main_window)
     open_action.setShortcut('Ctrl+O')
 
 
     def open_file():
-        file, _ = QtWidgets.QFileDialog.getOpenFileName(
-            main_window, "Open log file", "",
+        files, _ = QtWidgets.QFileDialog.getOpenFileNames(
+            main_window, "Open log files", "",
             "Log files (*.log);;Zipped logs (*.log.gz);;All files (*)")
-        if file:
-            file_name = os.path.basename(file)
-            log_tabs.add_log(file_name, file_name, file)
+        if len(files) == 1:
+            file_name = os.path.basename(files[0])
+            log_tabs.add_log(file_name, file_name, files[0])
+        elif files:
+            log_tabs.open_files(files)
 
 
     open_action.triggered.connect(open_file)
     menu.addAction(open_action)
+
+    def search_in_folder():
+        from FolderSearchDialog import FolderSearchDialog  # with its process pool, only when used
+        current = log_tabs.currentWidget()
+        folder = os.path.dirname(current.logFile) if current else os.getcwd()
+        dialog = FolderSearchDialog(main_window, folder)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.set_open_callback(log_tabs.open_at_line)
+        dialog.show()
+
+
+    folder_search_action = QAction('Search in Folder...', main_window)
+    folder_search_action.setShortcut('Ctrl+Shift+F')
+    folder_search_action.triggered.connect(search_in_folder)
+    menu.addAction(folder_search_action)
     menu.addSeparator()
     exit_action = QAction('Exit', main_window)
     exit_action.setShortcut('Ctrl+Q')
@@ -209,6 +500,26 @@ if __name__ == '__main__':
     reset_zoom_action.triggered.connect(
         lambda: log_tabs.currentWidget().reset_font_size() if log_tabs.currentWidget() else None)
     view_menu.addAction(reset_zoom_action)
+    view_menu.addSeparator()
+
+    wrap_action = QAction('Wrap Lines\tAlt+Z', main_window)  # \t adds shortcut hint without registering
+    wrap_action.triggered.connect(
+        lambda: log_tabs.currentWidget().toggle_wrap() if log_tabs.currentWidget() else None)
+    view_menu.addAction(wrap_action)
+
+    diagnostics_action = QAction('Frame Diagnostics\tCtrl+Shift+D', main_window)  # \t adds shortcut hint without registering
+    diagnostics_action.triggered.connect(
+        lambda: log_tabs.currentWidget().toggle_diagnostics() if log_tabs.currentWidget() else None)
+    view_menu.addAction(diagnostics_action)
+    view_menu.addSeparator()
+    view_menu.addAction(document_sidebar.toggleViewAction())  # Ctrl+Shift+B, a list of all the tabs
+
+    prefetch_action = QAction('Prefetch Linked Files', main_window)
+    prefetch_action.setCheckable(True)
+    prefetch_action.setChecked(LinkPrefetcher.instance().enabled)
+    prefetch_action.setToolTip('Load the most referenced files of the shown log in the background')
+    prefetch_action.toggled.connect(LinkPrefetcher.instance().set_enabled)
+    view_menu.addAction(prefetch_action)
     
     # Help menu
     help_menu = main_window.menuBar().addMenu("Help")
@@ -222,13 +533,44 @@ if __name__ == '__main__':
     shortcuts_action.triggered.connect(lambda: log_tabs.currentWidget().show_help_dialog() if log_tabs.currentWidget() else None)
     help_menu.addAction(shortcuts_action)
     
-    for log_file in args.log_files:
-        log_tabs.add_log(os.path.basename(log_file), "", log_file)
+    # tabs are placeholders until loaded by the pool, so the window appears at once whatever the number of files
+    StartupProfile.mark("main window and menus")
+    # a separate window (--new-window) would overwrite the session of the main one
+    if not args.no_session and not args.new_window:
+        log_tabs.restore_session()
+    log_tabs.open_files(args.log_files)
+    StartupProfile.mark("tabs created")
+    if log_tabs.currentWidget():  # from the command line or the session
+        log_tabs.currentWidget().fileLoaded.connect(lambda: StartupProfile.mark("shown log loaded"))
+
+    # reload the current tab's file on Ctrl-R or F5
+    def reload_current():
+        if log_tabs.currentWidget() and log_tabs.currentWidget().isLoaded:
+            log_tabs.currentWidget().reload_file()
+
+
+    QShortcut(QKeySequence(Qt.CTRL + Qt.Key_R), main_window).activated.connect(reload_current)
+    QShortcut(QKeySequence(Qt.Key_F5), main_window).activated.connect(reload_current)
+
+    # later invocations hand their files over, they open as new tabs of this window
+    def open_forwarded(files: list[str]):
+        if len(files) == 1:
+            file_name = os.path.basename(files[0])
+            log_tabs.add_log(file_name, file_name, files[0])
+        elif files:
+            log_tabs.open_files(files)
+        main_window.setWindowState(main_window.windowState() & ~Qt.WindowMinimized)
+        main_window.show()
+        main_window.raise_()
+        main_window.activateWindow()
+
 
-    # reload file on Ctrl-R
-    QShortcut(QKeySequence(Qt.CTRL + Qt.Key_R), main_window).activated.connect(log_tabs.currentWidget().reload_file)
-    # reload file on F5
-    QShortcut(QKeySequence(Qt.Key_F5), main_window).activated.connect(log_tabs.currentWidget().reload_file)
+    single_instance = SingleInstance(open_forwarded)
+    if not args.new_window:
+        single_instance.listen()
 
+    # the rows are painted on the viewport of a LogView, without tabs the report follows the first paint
+    StartupProfile.watch_paint(app, (lambda widget: isinstance(widget.parentWidget(), LogView)
+                                     and widget.parentWidget().model().rowCount() > 0) if log_tabs.count() else None)
     main_window.show()
-    sys.exit(app.exec_())
+    return app.exec_()
@@ -5,38 +5,62 @@ LogViewer.py - Main Log Viewer Widget
 
 Main Functions:
 - LogViewer: Primary widget for viewing and filtering log files with dual-pane interface
+- ensure_loaded(): Builds the panes and loads the file, deferred viewers show a placeholder until first shown
+- evict() / restore(): Drop the lines of a hidden tab for the MemoryBudget, and bring them back when shown,
+  keeping the line levels (no reclassification), scroll positions, selections and filter
+- session_state() / set_session_state(): Filters, search, scroll positions and selections of a saved session
+- dispose(): Releases a closed tab: stops its background work, drops data and caches, disables its shortcuts
 - load_file(): Loads log files (plain text, gzipped, ANSI colored) and classifies log levels
+- load_classified(): Shows a file read and classified by a bulk open worker process (LogFileReader)
+- append_file(): Reloads only the lines appended to a plain text log, updating filter and counts by delta
+- set_wrap() / toggle_wrap(): Wraps long lines at the window width (Alt+Z), the choice is saved
+- toggle_diagnostics(): Shows per-frame paint statistics (Ctrl+Shift+D), export_frames() saves them as CSV/JSON
 - search_logs(): Applies filters by log level and search text with live highlighting
+- fit_column(): Sizes the text column from the width of the widest row the model tracks
+- show_long_line(): Opens lines longer than a page in the paged LongLineViewer instead of the popup
+- show_referenced_files(): Lists the files referenced in the log (from the link index) to open them
+- prefetch_links(): Has the LinkPrefetcher load the most referenced files of the shown log in the background
 - init_shortcuts(): Sets up keyboard shortcuts for navigation (arrows, page up/down, search)
 - Standalone mode: Can be run directly as a complete log viewing application
 """
 
+import html
 import os
 import sys
 import traceback
-from ansi2html import Ansi2HTMLConverter as a2h
-from PyQt5.QtCore import Qt, QModelIndex, QPoint, QEventLoop, QObject, QSettings
-from PyQt5.QtGui import QFont, QColor, QCursor, QIcon, QKeySequence, QClipboard
+from PyQt5.QtCore import Qt, QModelIndex, QPoint, QEventLoop, QObject, QSettings, QTimer, pyqtSignal
+from PyQt5.QtGui import QFont, QColor, QCursor, QIcon, QKeySequence, QClipboard, QFontMetrics
 from PyQt5.QtWidgets import (
     QApplication,
-    QLineEdit, QPushButton, QWidget, QVBoxLayout, QSplitter, QHBoxLayout, QTableView,
-    QMenu, QWidgetAction, QTextEdit, QLabel, QShortcut, QAction, QSizePolicy
+    QLineEdit, QPushButton, QWidget, QVBoxLayout, QSplitter, QHBoxLayout,
+    QMenu, QWidgetAction, QTextEdit, QLabel, QShortcut, QAction, QSizePolicy, QFileDialog
 )
-from pip._internal import self_outdated_check
 
 from common.Colorizer import Colorizer
+from common.Icons import Icons
+from DocumentStore import DocumentStore, LogDocument
 from FilterTableModel import FilterTableModel
+from FrameProfiler import FrameProfiler
+from IndexCache import IndexCache
+from LinkPrefetcher import LinkPrefetcher
+from LinkStatusCache import LinkStatusCache
+from LogFileReader import LogFileReader
 from LogLevel import LogLevel
 from LogLevelColor import LogLevelColor
 from LogLevelKeywords import LogLevelKeywords
 from LogLineDelegate import LogLineDelegate
 from LogTableModel import LogTableModel
-# noinspection PyUnresolvedReferences
-from icons_rc import *
+from LogView import LogView
+from MemoryBudget import MemoryBudget
+from LongLineViewer import LongLineViewer
 
 
 class LogViewer(QWidget):
-    def __init__(self, title: str, name: str, log_file: str, parent=None):
+    columnPadding: int = 8  # pixels added to the text width of the widest row
+
+    fileLoaded = pyqtSignal()
+
+    def __init__(self, title: str, name: str, log_file: str, parent=None, deferred: bool = False):
         self.title = title if title else ""
         self.name = name if name else os.path.basename(log_file)
         self.logFile = log_file
@@ -44,6 +68,7 @@ class LogViewer(QWidget):
         self.isZipped = False
         self.parent = parent
         self.background = Colorizer(title).hex()
+        self.flashing: bool = False  # the tab's background is being flashed (LogViewTab.flash_tab)
         self.logLevelKeywords = LogLevelKeywords()
         
         # Font size settings
@@ -55,9 +80,48 @@ class LogViewer(QWidget):
         self.current_font_size = settings.value("font_size", self.default_font_size, type=int)
         # Ensure loaded value is within valid range
         self.current_font_size = max(self.min_font_size, min(self.max_font_size, self.current_font_size))
+        self.wrapLines: bool = settings.value("wrap_lines", False, type=bool)
         
         super().__init__(parent)
         self.setWindowTitle(title)
+        self.isLoaded: bool = False
+        self.isDisposed: bool = False
+        self.loadPending: bool = False  # a bulk open worker is classifying the file
+        self.budget = MemoryBudget.instance()
+        self.store = DocumentStore.instance()
+        self.document: LogDocument | None = None  # lines and levels, shared with the tabs of the same file
+        self.evictedView: tuple | None = None  # view state while the document is evicted
+        self.linkCallback = None
+        self.sessionState: dict | None = None  # restored session filter and view, applied once loaded
+        self.placeholder: QLabel | None = None
+        self.fileKey: tuple[int, int] | None = None  # DocumentStore.file_stat() of logFile, taken when
+        self.fileSize: int = 0  # the tab is added and on each load, the tab polls don't stat the file
+        self.stat_file()
+        if deferred:
+            self.init_placeholder()
+        else:
+            self.ensure_loaded()
+
+    def stat_file(self):
+        self.fileKey, self.fileSize = DocumentStore.file_stat(self.logFile)
+
+    def init_placeholder(self):
+        """Until the tab is first shown only a label with the name and size of the file is made."""
+        size = F"{self.fileSize / (1024 * 1024):,.1f} MB" if self.fileKey else "not found"
+        self.rename(self.title)
+        self.setAutoFillBackground(True)
+        self.placeholder = QLabel(F"<h3>{html.escape(self.name)}</h3>{html.escape(self.logFile)}<br><br>{size}", self)
+        self.placeholder.setAlignment(Qt.AlignCenter)
+        self.placeholder.setTextInteractionFlags(Qt.TextSelectableByMouse)
+
+    def ensure_loaded(self, result: tuple = None):
+        """Builds the viewer and loads the file once, from a LogFileReader.classify_file() result if given."""
+        if self.isLoaded or self.isDisposed or (result is None and self.loadPending):
+            return
+        self.isLoaded = True
+        if self.placeholder:
+            self.placeholder.deleteLater()
+            self.placeholder = None
         self.fileTitle = QLineEdit()
         self.splitter = QSplitter(Qt.Vertical, self)
         self.reloadButton = QPushButton()
@@ -65,20 +129,204 @@ class LogViewer(QWidget):
         self.levelButtons: dict[LogLevel, QPushButton] = {}
         self.levelCounts: dict[LogLevel, int] = {level: 0 for level in LogLevel}
         self.filteredCounts: dict[LogLevel, int] = {level: 0 for level in LogLevel}
-        self.logTable = QTableView(self)
-        self.logModel = LogTableModel(self)
-        self.filterTable = QTableView(self)
+        self.logTable = LogView(self)
+        self.stat_file()
+        self.document = self.store.acquire(self.fileKey, self)
+        self.logModel: LogTableModel = self.document.model
+        self.filterTable = LogView(self)
         self.filterModel = FilterTableModel(self, self.logModel)
         self.searchEntry = QLineEdit()
+        self.filesButton = QPushButton("Files")
         self.helpButton = QPushButton("❓ Help")
+        self.frameProfiler: FrameProfiler | None = None  # set while the diagnostics bar is shown
+        self.diagnosticsBar = QWidget(self)
+        self.diagnosticsLabel = QLabel()
+        self.diagnosticsTimer = QTimer(self)
         self.init_ui()
         self.init_font_shortcuts()
         
         # Install event filter to intercept Ctrl+Wheel events before tables consume them
         self.logTable.viewport().installEventFilter(self)
         self.filterTable.viewport().installEventFilter(self)
-        
-        self.load_file(self.logFile)
+        if self.linkCallback:
+            self.set_link_callback(self.linkCallback)
+        # every tab of the document follows its (re)loads and appends, whichever tab does them
+        self.logModel.modelReset.connect(self.log_model_reset)
+        self.logModel.rowsInserted.connect(self.log_rows_appended)
+        self.logModel.linkIndex.finished.connect(self.prefetch_links)
+        if result is None and not self.document.isLoaded:
+            result = LinkPrefetcher.instance().take(self.logFile)  # e.g. a followed link
+
+        if self.document.isEvicted:
+            self.restore_document()
+        elif self.document.isLoaded:
+            self.log_model_reset()  # loaded by another tab, a pending worker result is ignored
+        elif result is None:
+            self.load_file(self.logFile)
+        else:
+            self.load_classified(result)
+        self.document.isLoaded = True
+        if self.sessionState:
+            try:
+                self.set_session_state(self.sessionState)
+            except (ValueError, TypeError) as e:  # a malformed saved session, the tab opens as if new
+                print(F"-WARNING- can't restore the view of '{self.logFile}': {e!r}")
+            self.sessionState = None
+        self.budget.track(self)
+        self.fileLoaded.emit()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.budget.touch(self)
+        if self.evictedView is not None:
+            QTimer.singleShot(0, self.restore)
+        elif not self.isLoaded:
+            if not self.placeholder.text().endswith("Loading..."):
+                self.placeholder.setText(self.placeholder.text() + "<br><br>Loading...")
+            # after the event loop got to paint the window, so many tabs never delay its appearance
+            QTimer.singleShot(0, self.ensure_loaded)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.placeholder:
+            self.placeholder.setGeometry(self.rect())
+
+    def memory_bytes(self) -> int:
+        """Estimated memory of the lines, indexes, filter results and laid-out rows of this tab."""
+        if not self.isLoaded:
+            return 0
+        # a shared document is counted in equal parts by its tabs
+        return (self.document.memory_bytes() // len(self.document.viewers) + self.filterModel.memory_bytes()
+                + sum(table.itemDelegate().renderCache.size for table in [self.logTable, self.filterTable]))
+
+    def evict(self) -> bool:
+        """Drops the lines of this hidden tab, and of the hidden tabs sharing its document, keeping what
+        restore() needs to show each of them as it was.
+
+        Returns:
+            bool: False if there was nothing to evict, or a tab showing the same document is visible
+        """
+        document = self.document
+        if not self.isLoaded or document.isEvicted or not self.logModel.rowCount():
+            return False
+        if any(viewer.isVisible() for viewer in document.viewers):
+            return False
+        for viewer in document.viewers:
+            viewer.evictedView = viewer.view_state()
+        # only a plain text file can be read back unchanged, others are loaded again
+        document.evictedLevels = (bytes(level.value for level, _ in self.logModel.logData)
+                                  if document.loadedInode is not None else None)
+        document.isEvicted = True
+        self.logModel.update_data([], self.logModel.htmlLines)
+        for viewer in document.viewers:
+            for table in [viewer.logTable, viewer.filterTable]:
+                table.itemDelegate().renderCache.clear()
+        return True
+
+    def restore(self):
+        """Brings back the lines of an evicted tab, with its scroll positions and selections."""
+        if self.evictedView is None or self.isDisposed:
+            return
+        view, self.evictedView = self.evictedView, None
+        if self.document.isEvicted:  # else another tab of the document restored it
+            self.restore_document()
+        self.set_view_state(view)
+        self.budget.track(self)
+
+    def restore_document(self):
+        document = self.document
+        levels, document.evictedLevels = document.evictedLevels, None
+        document.isEvicted = False
+        if levels is None or not self.reread_lines(levels):
+            self.load_file(self.logFile)
+
+    def reread_lines(self, levels: bytes) -> bool:
+        """Reads the loaded part of the file again and pairs its lines with the kept levels.
+
+        Returns:
+            bool: False if the file was replaced or rewritten since, a full load is needed then
+        """
+        document = self.document
+        try:
+            QApplication.setOverrideCursor(Qt.WaitCursor)
+            with open(self.logFile, 'rb') as fd:
+                stat = os.fstat(fd.fileno())
+                if (stat.st_dev, stat.st_ino) != document.loadedInode or stat.st_size < document.loadedSize:
+                    return False
+                data = fd.read(document.loadedSize)
+            if not data.endswith(document.loadedTail):
+                return False
+            lines = data.decode(errors='replace').splitlines(keepends=False)
+            if len(lines) != len(levels):
+                return False
+            self.set_lines(LogFileReader.pair_levels(levels, lines))
+        except OSError:
+            return False
+        finally:
+            QApplication.restoreOverrideCursor()
+        self.append_file()  # lines written while evicted
+        return True
+
+    def dispose(self):
+        """Releases what a closed tab holds outside its widget tree, before the caller deletes the widget.
+
+        The lines are dropped at once (the Python objects may outlive the widget a little), background
+        work is stopped, and the shortcuts (some are application wide) stop firing.
+        """
+        if self.isDisposed:
+            return
+        self.isDisposed = True
+        self.budget.remove(self)
+        self.evictedView = None
+        for shortcut in self.findChildren(QShortcut):
+            shortcut.setEnabled(False)
+            shortcut.activated.disconnect()
+        if not self.isLoaded:
+            return
+        self.logModel.modelReset.disconnect(self.log_model_reset)
+        self.logModel.rowsInserted.disconnect(self.log_rows_appended)
+        self.logModel.linkIndex.finished.disconnect(self.prefetch_links)
+        self.logModel.modelReset.disconnect(self.filterModel.log_model_reset)
+        self.store.release(self)  # the lines are dropped with the last tab of the file
+        self.diagnosticsTimer.stop()
+        self.frameProfiler = None
+        for table in [self.logTable, self.filterTable]:
+            table.frameProfiler = None
+            delegate = table.itemDelegate()
+            delegate.linkStatus.statusChanged.disconnect(delegate.link_status_changed)
+            delegate.renderCache.clear()
+        self.filterModel.set_filter(list(LogLevel), "")
+        self.filterModel.queryCache.clear()
+
+    def view_state(self) -> tuple:
+        return tuple((table.top_row(), table.horizontalScrollBar().value(), table.selected_ranges())
+                     for table in [self.filterTable, self.logTable])
+
+    def set_view_state(self, state: tuple):
+        # the filter first, selecting a finding scrolls the log to it
+        for table, (top_row, x, ranges) in zip([self.filterTable, self.logTable], state):
+            table.select_ranges(ranges)
+            if top_row < table.row_count():
+                table.scrollTo(table.model().index(top_row, 0), LogView.PositionAtTop)
+            table.horizontalScrollBar().setValue(x)
+
+    def session_state(self) -> dict:
+        """Level filters, search text, scroll positions and selections, saved with the session (JSON)."""
+        if not self.isLoaded:
+            return self.sessionState or {}
+        return {"levels": [level.name for level, button in self.levelButtons.items() if button.isChecked()],
+                "search": self.searchEntry.text(),
+                "view": self.evictedView if self.evictedView is not None else self.view_state()}
+
+    def set_session_state(self, state: dict):
+        levels = state.get("levels", [])
+        for level, button in self.levelButtons.items():
+            button.setChecked(level.name in levels)
+        self.searchEntry.setText(state.get("search", ""))
+        if levels or self.searchEntry.text():
+            self.search_logs()
+        if state.get("view"):
+            self.set_view_state(state["view"])
 
     def get_background(self) -> str:
         return self.background
@@ -91,7 +339,9 @@ class LogViewer(QWidget):
         self.setPalette(palette)
 
     def set_link_callback(self, callback):
-        self.logTable.itemDelegate().set_link_callback(callback)
+        self.linkCallback = callback
+        if self.isLoaded:
+            self.logTable.itemDelegate().set_link_callback(callback)
 
     def init_ui(self):
         self.rename(self.title)
@@ -138,46 +388,36 @@ class LogViewer(QWidget):
         monospaced_font = QFont("Courier New", self.current_font_size)
 
         for ind, table in enumerate([self.logTable, self.filterTable]):
-            table.horizontalHeader().setStretchLastSection(True)
-            table.setHorizontalScrollMode(QTableView.ScrollPerPixel)
             table.setAutoScroll(False)
             table.setStyleSheet(
-                "QTableView {"
-                "   gridline-color: transparent;"
+                "LogView {"
                 "   border: none;"
                 "   background-color: #F8F8F8;"
                 "}"
             )
             table.setFont(monospaced_font)
             delegate = LogLineDelegate(table, table == self.filterTable)
+            delegate.set_link_callback(self.load_file)  # the log pane follows linkCallback, if set
             table.setItemDelegate(delegate)
 
-            # Set the horizontal header properties
-            table.horizontalHeader().setVisible(False)
-
-            # Set the vertical header properties
-            table.verticalHeader().setDefaultSectionSize(12)  # Set the default row height (adjust as needed)
-            table.verticalHeader().setVisible(True)
-            table.verticalHeader().setDefaultAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            table.verticalHeader().setStyleSheet("background-color: #DDDDDD;")
 
             table.doubleClicked.connect(self.on_double_click)
         # allow only single selected row
-        self.filterTable.setSelectionMode(QTableView.SingleSelection)
-        self.filterTable.setSelectionBehavior(QTableView.SelectRows)
+        self.filterTable.setSelectionMode(LogView.SingleSelection)
         self.filterTable.selectionModel().selectionChanged.connect(
             lambda selection: (
                 row := self.filterModel.row_to_origin(selection.indexes()[0].row()),
                 self.logTable.selectRow(row),
-                self.logTable.scrollTo(self.logModel.index(row, 0), QTableView.PositionAtCenter),
+                self.logTable.scrollTo(self.logModel.index(row, 0), LogView.PositionAtCenter),
                 self.logTable.horizontalScrollBar().setValue(0),
             ) if selection.indexes() else self.logTable.clearSelection()
         )
         self.splitter.setSizes([400, 200])
+        self.set_wrap(self.wrapLines)
 
         # Filter toolbar
         toolbar_layout = QHBoxLayout()
-        self.reloadButton.setIcon(QIcon(":/reload"))
+        self.reloadButton.setIcon(Icons.icon("reload"))
         self.reloadButton.setToolTip("Reload log file")
         self.reloadButton.clicked.connect(self.reload_file)
         toolbar_layout.addWidget(self.reloadButton)
@@ -191,12 +431,12 @@ class LogViewer(QWidget):
             self.levelButtons[level] = level_btn
             level_btn.setChecked(False)
             level_btn.clicked.connect(self.search_logs)
-            level_btn.setIcon(QIcon(F":/{level.name.lower()}"))
+            level_btn.setIcon(Icons.icon(level.name.lower()))
             toolbar_layout.addWidget(level_btn)
         toolbar_layout.addWidget(self.cleanLevels)
         toolbar_layout.addWidget(QLabel(" "))
         self.cleanLevels.setToolTip("Clear level filters")
-        self.cleanLevels.setIcon(QIcon(":/clear"))
+        self.cleanLevels.setIcon(Icons.icon("clear"))
         self.cleanLevels.clicked.connect(
             lambda state: [cb.setChecked(False) for cb in self.levelButtons.values()] and self.search_logs()
         )
@@ -204,11 +444,32 @@ class LogViewer(QWidget):
         self.init_search_actions()
         toolbar_layout.addWidget(self.searchEntry)
         toolbar_layout.addWidget(QLabel(" "))
+        self.filesButton.setToolTip("Files referenced in this log")
+        self.filesButton.setMenu(QMenu(self.filesButton))
+        self.filesButton.menu().aboutToShow.connect(self.show_referenced_files)
+        toolbar_layout.addWidget(self.filesButton)
         self.helpButton.setToolTip("Show help and keyboard shortcuts")
         self.helpButton.clicked.connect(self.show_help_dialog)
         toolbar_layout.addWidget(self.helpButton)
         bottom_section.layout().addLayout(toolbar_layout)
 
+        # Frame diagnostics, hidden until toggled
+        self.diagnosticsBar.setLayout(QHBoxLayout())
+        self.diagnosticsBar.layout().setContentsMargins(4, 0, 0, 0)
+        # ignored width, so changing statistics never re-layout the tables (which would paint more frames)
+        self.diagnosticsLabel.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Fixed)
+        self.diagnosticsLabel.setStyleSheet("font-family: monospace;")
+        self.diagnosticsBar.layout().addWidget(self.diagnosticsLabel)
+        export_button = QPushButton("Export...")
+        export_button.setToolTip("Save the recorded frames as a CSV or JSON trace")
+        export_button.clicked.connect(self.export_frames)
+        self.diagnosticsBar.layout().addWidget(export_button)
+        self.diagnosticsBar.hide()
+        bottom_section.layout().addWidget(self.diagnosticsBar)
+        self.diagnosticsTimer.setInterval(250)
+        self.diagnosticsTimer.timeout.connect(
+            lambda: self.diagnosticsLabel.setText(self.frameProfiler.summary()) if self.frameProfiler is not None else None)
+
         self.init_shortcuts()
 
     def show_context_menu(self, position):
@@ -219,12 +480,39 @@ class LogViewer(QWidget):
         menu.addAction(copy_action)
         menu.exec_(table.viewport().mapToGlobal(position))
 
-    def copy_rows(self, table: QTableView):
-        # get numbers of selected rows
-        selection: list[int] = [ind.row() for ind in table.selectionModel().selectedRows() if ind and ind.isValid()]
-        if not selection or len(selection) > 1000:
+    def show_referenced_files(self, max_files: int = 100):
+        """Fill the Files menu with the most referenced files of the log."""
+        menu = self.filesButton.menu()
+        menu.clear()
+        link_index = self.logModel.linkIndex
+        files = link_index.referenced_files()
+        if not link_index.is_finished():
+            menu.addAction("Indexing links...").setEnabled(False)
+        elif not files:
+            menu.addAction("No files referenced").setEnabled(False)
+        delegate = self.logTable.itemDelegate()
+        for path, count in files[:max_files]:
+            action = menu.addAction(F"{path}  ({count})")
+            action.setEnabled(delegate.linkStatus.status(path) != LinkStatusCache.Missing)
+            action.triggered.connect(
+                lambda checked, file=path: delegate.linkCallback(file))
+        if len(files) > max_files:
+            menu.addAction(F"... {len(files) - max_files} more files").setEnabled(False)
+
+    def prefetch_links(self):
+        """The links of the document are indexed, its most referenced files are loaded while this tab is shown."""
+        if not self.isVisible():
             return
-        sorted_rows: list[int] = sorted(selection)
+        open_files = {viewer.logFile for document in self.store.documents.values() for viewer in document.viewers}
+        files = [path for path, count in self.logModel.linkIndex.referenced_files() if path not in open_files]
+        LinkPrefetcher.instance().prefetch(files[:LinkPrefetcher.topFiles])
+
+    def copy_rows(self, table: LogView):
+        # count the selected rows from the selection ranges before listing any of them
+        if not 0 < table.selected_row_count() <= 1000:
+            return
+        sorted_rows: list[int] = sorted(
+            row for selected in table.selectionModel().selection() for row in range(selected.top(), selected.bottom() + 1))
         copied_text = "\n".join(self.logModel.raw_data(row) for row in sorted_rows)
         clipboard = QApplication.clipboard()
         clipboard.setText(copied_text, QClipboard.Clipboard)
@@ -233,34 +521,34 @@ class LogViewer(QWidget):
     def init_search_actions(self):
         self.searchEntry.setPlaceholderText("Search...")
         self.searchEntry.returnPressed.connect(self.search_logs)
-        action = QAction(QIcon(":/find"), "Search\tEnter", self)
+        action = QAction(Icons.icon("find"), "Search\tEnter", self)
         action.triggered.connect(self.search_logs)
         self.searchEntry.addAction(action, QLineEdit.TrailingPosition)
-        action = QAction(QIcon(":/up"), "Next\tCtrl+Up", self)
+        action = QAction(Icons.icon("up"), "Next\tCtrl+Up", self)
         action.triggered.connect(lambda: self.select_finding())
         self.searchEntry.addAction(action, QLineEdit.TrailingPosition)
-        action = QAction(QIcon(":/down"), "Prev\tCtrl+Down", self)
+        action = QAction(Icons.icon("down"), "Prev\tCtrl+Down", self)
         action.triggered.connect(lambda: self.select_finding(prev=True))
         self.searchEntry.addAction(action, QLineEdit.TrailingPosition)
-        action = QAction(QIcon(":/clear"), "Clear", self)
+        action = QAction(Icons.icon("clear"), "Clear", self)
         action.triggered.connect(lambda: (self.searchEntry.setText(""), self.search_logs()))
         self.searchEntry.addAction(action, QLineEdit.TrailingPosition)
 
     @staticmethod
-    def scroll_page(table: QTableView, up: bool):
+    def scroll_page(table: LogView, up: bool):
         table.verticalScrollBar().setValue(
             table.verticalScrollBar().value() - table.verticalScrollBar().pageStep() if up
             else table.verticalScrollBar().value() + table.verticalScrollBar().pageStep()
         )
 
     @staticmethod
-    def scroll_horizontal(table: QTableView, left: bool, step: int = 1):
+    def scroll_horizontal(table: LogView, left: bool, step: int = 1):
         current_value = table.horizontalScrollBar().value()
         page_step = table.horizontalScrollBar().pageStep() // step
         table.horizontalScrollBar().setValue(current_value - page_step if left else current_value + page_step)
 
     @staticmethod
-    def scroll_line(table: QTableView, up: bool):
+    def scroll_line(table: LogView, up: bool):
         current_value = table.verticalScrollBar().value()
         single_step = table.verticalScrollBar().singleStep()
         table.verticalScrollBar().setValue(current_value - single_step if up else current_value + single_step)
@@ -285,6 +573,8 @@ class LogViewer(QWidget):
         QShortcut(QKeySequence(Qt.CTRL + Qt.Key_Right), self).activated.connect(
             lambda: self.scroll_horizontal(self.logTable, left=False, step=1)
         )
+        QShortcut(QKeySequence(Qt.ALT + Qt.Key_Z), self).activated.connect(self.toggle_wrap)
+        QShortcut(QKeySequence(Qt.CTRL + Qt.SHIFT + Qt.Key_D), self).activated.connect(self.toggle_diagnostics)
         # allow select all only if the number of rows is less than 1000
         QShortcut(QKeySequence(Qt.CTRL + Qt.Key_A), self).activated.connect(
             lambda: self.logTable.selectAll() if self.logTable.model().rowCount() < 1000 else None)
@@ -316,12 +606,14 @@ class LogViewer(QWidget):
         )
 
     def on_double_click(self, index: QModelIndex):
-        row = index.row()
+        raw_line = index.data(LogTableModel.RawTextRole)
+        if raw_line and len(raw_line) > LongLineViewer.pageSize:
+            self.show_long_line(index, raw_line)
+            return
         line = index.data(Qt.DisplayRole)
         if line:
             line = F'<pre style="white-space:pre-wrap;word-wrap:break-word;">{line}</pre>'
-        level: LogLevel
-        *orig_row, level, _ = index.model().logData[row]
+        level: LogLevel = index.data(Qt.UserRole)
         fg, bg = LogLevelColor(level).colors()
         bg = QColor(bg).darker(120).name()
         menu = QMenu(self.logTable)
@@ -341,6 +633,22 @@ class LogViewer(QWidget):
         menu.show()
         menu.move(centered_pos)
 
+    def show_long_line(self, index: QModelIndex, line: str):
+        """Opens a huge line in the paged viewer, the popup would lay out the whole line."""
+        if self.logModel.htmlLines:
+            line = html.unescape(LogTableModel.tagPattern.sub('', line))
+        fg, _ = LogLevelColor(index.data(Qt.UserRole)).colors()
+        viewer = LongLineViewer(line, fg, self.logTable.font(), self)
+        viewer.setAttribute(Qt.WA_DeleteOnClose)
+        viewer.show()
+
+    def goto_line(self, row: int):
+        """Select the 0-based row in the log table and center it."""
+        row = max(0, min(row, self.logModel.rowCount() - 1))
+        self.logTable.selectRow(row)
+        self.logTable.scrollTo(self.logModel.index(row, 0), LogView.PositionAtCenter)
+        self.logTable.horizontalScrollBar().setValue(0)
+
     def select_finding(self, prev=False):
         selection = self.filterTable.selectionModel().selectedRows()
         max_row = self.filterTable.model().rowCount() - 1
@@ -349,20 +657,19 @@ class LogViewer(QWidget):
         self.logTable.clearSelection()
         self.filterTable.selectRow(row_next)
         hor_scroll_val = self.filterTable.horizontalScrollBar().value()
-        self.filterTable.scrollTo(self.filterModel.index(row_next, 0), QTableView.PositionAtCenter)
+        self.filterTable.scrollTo(self.filterModel.index(row_next, 0), LogView.PositionAtCenter)
         self.filterTable.horizontalScrollBar().setValue(hor_scroll_val)
 
-    def count_levels(self) -> None:
-        """Count the number of lines for each log level."""
-        self.levelCounts = {level: 0 for level in LogLevel}
-        for level, _ in self.logModel.logData:
+    def count_levels(self, start_row: int = 0) -> None:
+        """Count the number of lines for each log level, from start_row on when rows were appended."""
+        if not start_row:
+            self.levelCounts = {level: 0 for level in LogLevel}
+        for level, _ in self.logModel.logData[start_row:]:
             self.levelCounts[level] = self.levelCounts.get(level, 0) + 1
     
     def count_filtered_levels(self) -> None:
         """Count the number of filtered lines for each log level."""
-        self.filteredCounts = {level: 0 for level in LogLevel}
-        for _, level, _ in self.filterModel.logData:
-            self.filteredCounts[level] = self.filteredCounts.get(level, 0) + 1
+        self.filteredCounts = self.filterModel.level_counts()
     
     def update_level_button_text(self) -> None:
         """Update filter button text with counts."""
@@ -382,33 +689,24 @@ class LogViewer(QWidget):
         try:
             QApplication.setOverrideCursor(Qt.WaitCursor)
             self.logFile = log_file
+            self.stat_file()
+            self.store.rekey(self.document, self.fileKey)
+            self.document.set_loaded(None)
             self.fileTitle.setText(self.logFile)
-            if not self.logFile or not os.path.exists(self.logFile):
-                self.logModel.update_data([
-                    (LogLevel.ERROR, F"File not found: '{self.logFile}'")
-                ])
-                return
-            # Detect file type using 'file' command (content-based, not extension-based)
-            file_type = "ASCII text"
-            with os.popen(F"/usr/bin/file -bL {log_file}") as fd:
-                lines = fd.read().splitlines(keepends=False)
-                if lines:
-                    file_type = lines[0].strip()
-            if "ASCII text" in file_type:
-                if "with escape sequences" in file_type:
-                    html_content=a2h(inline=True).convert(open(self.logFile).read(), full=False)
-                    lines = html_content.splitlines(keepends=False)
-                else:
-                    with open(self.logFile, 'r') as fd:
-                        lines = fd.read().splitlines(keepends=False)
-            elif "gzip compressed data" in file_type:
-                with os.popen(F"/usr/bin/zcat -vq {self.logFile}") as fd:
-                    lines = fd.read().splitlines(keepends=False)
-            else:
-                self.logModel.update_data([
-                    (LogLevel.ERROR, F"Unsupported file type: '{file_type}'")
-                ])
+            # a large plain text file classified before only needs its lines read
+            cached = IndexCache.load(self.logFile, self.logLevelKeywords)
+            if cached:
+                levels, loaded = cached
+                self.document.set_loaded(loaded)
+                if self.reread_lines(levels):
+                    return
+                self.document.set_loaded(None)
+            # plain text, ANSI colored (converted to HTML lines) or gzipped, by content not extension
+            lines, html_lines, loaded, errors = LogFileReader.read_lines(self.logFile)
+            if errors:
+                self.logModel.update_data([(LogLevel.ERROR, error) for error in errors])
                 return
+            self.document.set_loaded(loaded)
             
             # Treat ALL successfully loaded text files as logs for classification
             # This enables filters/classification for .txt, .prc, .yaml, .status, etc.
@@ -416,13 +714,10 @@ class LogViewer(QWidget):
             
             # Always classify lines by log level patterns (ERROR, WARNING, INFO, DEBUG, TEXT)
             # If no patterns match, lines are classified as TEXT with count shown
-            self.logModel.update_data(self.logLevelKeywords.classify_lines(lines))
-            self.logTable.resizeColumnToContents(0)
-
-            self.count_levels()
-            self.search_logs()
-            for table in [self.logTable, self.filterTable]:
-                table.scrollTo(self.logModel.index(0, 0), QTableView.PositionAtTop)
+            classified = self.logLevelKeywords.classify_lines(lines)
+            self.set_lines(classified, html_lines)
+            IndexCache.store(self.logFile, bytes(level.value for level, _ in classified), loaded,
+                             self.logLevelKeywords)
         except Exception as e:
             error_message = F"-ERROR- loading file: '{self.logFile}': {e}\n{traceback.format_exc()}"
             print(error_message)
@@ -433,10 +728,82 @@ class LogViewer(QWidget):
         finally:
             QApplication.restoreOverrideCursor()
 
-    def reload_file(self):
-        self.load_file(self.logFile)
+    def set_lines(self, classified: list[tuple[LogLevel, str]], html_lines: bool = False) -> None:
+        """Every tab of the document follows in log_model_reset()."""
+        self.logModel.update_data(classified, html_lines)
+
+    def log_model_reset(self) -> None:
+        """The document was (re)loaded or evicted, by this tab or another one showing the same file."""
+        self.fit_column(self.logTable)
+
+        self.count_levels()
         self.search_logs()
+        for table in [self.logTable, self.filterTable]:
+            table.scrollTo(self.logModel.index(0, 0), LogView.PositionAtTop)
+
+    def load_classified(self, result: tuple) -> None:
+        """Shows the result of LogFileReader.classify_file(), only plain text lines are read here."""
+        levels, lines, html_lines, loaded, errors = result
+        self.fileTitle.setText(self.logFile)
+        self.document.set_loaded(None)
+        if errors:
+            self.logModel.update_data([(LogLevel.ERROR, error) for error in errors])
+        elif lines is not None:
+            self.set_lines(LogFileReader.pair_levels(levels, lines), html_lines)
+        else:
+            self.document.set_loaded(loaded)
+            if not self.reread_lines(levels):  # changed since the worker read it
+                self.load_file(self.logFile)
+
+    def append_file(self) -> bool:
+        """Load only the lines appended since the last load.
+
+        Returns:
+            bool: False if the file can't be appended to (not plain text, replaced,
+                  truncated or rewritten), a full load is needed then
+        """
+        document = self.document
+        if document.loadedInode is None:
+            return False
+        try:
+            with open(self.logFile, 'rb') as fd:
+                stat = os.fstat(fd.fileno())
+                if (stat.st_dev, stat.st_ino) != document.loadedInode or stat.st_size < document.loadedSize:
+                    return False
+                fd.seek(document.loadedSize - len(document.loadedTail))
+                if fd.read(len(document.loadedTail)) != document.loadedTail:
+                    return False
+                data = fd.read()
+        except OSError:
+            return False
+        # only complete lines are consumed, a partly written last line is picked up by the next reload
+        data = data[:data.rfind(b"\n") + 1]
+        if not data:
+            return True
+        document.loadedSize += len(data)
+        document.loadedTail = (document.loadedTail + data)[-LogFileReader.tailSize:]
+        lines = data.decode(errors='replace').splitlines(keepends=False)
+        self.logModel.append_data(self.logLevelKeywords.classify_lines(lines))  # followed in log_rows_appended()
+        return True
+
+    def log_rows_appended(self, parent: QModelIndex, start_row: int, last_row: int) -> None:
+        """Lines were appended to the document, by a reload of this tab or another one showing the same file."""
+        self.fit_column(self.logTable)
+        self.count_levels(start_row)
+        new_rows = self.filterModel.append_rows(start_row)
+        for level, count in self.filterModel.level_counts(new_rows).items():
+            self.filteredCounts[level] = self.filteredCounts.get(level, 0) + count
+        self.update_level_button_text()
+        if new_rows:
+            self.fit_column(self.filterTable)
+            self.select_last_finding()
+
+    def reload_file(self):
+        self.stat_file()
+        if not self.append_file():
+            self.load_file(self.logFile)
         self.logTable.scrollToBottom()
+        self.budget.track(self)
 
     def search_logs(self):
         try:
@@ -445,7 +812,7 @@ class LogViewer(QWidget):
             levels = [level for level in list(LogLevel) if self.levelButtons[level].isChecked()]
             search_text = self.searchEntry.text().lower()
             self.filterModel.set_filter(levels, search_text)
-            self.filterTable.resizeColumnToContents(0)
+            self.fit_column(self.filterTable)
         finally:
             self.filterModel.endResetModel()
             QApplication.restoreOverrideCursor()
@@ -454,10 +821,19 @@ class LogViewer(QWidget):
         self.count_filtered_levels()
         self.update_level_button_text()
         
+        self.select_last_finding()
+
+    def fit_column(self, table: LogView) -> None:
+        """Sizes the text column from the widest row, no row is measured (monospaced font)."""
+        metrics = QFontMetrics(table.itemDelegate().docText.defaultFont())
+        width = table.model().maxWidth * metrics.horizontalAdvance(' ') + self.columnPadding
+        table.setColumnWidth(0, width)
+
+    def select_last_finding(self):
         row_count = self.filterModel.rowCount()
         if row_count > 0:
             QApplication.processEvents(flags=QEventLoop.ExcludeUserInputEvents)
-            self.filterTable.scrollTo(self.filterModel.index(row_count - 1, 0), QTableView.PositionAtTop)
+            self.filterTable.scrollTo(self.filterModel.index(row_count - 1, 0), LogView.PositionAtTop)
             self.filterTable.selectRow(row_count - 1)
 
     def init_font_shortcuts(self):
@@ -526,14 +902,51 @@ class LogViewer(QWidget):
         self.reloadButton.setFont(font)
         self.helpButton.setFont(font)
         
-        # Update delegate fonts (for proper text rendering)
-        self.logTable.itemDelegate().docText.setDefaultFont(font)
-        self.filterTable.itemDelegate().docText.setDefaultFont(font)
+        # Update delegate fonts (for proper text rendering), rows laid out with the old font are dropped
+        for table in [self.logTable, self.filterTable]:
+            table.itemDelegate().docText.setDefaultFont(font)
+            table.itemDelegate().renderCache.clear()
+            self.fit_column(table)
         
         # Force viewport repaint
         self.logTable.viewport().update()
         self.filterTable.viewport().update()
 
+    def toggle_wrap(self):
+        self.set_wrap(not self.wrapLines)
+        QSettings("Avice", "TabLog").setValue("wrap_lines", self.wrapLines)
+
+    def set_wrap(self, wrap: bool):
+        """Wrap long lines at the window width instead of scrolling horizontally."""
+        self.wrapLines = wrap
+        for table in [self.logTable, self.filterTable]:
+            table.itemDelegate().renderCache.clear()
+            table.set_wrapping(wrap)
+
+    def toggle_diagnostics(self):
+        """Shows or hides the frame diagnostics bar, frames are only recorded while it is shown."""
+        self.frameProfiler = None if self.frameProfiler is not None else FrameProfiler()
+        for table in [self.logTable, self.filterTable]:
+            table.frameProfiler = self.frameProfiler
+        self.diagnosticsBar.setVisible(self.frameProfiler is not None)
+        if self.frameProfiler is not None:
+            self.diagnosticsLabel.setText(self.frameProfiler.summary())
+            self.diagnosticsTimer.start()
+        else:
+            self.diagnosticsTimer.stop()
+
+    def export_frames(self):
+        if self.frameProfiler is None:
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Export frame trace", f"{self.name}.frames.csv",
+                                              "CSV files (*.csv);;JSON files (*.json)")
+        if not path:
+            return
+        try:
+            self.frameProfiler.export(path)
+        except OSError as e:
+            self.diagnosticsLabel.setText(f"Export failed: {e}")
+
     def save_font_size(self):
         """Save font size preference using QSettings."""
         settings = QSettings("Avice", "TabLog")
@@ -841,6 +1254,7 @@ SEARCH RESULTS
 Shortcut               Action
 ---------------------  -----------------------
 Ctrl+O                 Open file
+Ctrl+Shift+F           Search in folder (without opening tabs)
 Ctrl+W                 Close current tab
 Ctrl+R or F5           Reload current file
 Ctrl+Q                 Quit application
@@ -884,13 +1298,16 @@ Shortcut               Action
 Ctrl++ or Ctrl+=       Increase font size
 Ctrl+-                 Decrease font size
 Ctrl+0                 Reset font to default (10pt)
+Alt+Z                  Toggle line wrap
+Ctrl+Shift+D           Toggle frame diagnostics (paint time per frame)
 Ctrl+Mouse Wheel       Zoom in/out (wheel up/down)
 
 💡 TIPS
 -------
   • Double-click a log line to view it in a popup
   • Click file paths in logs to open them in a new tab
-  • Font size preference is saved across sessions
+  • The Files button lists all files referenced in the log
+  • Font size and line wrap preferences are saved across sessions
   • Ctrl+Mouse Wheel works anywhere in the window
   • Use Shift+Click to select multiple rows
   • Right-click selected rows and choose "Copy"
@@ -0,0 +1,118 @@
+"""
+LongLineViewer.py - Paged Viewer for Extremely Long Log Lines
+
+Main Functions:
+- LongLineViewer: Dialog showing a huge line (MBs of netlist or JSON) one page of characters at a time
+- show_page(): Puts a single page into the text widget, the whole line is never laid out
+- find(): Searches the whole line and turns to the page of the next (or previous) match
+- qt_position(): Converts a str offset in the page to a QTextCursor position (UTF-16 code units)
+"""
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QTextCursor, QFont
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QPushButton, QLineEdit, QLabel
+
+
+class LongLineViewer(QDialog):
+    pageSize: int = 64 * 1024  # characters shown at once
+
+    def __init__(self, line: str, fg: str = "black", font: QFont = None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(F"Long line ({len(line):,} characters)")
+        self.resize(1000, 600)
+        self.line: str = line
+        self.lowered: str | None = None  # lower-cased line, made on the first search
+        self.page: int = 0
+        self.pageEnd: int = 0  # line offset after the last character of the page shown
+        self.pageText: str = ""
+        self.pageCount: int = max(1, -(-len(line) // self.pageSize))
+        self.matchPos: int = -1  # line offset of the current match
+
+        self.textView = QPlainTextEdit()
+        self.prevButton = QPushButton("< Prev")
+        self.nextButton = QPushButton("Next >")
+        self.pageLabel = QLabel()
+        self.searchEntry = QLineEdit()
+        self.findPrevButton = QPushButton("Find Prev")
+        self.findNextButton = QPushButton("Find Next")
+        self.init_ui(fg, font)
+        self.show_page(0)
+
+    def init_ui(self, fg: str, font: QFont):
+        self.setLayout(QVBoxLayout())
+        self.textView.setReadOnly(True)
+        self.textView.setLineWrapMode(QPlainTextEdit.WidgetWidth)
+        self.textView.setStyleSheet(F"QPlainTextEdit {{ color: {fg}; }}")
+        if font:
+            self.textView.setFont(font)
+        self.layout().addWidget(self.textView)
+
+        nav_layout = QHBoxLayout()
+        self.prevButton.clicked.connect(lambda: self.show_page(self.page - 1))
+        nav_layout.addWidget(self.prevButton)
+        nav_layout.addWidget(self.pageLabel)
+        self.nextButton.clicked.connect(lambda: self.show_page(self.page + 1))
+        nav_layout.addWidget(self.nextButton)
+        nav_layout.addStretch()
+        self.searchEntry.setPlaceholderText("Search in line...")
+        self.searchEntry.returnPressed.connect(self.find)
+        nav_layout.addWidget(self.searchEntry)
+        self.findPrevButton.clicked.connect(lambda: self.find(backward=True))
+        nav_layout.addWidget(self.findPrevButton)
+        self.findNextButton.clicked.connect(self.find)
+        nav_layout.addWidget(self.findNextButton)
+        self.layout().addLayout(nav_layout)
+        self.searchEntry.setFocus()
+
+    def show_page(self, page: int):
+        self.page = max(0, min(page, self.pageCount - 1))
+        start = self.page * self.pageSize
+        end = self.pageEnd = min(len(self.line), start + self.pageSize)
+        self.pageText = self.line[start:end]
+        self.textView.setPlainText(self.pageText)
+        self.pageLabel.setText(F"Page {self.page + 1}/{self.pageCount}  (characters {start + 1:,}-{end:,})")
+        self.prevButton.setEnabled(self.page > 0)
+        self.nextButton.setEnabled(self.page < self.pageCount - 1)
+
+    def find(self, backward: bool = False):
+        text = self.searchEntry.text().lower()
+        if not text:
+            return
+        if self.lowered is None:
+            self.lowered = self.line.lower()
+            if len(self.lowered) != len(self.line):  # lower-casing changed offsets, search case-sensitively
+                self.lowered = self.line
+        if backward:
+            end = len(self.lowered) if self.matchPos < 0 else self.matchPos + len(text) - 1
+            pos = self.lowered.rfind(text, 0, end)
+        else:
+            pos = self.lowered.find(text, self.matchPos + 1)
+        if pos == -1:
+            self.pageLabel.setText(F"'{self.searchEntry.text()}' not found "
+                                   F"{'before' if backward else 'after'} character {self.matchPos + 1:,}")
+            return
+        self.matchPos = pos
+        page = pos // self.pageSize
+        if page != self.page:
+            self.show_page(page)
+        # a match across the page end is selected up to the end of the page
+        offset = pos - self.page * self.pageSize
+        cursor = self.textView.textCursor()
+        cursor.setPosition(self.qt_position(offset))
+        cursor.setPosition(self.qt_position(min(offset + len(text), len(self.pageText))), QTextCursor.KeepAnchor)
+        self.textView.setTextCursor(cursor)
+        self.textView.centerCursor()
+
+    def qt_position(self, offset: int) -> int:
+        """Characters outside the BMP (emoji, some CJK) are one str character but two UTF-16 units in Qt."""
+        if self.pageText.isascii():
+            return offset
+        return len(self.pageText[:offset].encode('utf-16-le')) // 2
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key_PageDown and event.modifiers() & Qt.ControlModifier:
+            self.show_page(self.page + 1)
+        elif event.key() == Qt.Key_PageUp and event.modifiers() & Qt.ControlModifier:
+            self.show_page(self.page - 1)
+        else:
+            super().keyPressEvent(event)
@@ -0,0 +1,95 @@
+"""
+MemoryBudget.py - Global Memory Budget for the Loaded Logs
+
+Main Functions:
+- MemoryBudget: Process-wide estimate of the memory held by every loaded tab, evicting the least recently used
+- instance(): Returns the shared budget
+- track() / touch(): Registers a tab after a (re)load, or marks it as just shown; both enforce the budget
+- enforce(): Evicts the line data of the least recently used hidden tabs until the total fits
+- has_room(): Whether loading a file of a given size fits, used to hold back idle prefetching
+- summary() / usage(): Total for the status indicator, and the usage of every tab
+"""
+
+import os
+from collections import OrderedDict
+
+from PyQt5.QtCore import QObject, QSettings, pyqtSignal
+
+
+class MemoryBudget(QObject):
+    """
+    MemoryBudget keeps the tabs in least recently shown order. When the estimated total goes
+    over the budget, hidden tabs are evicted from the least recently shown on: they drop their
+    lines but keep the level of every line, the scroll position, selection and filter, so
+    showing them again re-reads the file without classifying it (LogViewer.restore()).
+    The estimates come from LogViewer.memory_bytes(), nothing is measured by the allocator.
+    """
+
+    fileFactor: int = 3  # estimated memory per byte of a loaded file, lines are small Python objects
+
+    usageChanged = pyqtSignal()
+
+    _instance: 'MemoryBudget | None' = None
+
+    def __init__(self, max_bytes: int = None):
+        super().__init__()
+        self.maxBytes: int = max_bytes if max_bytes else self.default_budget()
+        self._recent: OrderedDict['LogViewer', None] = OrderedDict()  # least recently shown first
+
+    @classmethod
+    def instance(cls) -> 'MemoryBudget':
+        if cls._instance is None:
+            cls._instance = MemoryBudget()
+        return cls._instance
+
+    @staticmethod
+    def default_budget() -> int:
+        """The saved "memory_budget_mb" setting, else a quarter of the RAM up to 4 GB (nodes are shared)."""
+        megabytes = QSettings("Avice", "TabLog").value("memory_budget_mb", 0, type=int)
+        if megabytes > 0:
+            return megabytes * 1024 * 1024
+        try:
+            ram = os.sysconf("SC_PHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+        except (ValueError, OSError, AttributeError):
+            ram = 8 * 1024 ** 3
+        return min(4 * 1024 ** 3, ram // 4)
+
+    def track(self, viewer: 'LogViewer'):
+        """A tab loaded or reloaded, unknown tabs (e.g. prefetched) count as the least recently shown."""
+        if viewer not in self._recent:
+            self._recent[viewer] = None
+            self._recent.move_to_end(viewer, last=False)
+        self.enforce()
+
+    def touch(self, viewer: 'LogViewer'):
+        self._recent.pop(viewer, None)
+        self._recent[viewer] = None
+        self.enforce()
+
+    def remove(self, viewer: 'LogViewer'):
+        self._recent.pop(viewer, None)
+        self.usageChanged.emit()
+
+    def usage(self) -> list[tuple['LogViewer', int]]:
+        """Estimated bytes of every tab, the most recently shown first."""
+        return [(viewer, viewer.memory_bytes()) for viewer in reversed(self._recent)]
+
+    def total(self) -> int:
+        return sum(viewer.memory_bytes() for viewer in self._recent)
+
+    def has_room(self, file_size: int) -> bool:
+        return self.total() + file_size * self.fileFactor <= self.maxBytes
+
+    def enforce(self):
+        total = self.total()
+        for viewer in list(self._recent):
+            if total <= self.maxBytes:
+                break
+            if viewer.isVisible():
+                continue
+            if viewer.evict():
+                total = self.total()  # the other tabs sharing its document were evicted with it
+        self.usageChanged.emit()
+
+    def summary(self) -> str:
+        return F"Memory {self.total() / 1024 ** 2:,.0f} / {self.maxBytes / 1024 ** 2:,.0f} MB"
@@ -0,0 +1,65 @@
+"""
+QueryCache.py - LRU Cache of Recent Filter Results
+
+Main Functions:
+- QueryCache: Per-tab LRU cache mapping (query, levels, model generation) to matched row arrays
+- get(): Returns (rows, scanned row count) of a cached query and marks it as recently used
+- put(): Stores a result, evicting the least recently used ones beyond the memory cap
+- clear(): Drops all results, e.g. when the log is reloaded
+- holds(): Whether a row array is cached, the filter model shares its current result with the cache
+"""
+
+from array import array
+from collections import OrderedDict
+
+
+class QueryCache:
+    """
+    QueryCache stores the matching rows of recent filters as compact arrays.
+    Besides the rows, each entry remembers how many log rows were scanned, so a result can
+    be extended with the rows appended to the log since, instead of being computed again.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.maxBytes: int = max_bytes
+        self.size: int = 0
+        self._entries: OrderedDict[tuple, tuple[array, int, int]] = OrderedDict()  # rows, scanned, size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self._entries
+
+    @staticmethod
+    def entry_size(rows: array) -> int:
+        return rows.itemsize * len(rows)
+
+    def get(self, key: tuple) -> tuple[array, int] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0], entry[1]
+
+    def put(self, key: tuple, rows: array, scanned: int):
+        self.discard(key)
+        size = self.entry_size(rows)
+        if size > self.maxBytes:
+            return
+        self._entries[key] = (rows, scanned, size)
+        self.size += size
+        while self.size > self.maxBytes:
+            _, (_, _, old_size) = self._entries.popitem(last=False)
+            self.size -= old_size
+
+    def holds(self, rows: array) -> bool:
+        return any(entry[0] is rows for entry in self._entries.values())
+
+    def discard(self, key: tuple):
+        if (entry := self._entries.pop(key, None)) is not None:
+            self.size -= entry[2]
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
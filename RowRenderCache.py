@@ -0,0 +1,81 @@
+"""
+RowRenderCache.py - LRU Cache of Laid-Out Log Rows
+
+Main Functions:
+- RowRenderCache: Per-view LRU cache of laid-out QTextDocuments under a memory budget
+- get(): Returns the cached document of a key (model generation, row, width, font, slice, wrap) or None
+- put(): Stores a document with its estimated cost, evicting least recently used rows
+- discard_path(): Drops the documents showing a file path, when its link status changed, and returns their rows
+"""
+
+from collections import OrderedDict
+
+from PyQt5.QtGui import QTextDocument
+
+
+class RowRenderCache:
+    """
+    RowRenderCache keeps the QTextDocument of recently painted rows, so repainting a row
+    (scrolling back, selection changes, hover) skips the HTML building, parsing and layout.
+    Keys are (model generation, row, text width, font key, character slice of a long row or None,
+    wrapping), the row is always at position 1. Each document records the file paths it shows as links, so a
+    changed link status drops exactly the documents styled with the old one.
+    """
+
+    docOverhead: int = 4096  # estimated bytes of an empty laid-out document
+    bytesPerChar: int = 48  # estimated bytes of layout and format data per character of HTML
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        self.maxBytes: int = max_bytes
+        self.size: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: OrderedDict[tuple, tuple[QTextDocument, int, tuple[str, ...]]] = OrderedDict()
+        self._pathKeys: dict[str, set[tuple]] = {}  # file path: keys of the cached documents showing it
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def cost(self, html: str) -> int:
+        return self.docOverhead + self.bytesPerChar * len(html)
+
+    def get(self, key: tuple) -> QTextDocument | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: tuple, doc: QTextDocument, cost: int, paths: tuple[str, ...] = ()):
+        self.discard(key)
+        if cost > self.maxBytes:
+            return
+        self._entries[key] = (doc, cost, paths)
+        self.size += cost
+        for path in paths:
+            self._pathKeys.setdefault(path, set()).add(key)
+        while self.size > self.maxBytes:
+            self.discard(next(iter(self._entries)))
+
+    def discard(self, key: tuple):
+        if (entry := self._entries.pop(key, None)) is not None:
+            self.size -= entry[1]
+            for path in entry[2]:
+                keys = self._pathKeys.get(path)  # already removed by discard_path()
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._pathKeys[path]
+
+    def discard_path(self, path: str) -> set[int]:
+        keys = self._pathKeys.pop(path, set())
+        for key in keys:
+            self.discard(key)
+        return {key[1] for key in keys}
+
+    def clear(self):
+        self._entries.clear()
+        self._pathKeys.clear()
+        self.size = 0
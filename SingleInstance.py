@@ -0,0 +1,104 @@
+"""
+SingleInstance.py - Forwarding New Files to the Running TabLog
+
+Main Functions:
+- SingleInstance: The first TabLog of a user and display listens on a local socket, later ones hand it their files
+- forward(): Client side, sends the files to the running instance and returns whether it took them
+- listen(): Server side (QLocalServer), calls the open callback with the files of every later invocation
+"""
+
+import json
+import os
+import re
+import socket
+import tempfile
+
+
+class SingleInstance:
+    """
+    The client side uses a plain Unix socket and nothing in this module imports Qt at load time,
+    so the tablog launcher can forward files and exit within milliseconds, before starting
+    Python with PyQt. A message is one JSON line {"files": [absolute paths]}, answered by "ok".
+    """
+
+    forwardTimeout: float = 5.0  # seconds, a busy instance (loading a huge file) answers late
+
+    def __init__(self, open_callback):
+        self.openCallback = open_callback  # called with the list of forwarded files
+        self.server = None
+        self.buffers: dict = {}  # connection: bytes received so far
+
+    @staticmethod
+    def socket_path() -> str:
+        """One instance per user and display, windows forwarded to must be on the caller's screen."""
+        display = re.sub(r'[^\w.-]', '_', os.environ.get('DISPLAY', ''))
+        return os.path.join(tempfile.gettempdir(), F"tablog-{os.getuid()}-{display}.sock")
+
+    @classmethod
+    def forward(cls, files: list[str]) -> bool:
+        """Hands the files (relative to the current directory) to the running instance, False if there is none."""
+        path = cls.socket_path()
+        if not os.path.exists(path):
+            return False
+        message = json.dumps({"files": [os.path.abspath(file) for file in files]}) + "\n"
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(cls.forwardTimeout)
+                sock.connect(path)
+                sock.sendall(message.encode())
+                return sock.makefile().readline().strip() == "ok"
+        except OSError:
+            return False
+
+    @classmethod
+    def is_running(cls) -> bool:
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(1.0)
+                sock.connect(cls.socket_path())
+                return True
+        except OSError:
+            return False
+
+    def listen(self) -> bool:
+        """Starts serving, a socket file left by a crashed instance is replaced. False if another instance serves."""
+        from PyQt5.QtNetwork import QLocalServer
+
+        path = self.socket_path()
+        if self.is_running():
+            return False
+        QLocalServer.removeServer(path)
+        self.server = QLocalServer()
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        if not self.server.listen(path):
+            print(F"-WARNING- can't listen on '{path}': {self.server.errorString()}")
+            self.server = None
+            return False
+        self.server.newConnection.connect(self.accept)
+        return True
+
+    def accept(self):
+        while self.server.hasPendingConnections():
+            connection = self.server.nextPendingConnection()
+            self.buffers[connection] = b""
+            connection.readyRead.connect(lambda c=connection: self.read(c))
+            connection.disconnected.connect(lambda c=connection: (self.buffers.pop(c, None), c.deleteLater()))
+
+    def read(self, connection):
+        self.buffers[connection] += bytes(connection.readAll())
+        if not self.buffers[connection].endswith(b"\n"):
+            return
+        try:
+            files = json.loads(self.buffers.pop(connection))["files"]
+        except (ValueError, KeyError, TypeError):
+            connection.disconnectFromServer()
+            return
+        connection.write(b"ok\n")
+        connection.flush()
+        connection.disconnectFromServer()
+        self.openCallback([file for file in files if isinstance(file, str)])
+
+    def close(self):
+        if self.server:
+            self.server.close()
+            self.server = None
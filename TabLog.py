@@ -0,0 +1,23 @@
+#!/home/utils/Python/builds/3.11.9-20250715/bin/python3
+"""
+TabLog.py - Entry Point of the TabLog Application
+
+Main Functions:
+- Starts LogViewTab.main(), after StartupProfile.install() so --startup-profile times every import
+
+The worker processes of the bulk open, link prefetch and folder search pools are spawned, and a
+spawned process imports the main script of its parent again (as __mp_main__) before running its
+task. Everything here is guarded by __name__ == '__main__', so the workers only import the Qt-free
+modules their task needs (LogFileReader, FolderSearch) instead of PyQt5 and the whole GUI.
+"""
+
+if __name__ == '__main__':
+    from common.StartupProfile import StartupProfile
+
+    StartupProfile.install()  # --startup-profile times the imports below
+
+    import sys
+
+    from LogViewTab import main
+
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/home/utils/Python/builds/3.11.9-20250715/bin/python3
+"""
+benchmark_startup.py - Time to First Paint of TabLog
+
+Main Functions:
+- run_once(): Starts TabLog.py --startup-profile in a separate window and reads its startup report
+- main(): Repeats the startup and prints the median and best time of every step, up to the first painted
+  log rows, plus the wall clock time from the process start (which includes the Python interpreter).
+  Each run has its own cache and settings folders (XDG_CACHE_HOME, XDG_CONFIG_HOME), so the user's
+  IndexCache and settings are neither used nor changed: its first start is cold (empty IndexCache,
+  default settings) and its second one warm, reported separately. The OS page cache is not dropped.
+
+Usage: ./benchmark_startup.py [--runs N] [log file]
+       QT_QPA_PLATFORM=offscreen ./benchmark_startup.py    (without a display)
+"""
+
+import argparse
+import os
+import re
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+stepPattern = re.compile(r"^  (\S.*?)\s+(\d+\.\d{3})\b")
+
+
+def run_once(log_file: str, timeout: float, home: str) -> dict[str, float]:
+    """Startup step: seconds, empty if the report did not come within the timeout. Cache and settings are kept in home."""
+    command = [sys.executable, "-u", os.path.join(script_dir, "TabLog.py"), "--new-window", "--startup-profile"]
+    env = dict(os.environ, XDG_CACHE_HOME=os.path.join(home, "cache"), XDG_CONFIG_HOME=os.path.join(home, "config"))
+    start = time.perf_counter()
+    # own session, so the bulk open workers are stopped with it
+    process = subprocess.Popen(command + ([log_file] if log_file else []), stdout=subprocess.PIPE,
+                               stderr=subprocess.DEVNULL, text=True, start_new_session=True, env=env)
+
+    def stop():
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    timer = threading.Timer(timeout, stop)
+    timer.start()
+    steps = {}
+    try:
+        for line in process.stdout:
+            match = stepPattern.match(line)
+            if match:
+                steps[match.group(1)] = float(match.group(2))
+            elif line.startswith("Slowest imports"):
+                steps["wall clock to report"] = time.perf_counter() - start
+                break
+    finally:
+        timer.cancel()
+        stop()
+        process.wait()
+    return steps
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure the time to first paint of TabLog')
+    parser.add_argument('log_file', nargs='?', default=os.path.join(script_dir, "example.log"),
+                        help='Log file opened at startup (default: example.log, "" for none)')
+    parser.add_argument('--runs', type=int, default=5, help='Number of startups (default: 5)')
+    parser.add_argument('--timeout', type=float, default=60, help='Seconds allowed per startup (default: 60)')
+    args = parser.parse_args()
+
+    results: dict[str, list[dict[str, float]]] = {"cold": [], "warm": []}
+    for run in range(args.runs):
+        with tempfile.TemporaryDirectory(prefix="tablog-benchmark-") as home:
+            for start in results:
+                steps = run_once(args.log_file, args.timeout, home)
+                if not steps:
+                    print(F"-ERROR- run {run + 1} ({start}): no startup report within {args.timeout:g} s")
+                    continue
+                results[start].append(steps)
+                print(F"run {run + 1} ({start}): first paint {steps.get('first paint', 0):.3f} s, "
+                      F"log rows {steps.get('first log rows painted', 0):.3f} s")
+    if not any(results.values()):
+        return 1
+    for start, runs in results.items():
+        if not runs:
+            continue
+        print(F"\n{start + ' start':<32} {'median':>8} {'best':>8}   ({len(runs)} runs, seconds)")
+        for step in runs[0]:
+            values = [steps[step] for steps in runs if step in steps]
+            print(F"{step:<32} {statistics.median(values):8.3f} {min(values):8.3f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
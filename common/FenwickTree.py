@@ -0,0 +1,113 @@
+"""
+FenwickTree.py - Prefix Sums of Row Heights
+
+Main Functions:
+- FenwickTree: Binary indexed tree over values that are a common base plus a sparse delta
+- set() / value(): Changes or reads the value of one position in O(log n)
+- prefix_sum(): Sum of the values before a position in O(log n), e.g. the y of a row
+- find(): Position whose range contains a given sum in O(log n), e.g. the row at a y (size past the last one)
+- resize(): Grows in amortized O(log n) per added position (appended rows), the capacity doubles
+- reset(): Sets every value back to a base, in O(k log n) for the k values that differ from the base
+"""
+
+from array import array
+
+
+class FenwickTree:
+    """
+    FenwickTree keeps prefix sums of n values, each the base plus a delta. Only the deltas
+    are summed by the tree (the base contributes base * count), so a new tree is all zeros
+    and costs a single allocation, whatever n is. The non-zero deltas are also kept in a dict,
+    so the tree can be reset by taking them out again instead of touching every position.
+    The tree has room for capacity positions, those past size have no delta, so growing only
+    fills the few new nodes that cover existing positions.
+    """
+
+    def __init__(self, size: int = 0, base: int = 0):
+        self.base: int = base
+        self.size: int = size
+        self.capacity: int = size
+        self._tree = array('q', bytes(8 * (size + 1)))  # 1-based, _tree[i] sums the deltas of (i - lowbit(i), i]
+        self._deltas: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return self.size
+
+    def value(self, index: int) -> int:
+        return self.base + self._deltas.get(index, 0)
+
+    def set(self, index: int, value: int):
+        delta = value - self.base
+        change = delta - self._deltas.get(index, 0)
+        if not change:
+            return
+        if delta:
+            self._deltas[index] = delta
+        else:
+            del self._deltas[index]
+        self._add(index, change)
+
+    def _add(self, index: int, change: int):
+        tree, i = self._tree, index + 1
+        while i <= self.capacity:
+            tree[i] += change
+            i += i & -i
+
+    def _delta_sum(self, index: int) -> int:
+        """Sum of the deltas at positions [0, index), index <= capacity."""
+        tree, i, total = self._tree, index, 0
+        while i:
+            total += tree[i]
+            i &= i - 1
+        return total
+
+    def prefix_sum(self, index: int) -> int:
+        """Sum of the values at positions [0, index)."""
+        index = max(0, min(index, self.size))
+        return self._delta_sum(index) + self.base * index
+
+    def total(self) -> int:
+        return self.prefix_sum(self.size)
+
+    def find(self, target: int) -> int:
+        """
+        Position whose range [prefix_sum(i), prefix_sum(i + 1)) contains target, size if target is at
+        or past total() (as y // row height is past the rows without wrapping), 0 if it is negative.
+        """
+        if self.size == 0 or target < 0:
+            return 0
+        tree, pos, step = self._tree, 0, 1 << (self.size.bit_length() - 1)
+        while step:
+            nxt = pos + step
+            if nxt <= self.size and (covered := tree[nxt] + self.base * step) <= target:
+                pos = nxt
+                target -= covered
+            step >>= 1
+        return pos
+
+    def resize(self, size: int):
+        """Changes the number of positions, new positions hold the base value."""
+        for index in [index for index in self._deltas if index >= size]:
+            self.set(index, self.base)
+        if size > self.capacity:
+            self._grow(max(size, 2 * self.capacity))
+        self.size = size
+
+    def _grow(self, capacity: int):
+        old = self.capacity
+        self._tree.frombytes(bytes(8 * (capacity - old)))
+        self.capacity = capacity
+        if not old:
+            return
+        # the new nodes covering old positions are those on the update path of the last one
+        tree, total, i = self._tree, self._delta_sum(old), old + (old & -old)
+        while i <= capacity:
+            tree[i] = total - self._delta_sum(i - (i & -i))
+            i += i & -i
+
+    def reset(self, base: int):
+        """Every value becomes base, only the positions with a delta are touched."""
+        for index, delta in self._deltas.items():
+            self._add(index, -delta)
+        self._deltas = {}
+        self.base = base
@@ -0,0 +1,43 @@
+"""
+Icons.py - UI Icons Loaded on Demand
+
+Main Functions:
+- Icons: One shared QIcon per name, read from icons/<name>.png the first time it is used
+- icon(): Returns the icon of an alias of icons/icons.qrc (e.g. "reload", "error", "find")
+"""
+
+import os
+
+from PyQt5.QtGui import QIcon
+
+
+class Icons:
+    """
+    Icons replaces the import of icons_rc by LogViewer, which decoded and registered every
+    embedded icon at startup. An icon is now read from its PNG when a widget first needs it,
+    and the same QIcon is shared by all tabs. Installs without the icons folder fall back to
+    the embedded resources, icons_rc is only imported then.
+    """
+
+    folder: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "icons")
+
+    _icons: dict[str, QIcon] = {}
+    _resources: bool = False  # icons_rc registered
+
+    @classmethod
+    def icon(cls, name: str) -> QIcon:
+        icon = cls._icons.get(name)
+        if icon is None:
+            path = os.path.join(cls.folder, F"{name}.png")
+            if not os.path.exists(path):
+                cls.load_resources()
+                path = F":/{name}"
+            icon = cls._icons[name] = QIcon(path)
+        return icon
+
+    @classmethod
+    def load_resources(cls):
+        if not cls._resources:
+            # noinspection PyUnresolvedReferences
+            import icons_rc  # registers the embedded icons when imported
+            cls._resources = True
@@ -0,0 +1,103 @@
+"""
+StartupProfile.py - Import and Initialization Timing of the Startup
+
+Main Functions:
+- StartupProfile: Timing breakdown printed when TabLog is started with --startup-profile
+- install(): Times every module imported from then on, by its own time (without the modules it imports)
+- mark(): Records a named initialization step, as the time since the start
+- watch_paint(): Marks the first paint of the window and of the log rows, then prints the report
+"""
+
+import builtins
+import sys
+import time
+
+
+class StartupProfile:
+    """
+    StartupProfile is a class-level recorder, so modules can mark steps without passing an
+    object around. It is disabled unless --startup-profile is on the command line, and then
+    costs nothing: install() does not wrap the import function and mark() returns at once.
+    Nothing in here imports Qt at load time, it has to be imported before everything else.
+    """
+
+    enabled: bool = "--startup-profile" in sys.argv
+    reportedImports: int = 15  # slowest imports listed by report()
+
+    started: float = time.perf_counter()
+    steps: list[tuple[str, float]] = []  # (step, seconds since started)
+    imports: dict[str, float] = {}  # module: own import seconds
+    importTotal: float = 0.0
+    _stack: list[float] = []  # time spent in nested imports, per import in progress
+    _watcher = None
+
+    @classmethod
+    def install(cls):
+        if not cls.enabled or builtins.__import__.__name__ == "timed_import":
+            return
+        original = builtins.__import__
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level or name in sys.modules:
+                return original(name, globals, locals, fromlist, level)
+            cls._stack.append(0.0)
+            start = time.perf_counter()
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                elapsed = time.perf_counter() - start
+                nested = cls._stack.pop()
+                cls.imports[name] = cls.imports.get(name, 0.0) + elapsed - nested
+                if cls._stack:
+                    cls._stack[-1] += elapsed
+                else:
+                    cls.importTotal += elapsed
+
+        builtins.__import__ = timed_import
+
+    @classmethod
+    def mark(cls, step: str):
+        if cls.enabled:
+            cls.steps.append((step, time.perf_counter() - cls.started))
+
+    @classmethod
+    def watch_paint(cls, app, is_content=None):
+        """
+        Marks the first painted QWidget, and the first one for which is_content(widget) is true
+        (e.g. a log view with rows), then prints the report. Without is_content, the report
+        follows the first paint.
+        """
+        if not cls.enabled:
+            return
+        from PyQt5.QtCore import QObject, QEvent
+        from PyQt5.QtWidgets import QWidget
+
+        class PaintWatcher(QObject):
+            def eventFilter(self, watched, event):
+                if event.type() == QEvent.Paint and isinstance(watched, QWidget):
+                    if not self.windowPainted:
+                        self.windowPainted = True
+                        cls.mark("first paint")
+                    if is_content is None or is_content(watched):
+                        if is_content is not None:
+                            cls.mark("first log rows painted")
+                        app.removeEventFilter(self)
+                        cls.report()
+                return False
+
+        cls._watcher = PaintWatcher()
+        cls._watcher.windowPainted = False
+        app.installEventFilter(cls._watcher)
+
+    @classmethod
+    def report(cls):
+        lines = ["", "Startup profile (seconds since the start of TabLog):",
+                 F"  {'imports (total)':<32} {cls.importTotal:8.3f}"]
+        previous = 0.0
+        for step, seconds in cls.steps:
+            lines.append(F"  {step:<32} {seconds:8.3f}  (+{seconds - previous:.3f})")
+            previous = seconds
+        lines.append(F"Slowest imports (own time, ms):")
+        for name, seconds in sorted(cls.imports.items(), key=lambda item: -item[1])[:cls.reportedImports]:
+            lines.append(F"  {name:<32} {seconds * 1000:8.1f}")
+        print("\n".join(lines), flush=True)
@@ -3,41 +3,69 @@ TabBar.py - Custom Tab Bar with Colored Backgrounds
 
 Main Functions:
 - TabBar: Custom QTabBar that displays tabs with individual background colors
-- paintEvent(): Custom painting that applies per-tab background colors from LogViewer
+- paintEvent(): Custom painting that applies per-tab background colors from LogViewer, only of the
+  tabs in the updated rectangle (e.g. the one flashing), so the cost doesn't grow with the tab count
+- brush(): Shared brush per background color, also used by the DocumentSidebar
 - Each tab gets its color from the associated LogViewer's Colorizer-generated background
 """
 
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QPoint
 from PyQt5.QtGui import QPainter, QColor, QBrush, QPen
 from PyQt5.QtWidgets import QTabBar
 
 
 class TabBar(QTabBar):
+    borderWidth: int = 1
+    borderPen = QPen(QColor(Qt.GlobalColor.lightGray), borderWidth)
+    textPen = QPen(QColor(Qt.black), 1)
+    inactiveBrush = QBrush(QColor(200, 200, 200, 150))  # dims the tabs that are not current
+    _brushes: dict[str, QBrush] = {}  # background color: brush, tabs of the same title share it
+
     def __init__(self, parent):
         super(TabBar, self).__init__()
         self.parent = parent
 
+    @classmethod
+    def brush(cls, background: str) -> QBrush:
+        brush = cls._brushes.get(background)
+        if brush is None:
+            brush = cls._brushes[background] = QBrush(QColor(background))
+        return brush
+
     def paintEvent(self, event):
         painter = QPainter(self)
-        border_color = QColor(Qt.GlobalColor.lightGray)
-        border_width = 1
+        dirty = event.rect()
+        # tabs are laid out left to right, start at the one under the left edge of the updated area
+        index = max(self.tabAt(QPoint(dirty.left(), dirty.center().y())), 0)
+        current = self.currentIndex()
 
-        for index in range(self.count()):
+        while index < self.count():
             tab_rect = self.tabRect(index)
+            if tab_rect.left() > dirty.right():
+                break
+            if tab_rect.right() < dirty.left():
+                index += 1
+                continue
             tab_text = self.tabText(index)
             bg = self.parent.widget(index).get_background()
 
             # Adjust tab_rect for border drawing
-            tab_rect_adjusted = tab_rect.adjusted(border_width, border_width, -border_width, -border_width)
+            tab_rect_adjusted = tab_rect.adjusted(self.borderWidth, self.borderWidth,
+                                                  -self.borderWidth, -self.borderWidth)
 
             # Customize background color per tab
-            painter.fillRect(tab_rect_adjusted, QBrush(QColor(bg)))
+            painter.fillRect(tab_rect_adjusted, self.brush(bg))
 
             # Draw border
-            painter.setPen(QPen(border_color, border_width))  # Apply border settings
+            painter.setPen(self.borderPen)
             painter.drawRect(tab_rect_adjusted)
-            # Customize background color per tab
-            painter.setPen(QPen(QColor(Qt.black), 1))
+            painter.setPen(self.textPen)
             painter.drawText(tab_rect, Qt.AlignCenter, tab_text + " " * 6)
-            if self.currentIndex() != index:
-                painter.fillRect(tab_rect_adjusted, QBrush(QColor(200, 200, 200, 150)))
+            if current != index:
+                painter.fillRect(tab_rect_adjusted, self.inactiveBrush)
+            index += 1
+
+    def update_tab(self, index: int):
+        """Repaints a single tab, e.g. when its color changes."""
+        if 0 <= index < self.count():
+            self.update(self.tabRect(index))
@@ -0,0 +1,28 @@
+import os
+import sys
+
+# before any PyQt import: without a display the tests still get a QApplication
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PyQt5.QtCore import QSettings, QStandardPaths
+from PyQt5.QtWidgets import QApplication
+
+# the modules live at the top of the repository, as when TabLog is run from its directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """The QApplication shared by the tests (widgets need one, models their signals)."""
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def settings_dir(tmp_path):
+    """QSettings of the test are kept in a temporary folder, the user's settings are left alone."""
+    default = QStandardPaths.writableLocation(QStandardPaths.GenericConfigLocation)
+    folder = tmp_path / "config"
+    QSettings.setPath(QSettings.NativeFormat, QSettings.UserScope, str(folder))
+    yield folder
+    QSettings.setPath(QSettings.NativeFormat, QSettings.UserScope, default)
@@ -0,0 +1,25 @@
+import time
+
+from LogViewTab import LogViewTab
+
+
+def process_events(qapp, seconds: float):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.01)
+
+
+def test_closing_a_flashing_tab_stops_its_flash(qapp, settings_dir, tmp_path):
+    log = tmp_path / "a.log"
+    log.write_text("INFO line\n")
+    tabs = LogViewTab(None)
+    tabs.add_log("a", "a.log", str(log))
+    assert tabs.add_log("a", "a.log", str(log))  # open already, its tab flashes
+    changed = []
+    tabs.tabChanged.connect(changed.append)
+
+    tabs.close_tab(0)
+    process_events(qapp, 6 * tabs.flashInterval / 1000)  # the deleted viewer used to abort the next toggle
+
+    assert tabs.count() == 0 and changed == []
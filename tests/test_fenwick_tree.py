@@ -0,0 +1,42 @@
+from common.FenwickTree import FenwickTree
+
+
+def test_find_maps_each_y_to_its_row():
+    heights = FenwickTree(4, 10)
+    heights.set(1, 30)  # rows span [0, 10), [10, 40), [40, 50), [50, 60)
+
+    assert [heights.find(y) for y in (0, 9, 10, 39, 40, 59)] == [0, 0, 1, 1, 2, 3]
+
+
+def test_find_past_the_last_row_is_outside_the_rows():
+    heights = FenwickTree(4, 10)
+    heights.set(3, 25)
+
+    assert heights.find(heights.total() - 1) == 3
+    assert heights.find(heights.total()) == 4
+    assert heights.find(heights.total() + 1000) == 4
+    assert FenwickTree(0, 10).find(5) == 0
+
+
+def test_growing_keeps_the_sums_and_reserves_room():
+    heights = FenwickTree(3, 10)
+    heights.set(0, 40)
+    heights.set(2, 25)
+    for size in range(4, 100):
+        heights.resize(size)  # rows appended one at a time
+        heights.set(size - 1, 10 + size)
+
+    assert heights.capacity < 200
+    values = [40, 10, 25] + [10 + size for size in range(4, 100)]
+    assert [heights.prefix_sum(index) for index in range(100)] == [sum(values[:index]) for index in range(100)]
+    assert heights.find(sum(values[:50])) == 50
+
+
+def test_reset_only_keeps_the_size():
+    heights = FenwickTree(1000, 10)
+    heights.set(5, 30)
+    heights.set(999, 50)
+
+    heights.reset(12)
+
+    assert len(heights) == 1000 and heights.total() == 12000 and heights.find(12 * 6) == 6
@@ -0,0 +1,27 @@
+from FilterTableModel import FilterTableModel
+from LogLevel import LogLevel
+from LogTableModel import LogTableModel
+
+
+def test_current_rows_are_counted_once(qapp):
+    log_model = LogTableModel(None)
+    log_model.update_data([(LogLevel.ERROR if row % 2 else LogLevel.INFO, F"line {row}") for row in range(1000)])
+    filter_model = FilterTableModel(None, log_model)
+
+    filter_model.set_filter([LogLevel.ERROR], "")
+    log_model.append_data([(LogLevel.ERROR, "appended")])
+    filter_model.append_rows(1000)
+
+    assert len(filter_model.rows) == 501
+    assert filter_model.memory_bytes() == filter_model.queryCache.size == filter_model.rows.itemsize * 501
+
+
+def test_rows_evicted_from_the_cache_are_still_counted(qapp):
+    log_model = LogTableModel(None)
+    log_model.update_data([(LogLevel.ERROR, F"line {row}") for row in range(1000)])
+    filter_model = FilterTableModel(None, log_model)
+    filter_model.set_filter([LogLevel.ERROR], "")
+
+    filter_model.queryCache.clear()
+
+    assert filter_model.memory_bytes() == filter_model.rows.itemsize * 1000
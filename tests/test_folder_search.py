@@ -0,0 +1,28 @@
+import gzip
+
+from FolderSearch import FolderSearch
+
+
+def test_line_numbers_follow_viewer_rows(tmp_path):
+    """LogViewer splits rows with str.splitlines(), a hit must open on its own row."""
+    data = "start\r10%\r50%\rdone\r\nfirst ERROR\nform\x0cfeed\nsecond error\n third Error\nlast error"
+    path = tmp_path / "progress.log"
+    path.write_bytes(data.encode())
+    rows = path.read_bytes().decode(errors='replace').splitlines()
+
+    _, count, hits, error = FolderSearch.search_file(str(path), "error")
+
+    assert error == ""
+    assert count == 4
+    assert [(line_no, rows[line_no - 1]) for line_no, _ in hits] == hits
+    assert [text for _, text in hits] == ["first ERROR", "second error", "third Error", "last error"]
+
+
+def test_corrupt_gz_is_reported(tmp_path):
+    path = tmp_path / "corrupt.log.gz"
+    compressed = gzip.compress(b"an error line\n" * 1000)
+    path.write_bytes(compressed[:20] + b"\xff" * 50 + compressed[70:])
+
+    _, _, _, error = FolderSearch.search_file(str(path), "error")
+
+    assert error
@@ -0,0 +1,21 @@
+from RowRenderCache import RowRenderCache
+
+
+def test_discard_path_drops_every_document_showing_it():
+    cache = RowRenderCache()
+    cache.put((0, 1, 500, "font", None), object(), 100, ("/home/a.log",))
+    cache.put((0, 2, 500, "font", None), object(), 100, ("/home/a.log", "/home/b.log"))
+    cache.put((0, 3, 500, "font", None), object(), 100)
+
+    assert cache.discard_path("/home/a.log") == {1, 2}
+    assert len(cache) == 1 and cache.size == 100
+    assert cache.discard_path("/home/b.log") == set()  # dropped with row 2
+
+
+def test_evicted_documents_leave_the_path_index():
+    cache = RowRenderCache(max_bytes=250)
+    for row in range(5):
+        cache.put((0, row, 500, "font", None), object(), 100, ("/home/a.log",))
+
+    assert cache.discard_path("/home/a.log") == {3, 4}
+    assert len(cache) == 0 and cache.size == 0
@@ -0,0 +1,27 @@
+import json
+
+from PyQt5.QtCore import QSettings
+
+from LogViewTab import LogViewTab
+
+
+def test_a_malformed_tab_only_loses_itself(qapp, settings_dir, tmp_path):
+    files = []
+    for name in ["a.log", "b.log", "c.log"]:
+        (tmp_path / name).write_text("INFO line\n")
+        files.append(str(tmp_path / name))
+    QSettings("Avice", "TabLog").setValue("session", json.dumps({"tabs": [
+        {"file": files[0], "title": "a", "name": "a.log"},
+        {"file": files[1], "name": "b.log"},  # no title
+        {"file": None, "title": "x", "name": "x"},
+        "not a tab",
+        {"file": files[2], "title": "c", "name": "c.log", "levels": ["ERROR"]},
+    ], "current": 1}))
+    tabs = LogViewTab(None)
+    tabs.poolFailed = True  # tabs load in this process when shown
+
+    tabs.restore_session()
+
+    assert [tabs.widget(index).logFile for index in range(tabs.count())] == [files[0], files[2]]
+    assert tabs.currentIndex() == 1 and tabs.widget(1).sessionState == {"levels": ["ERROR"]}
+    tabs.sessionTimer.stop()
@@ -0,0 +1,99 @@
+import gc
+import time
+import tracemalloc
+import weakref
+
+import pytest
+from PyQt5.QtCore import QCoreApplication, QEvent
+
+from DocumentStore import DocumentStore
+from IndexCache import IndexCache
+from LogViewTab import LogViewTab
+from MemoryBudget import MemoryBudget
+
+fileBytes = 512 * 1024  # per log, above IndexCache.minFileBytes, so only the first open classifies it
+
+
+@pytest.fixture
+def logs(tmp_path, monkeypatch):
+    monkeypatch.setattr(IndexCache, "folder", str(tmp_path / "cache"))  # not the user's IndexCache
+    paths = []
+    for number in range(4):
+        lines = [F"2026-01-01 12:00:{row % 60:02d} {'ERROR' if row % 7 else 'INFO'} job {number} step {row} "
+                 F"done in {row * 13 % 1000} ms\n" for row in range(fileBytes // 60)]
+        path = tmp_path / F"large{number}.log"
+        path.write_text("".join(lines))
+        paths.append(str(path))
+    return paths
+
+
+def settle(qapp, seconds: float = 0.0):
+    """Runs the event loop, then deletes the closed widgets and collects. The slot proxies of a deleted
+    widget are deleted later by PyQt (their lambdas keep its Python wrapper), so it takes a few rounds."""
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.01)
+    for _ in range(3):
+        qapp.processEvents()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        gc.collect()
+
+
+def usage() -> tuple[int, int]:
+    """Budgeted bytes and open documents."""
+    return MemoryBudget.instance().total(), len(DocumentStore.instance().documents)
+
+
+def open_and_close(tabs: LogViewTab, paths: list[str], cycle: int, models: list):
+    for number, path in enumerate(paths):
+        tabs.add_log(F"cycle {cycle} tab {number}", F"large{number}.log", path)
+        models.append(weakref.ref(tabs.currentWidget().logModel))
+    tabs.currentWidget().searchEntry.setText("error")
+    tabs.currentWidget().search_logs()
+    assert MemoryBudget.instance().total() > len(paths) * fileBytes
+    while tabs.count():
+        tabs.close_tab(tabs.count() - 1)
+
+
+def test_closing_100_large_tabs_returns_memory_to_baseline(qapp, settings_dir, logs):
+    tabs = LogViewTab(None)
+    tabs.poolFailed = True  # loaded in this process, as the tabs are shown
+    models = []
+    open_and_close(tabs, logs, 0, models)  # classifies the logs into the IndexCache, fills the process-wide caches
+    settle(qapp)
+    baseline = usage()
+    tracemalloc.start()
+    try:
+        heap = tracemalloc.get_traced_memory()[0]
+        for cycle in range(1, 26):
+            open_and_close(tabs, logs, cycle, models)
+            settle(qapp)
+        grown = tracemalloc.get_traced_memory()[0] - heap
+    finally:
+        tracemalloc.stop()
+
+    assert usage() == baseline
+    assert len(models) == 104 and not any(model() for model in models)
+    assert grown < fileBytes  # far less than one leaked tab would hold
+
+
+def test_tabs_closed_while_loading_or_flashing_are_freed(qapp, settings_dir, logs):
+    tabs = LogViewTab(None)
+    settle(qapp)
+    baseline = usage()
+
+    tabs.open_files(logs)  # the workers classify them in the background
+    assert tabs.loading
+    viewers = [weakref.ref(tabs.widget(index)) for index in range(tabs.count())]
+    assert tabs.add_log("large3.log", "", logs[-1])  # open already: flashes the tab
+    while tabs.count():
+        tabs.close_tab(tabs.count() - 1)
+    deadline = time.monotonic() + 60
+    while tabs.loading and time.monotonic() < deadline:
+        settle(qapp, 0.05)  # the finished results are handed to the closed tabs, which ignore them
+    settle(qapp, 6 * tabs.flashInterval / 1000)
+
+    assert not tabs.loading and usage() == baseline
+    assert not any(viewer() for viewer in viewers)
+    tabs.stop_loads()
@@ -0,0 +1,30 @@
+"""
+Worker processes are spawned, they import the main script of TabLog again: they must stay free of Qt.
+"""
+
+import os
+import subprocess
+import sys
+
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# a process with TabLog.py as its main script starts a spawn pool and lists the Qt modules of a worker
+probe = F"""
+import __main__
+__main__.__file__ = {os.path.join(repo_dir, "TabLog.py")!r}
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from LogFileReader import LogFileReader
+from FolderSearch import FolderSearch
+
+if __name__ == "__main__":
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        pool.submit(LogFileReader.prefetch_file, "/nonexistent", 0).result()
+        print(pool.submit(eval, "sorted(m for m in __import__('sys').modules if m.startswith('PyQt5'))").result())
+"""
+
+
+def test_spawned_worker_does_not_import_qt():
+    result = subprocess.run([sys.executable, "-c", probe], cwd=repo_dir, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "[]"